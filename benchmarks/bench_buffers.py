@@ -0,0 +1,75 @@
+"""Cost of the buffer rule patterns run over the string buffers against running them token by token.
+
+Usage: python benchmarks/bench_buffers.py [size_kb]
+"""
+import gc
+import sys
+import time
+
+from corpus import generate_document
+from latexcheck import RULES, PatternScanner, RuleScope, fill_node_links, parse_latex, string_buffers
+
+DOCUMENTS = {
+    "prose, EN": dict(math_density=0.05, ru_share=0.0),
+    "prose, EN+RU": dict(math_density=0.05, ru_share=0.5),
+    "default, EN+RU": dict(),
+    "math-heavy, EN+RU": dict(math_density=0.6),
+}
+
+
+def best_time(function, repeat=20):
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def per_token(buffers, scanners):
+    for mode_buffers, scanner in zip(buffers, scanners):
+        for buffer in mode_buffers:
+            for node in buffer.nodes:
+                scanner.scan(node.token)
+
+
+def per_buffer(buffers, scanners):
+    for mode_buffers, scanner in zip(buffers, scanners):
+        for buffer in mode_buffers:
+            for _, pattern in scanner.candidates(buffer.text):
+                for _ in pattern.finditer(buffer.text):
+                    pass
+
+
+def main():
+    size_kb = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    scanners = [
+        PatternScanner(
+            {
+                rule.index: rule.pattern
+                for rule in RULES.rules
+                if rule.scope == RuleScope.BUFFER and rule.math in (None, in_math)
+            }
+        )
+        for in_math in (False, True)
+    ]
+    for name, options in DOCUMENTS.items():
+        source = generate_document(size_kb, seed=1, **options)
+        all_nodes = fill_node_links(parse_latex(source))
+        buffers = string_buffers(all_nodes)
+        build = best_time(lambda: string_buffers(all_nodes))
+        tokens = best_time(lambda: per_token(buffers, scanners))
+        whole = best_time(lambda: per_buffer(buffers, scanners))
+        print(
+            f"{name:<18} {len(source) / 1024:4.0f} KB  token by token {tokens * 1000:6.1f} ms  "
+            f"buffers {whole * 1000:6.1f} ms + {build * 1000:4.1f} ms to build (x{tokens / (whole + build):.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Checks documents nested thousands of levels deep, which used to exceed the recursion limit.
+
+Usage: python benchmarks/bench_deep_nesting.py [depth]
+"""
+import sys
+import time
+
+from latexcheck import fill_node_links, parse_latex, perform_checks
+
+SHAPES = {
+    "braces": ("{x ", "}"),
+    "commands": (r"\textbf{a ", "}"),
+    "environments": (r"\begin{itemize}\item a ", r"\end{itemize}"),
+    "math": (r"$\frac{1}{", "}$"),
+}
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"recursion limit {sys.getrecursionlimit()}, nesting depth {depth}")
+    for name, (opening, closing) in SHAPES.items():
+        if name == "math":
+            source = "$" + r"\frac{1}{" * depth + "x" + "}" * depth + "$"
+        else:
+            source = opening * depth + "x" + closing * depth
+
+        start = time.perf_counter()
+        n_nodes = len(fill_node_links(parse_latex(source)))
+        tree_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        errors = perform_checks(source)
+        check_time = time.perf_counter() - start
+
+        status = "PARSE_ERROR" if "PARSE_ERROR" in errors else "ok"
+        print(
+            f"{name:<13} {len(source):>9} chars {n_nodes:>8} nodes  "
+            f"tree {tree_time * 1000:8.1f} ms  checks {check_time * 1000:8.1f} ms  {status}"
+        )
+
+
+if __name__ == "__main__":
+    main()
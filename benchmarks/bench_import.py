@@ -0,0 +1,78 @@
+"""Startup cost of ``import latexcheck`` and of loading the command line, and the modules they pull in, as
+reported by ``python -X importtime``.
+
+Fails (exit status 1) if the best of several imports of the package or of the command line takes longer than the
+budget, or if a module that is only needed by some commands is imported eagerly again.
+
+Usage: python benchmarks/bench_import.py [budget_ms] [runs]
+"""
+import os
+import re
+import subprocess
+import sys
+
+# Imported only by the commands that use them: TexSoup by --parser texsoup, concurrent.futures.process by -j,
+# asyncio by the asynchronous API and argparse by the command line once it runs
+LAZY_MODULES = ("TexSoup", "asyncio", "argparse", "concurrent.futures.process")
+
+# The package itself imports none of its submodules, and the command line only imports what a check needs once it
+# runs
+STATEMENTS = ("import latexcheck", "from latexcheck import main")
+
+# Best of 7 after the names of the package became lazy: 3.4 ms, against 76 ms before and 52 ms for the first
+# version of the package, which had all the code in one module. The command line took 80 ms more until it only
+# imported the checker from main(), and 2 ms since
+DEFAULT_BUDGET_MS = 10
+
+re_import_time = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)$")
+
+
+def import_times(statement):
+    """Time taken by ``statement`` in a new interpreter, in microseconds, and the cumulative import time of
+    every module it imported."""
+    src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env = dict(os.environ, PYTHONPATH=src_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    code = f"import time\nstart = time.perf_counter()\n{statement}\nprint(time.perf_counter() - start)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re_import_time.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return float(result.stdout) * 1e6, times
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    failures = []
+    for statement in STATEMENTS:
+        best_total = best = None
+        for _ in range(runs):
+            total, times = import_times(statement)
+            if best_total is None or total < best_total:
+                best_total, best = total, times
+
+        total_ms = best_total / 1000
+        print(f"{statement}: {total_ms:.1f} ms (best of {runs}), budget {budget_ms:.0f} ms")
+        own = sorted((name for name in best if name.startswith("latexcheck")), key=best.get, reverse=True)
+        for name in own:
+            print(f"    {name:<28} {best[name] / 1000:7.1f} ms")
+
+        failures.extend(f"{name} is imported by {statement!r}" for name in LAZY_MODULES if name in best)
+        if total_ms > budget_ms:
+            failures.append(f"{statement!r} takes {total_ms:.1f} ms, over the budget of {budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Throughput of multi-file linting for increasing numbers of worker processes.
+
+Usage: python benchmarks/bench_parallel.py [n_files]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from latexcheck import check_files
+
+PARAGRAPH = r"""
+Let $f(x) = x^2$ be a function, see~\eqref{eq:main}. Then
+\begin{equation}
+    \label{eq:main}
+    \int_0^1 f(x)\, dx = \frac{1}{3}.
+\end{equation}
+The set $\{x \mid f(x) < 1\}$ is open --- and we use it in Section~\ref{sec:intro}.
+"""
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filenames = []
+        for i in range(n_files):
+            filename = os.path.join(tmpdir, f"doc{i:04d}.tex")
+            with open(filename, "w", encoding="utf-8") as outfile:
+                outfile.write(PARAGRAPH * 20)
+            filenames.append(filename)
+
+        baseline = None
+        jobs = 1
+        while jobs <= (os.cpu_count() or 1):
+            start = time.perf_counter()
+            for _ in check_files(filenames, jobs=jobs):
+                pass
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"jobs={jobs:<3} {elapsed:8.2f} s  {n_files / elapsed:8.1f} files/s  speedup x{baseline / elapsed:.2f}")
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cost of the rule loop and of perform_checks with the full and with pruned rule sets.
+
+Usage: python benchmarks/bench_rule_selection.py [size_kb]
+"""
+import gc
+import sys
+import time
+
+from corpus import generate_document
+from latexcheck import RULES, SupportedLanguages, enabled_codes, fill_node_links, parse_latex, perform_checks
+from latexcheck.checker import text_languages
+
+EN = SupportedLanguages.EN
+RU = SupportedLanguages.RU
+TEXT_RULE_CODES = sorted({r.code for r in RULES.rules if r.skip_pure_arguments})
+
+
+def best_time(function, repeat=10):
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    size_kb = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    documents = {
+        "EN text": generate_document(size_kb, ru_share=0.0, seed=1),
+        "EN+RU text": generate_document(size_kb, ru_share=0.5, seed=1),
+    }
+    selections = {
+        "all rules": (EN, None, None),
+        "RU messages": (RU, None, None),
+        "--select 3 codes": (EN, ["MULTIPLICATION_SIGN", "EQNARRAY_USED", "TRIVIAL_LABEL"], None),
+        "--ignore text rules": (EN, None, TEXT_RULE_CODES),
+    }
+
+    for name, source in documents.items():
+        tree = parse_latex(source)
+        all_nodes = fill_node_links(tree)
+        print(f"{name}: {len(source) / 1024:.0f} KB, {len(all_nodes)} nodes")
+        unpruned = best_time(lambda: RULES.run(tree, all_nodes, lambda code, node=None: None))
+        full = best_time(lambda: perform_checks(source))
+        print(f"    {'no pruning':<22} {len(RULES.rules):3d} rules  rule loop {unpruned * 1000:7.1f} ms")
+        for selection, (language, select, ignore) in selections.items():
+            registry = RULES.subset(enabled_codes(language, select, ignore), text_languages(source))
+            loop = best_time(lambda: registry.run(tree, all_nodes, lambda code, node=None: None))
+            checks = best_time(
+                lambda: perform_checks(source, language=language, select=select, ignore=ignore)
+            )
+            print(
+                f"    {selection:<22} {len(registry.rules):3d} rules  rule loop {loop * 1000:7.1f} ms "
+                f"(x{unpruned / loop:.2f})  perform_checks {checks * 1000:7.1f} ms (x{full / checks:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
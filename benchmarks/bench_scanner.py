@@ -0,0 +1,65 @@
+"""Per-token cost of the string rule patterns: one search per pattern against PatternScanner.scan.
+
+Usage: python benchmarks/bench_scanner.py [size_kb]
+"""
+import gc
+import sys
+import time
+
+from corpus import generate_document
+from latexcheck import RULES, LatCat, PatternScanner, fill_node_links, parse_latex
+
+
+def best_time(function, repeat=10):
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def search_each(patterns, tokens):
+    for token in tokens:
+        found = {}
+        for key, pattern in patterns.items():
+            m = pattern.search(token)
+            if m is not None:
+                found[key] = m.start()
+
+
+def scan_all(scanner, tokens):
+    for token in tokens:
+        scanner.scan(token)
+
+
+def main():
+    size_kb = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    for ru_share in (0.0, 0.5):
+        source = generate_document(size_kb, ru_share=ru_share, seed=1)
+        all_nodes = fill_node_links(parse_latex(source))
+        print(f"{len(source) / 1024:.0f} KB, {ru_share:.0%} Russian text")
+        for mode, in_math in (("text", False), ("math", True)):
+            tokens = [node.token for node in all_nodes if node.cat == LatCat.STR and node.is_in_math == in_math]
+            patterns = {
+                rule.index: rule.pattern
+                for rule in RULES.rules
+                if rule.pattern is not None and rule.triggered_by(LatCat.STR, None, in_math)
+            }
+            scanner = PatternScanner(patterns)
+            separate = best_time(lambda: search_each(patterns, tokens))
+            scanned = best_time(lambda: scan_all(scanner, tokens))
+            print(
+                f"    {mode:<5} {len(tokens):6d} tokens {len(patterns):3d} patterns  "
+                f"search each {separate / len(tokens) * 1e6:6.2f} us/token  "
+                f"scan {scanned / len(tokens) * 1e6:6.2f} us/token (x{separate / scanned:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Times every stage of checking a synthetic document and writes the results to a JSON file.
+
+Stages: TexSoup parsing, traverse_tex, the built-in parse_latex, fill_node_links and the rule loop, plus
+perform_checks end to end with either parser. Pass --compare with the output of a previous run, e.g. from
+another commit, to print the ratio of the timings.
+
+Usage: python benchmarks/bench_stages.py [--size KB] [--math-density P] [--nesting N] [--ru-share P]
+                                         [--seed N] [--repeat N] [--output FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import TexSoup
+
+from corpus import generate_document
+from latexcheck import RULES, SupportedParsers, fill_node_links, parse_latex, perform_checks, traverse_tex
+
+
+def best_time(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(source, repeat):
+    stages = {}
+
+    def record(name, function, n_nodes=None):
+        seconds, result = best_time(function, repeat)
+        stages[name] = {
+            "seconds": seconds,
+            "kb_per_second": len(source) / 1024 / seconds,
+            "nodes_per_second": n_nodes / seconds if n_nodes else None,
+        }
+        return result
+
+    soup = record("texsoup_parse", lambda: TexSoup.TexSoup(source))
+    texsoup_tree = record("traverse_tex", lambda: traverse_tex(soup))
+    texsoup_nodes = fill_node_links(texsoup_tree)
+    tree = record("parse_latex", lambda: parse_latex(source))
+    all_nodes = record("fill_node_links", lambda: fill_node_links(tree))
+    n_nodes = len(all_nodes)
+    for name in ("parse_latex", "fill_node_links"):
+        stages[name]["nodes_per_second"] = n_nodes / stages[name]["seconds"]
+    stages["traverse_tex"]["nodes_per_second"] = len(texsoup_nodes) / stages["traverse_tex"]["seconds"]
+
+    record("rules", lambda: RULES.run(tree, all_nodes, lambda code, node=None: None), n_nodes)
+    record("perform_checks_builtin", lambda: perform_checks(source), n_nodes)
+    record("perform_checks_texsoup", lambda: perform_checks(source, parser=SupportedParsers.TEXSOUP))
+    return stages, n_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=float, default=64, help="document size in KB")
+    parser.add_argument("--math-density", type=float, default=0.3)
+    parser.add_argument("--nesting", type=int, default=3)
+    parser.add_argument("--ru-share", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best one is reported")
+    parser.add_argument("--output", default="bench_stages.json")
+    parser.add_argument("--compare", help="JSON output of a previous run")
+    args = parser.parse_args()
+
+    corpus = {
+        "size_kb": args.size,
+        "math_density": args.math_density,
+        "nesting": args.nesting,
+        "ru_share": args.ru_share,
+        "seed": args.seed,
+    }
+    source = generate_document(args.size, args.math_density, args.nesting, args.ru_share, args.seed)
+    stages, n_nodes = measure(source, args.repeat)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as infile:
+            previous = json.load(infile)
+        if previous.get("corpus") != corpus:
+            print("warning: the compared run used a different corpus")
+
+    print(f"{len(source) / 1024:.1f} KB, {n_nodes} nodes")
+    for name, stage in stages.items():
+        line = f"{name:<24} {stage['seconds'] * 1000:9.1f} ms {stage['kb_per_second']:10.1f} KB/s"
+        if stage["nodes_per_second"]:
+            line += f" {stage['nodes_per_second']:12.0f} nodes/s"
+        if previous and name in previous["stages"]:
+            ratio = stage["seconds"] / previous["stages"][name]["seconds"]
+            line += f"   x{ratio:.2f} vs {previous['revision'] or args.compare}"
+        print(line)
+
+    result = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "corpus": corpus,
+        "chars": len(source),
+        "nodes": n_nodes,
+        "stages": stages,
+    }
+    with open(args.output, "w", encoding="utf-8") as outfile:
+        json.dump(result, outfile, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Seeded generator of synthetic LaTeX documents for the benchmarks.
+
+Usage: python benchmarks/corpus.py [size_kb] [seed] > document.tex
+"""
+import random
+import sys
+
+EN_WORDS = (
+    "the of and a to in is that we for it as with by this be on are which let from at if then an or function set "
+    "theorem proof lemma consider number value point space graph vertex edge order result case follows since given "
+    "every there exists such bounded continuous finite sequence limit prime integer matrix vector problem"
+).split()
+
+RU_WORDS = (
+    "и в не на что с по как из для это то же все он при мы если так его от до или функция множество теорема "
+    "доказательство лемма рассмотрим число значение точка пространство граф вершина ребро порядок результат "
+    "случай следует поскольку каждый существует такой ограниченный непрерывный конечный последовательность предел"
+).split()
+
+INLINE_MATH = (
+    r"x^2 + y^2 = z^2",
+    r"f(x) \le g(x)",
+    r"\{x \mid x > 0\}",
+    r"a_1, \ldots, a_n",
+    r"\sum_{i=1}^n i = \frac{n(n+1)}{2}",
+    r"\mathbb{R}^n",
+    r"n \geq 1",
+    r"\alpha\beta",
+    r"G = (V, E)",
+    r"|A \cap B| \cdot 2",
+)
+
+DISPLAY_MATH = (
+    r"\int_0^1 f(x)\, dx = \frac{1}{3}",
+    r"\sum_{k=0}^{n} \binom{n}{k} = 2^n",
+    r"\lim_{n \to \infty} \left(1 + \frac{1}{n}\right)^n = e",
+    r"A = \begin{pmatrix} a & b \\ c & d \end{pmatrix}",
+)
+
+
+class DocumentGenerator:
+    """Builds a document of roughly ``size_kb`` kilobytes from random sentences, formulae and lists.
+
+    ``math_density`` is the share of sentences with inline math and of paragraphs followed by a display
+    formula, ``nesting`` the depth of nested lists and fractions, and ``ru_share`` the share of Russian
+    paragraphs. The same parameters and ``seed`` always give the same document.
+    """
+
+    def __init__(self, size_kb=64, math_density=0.3, nesting=3, ru_share=0.5, seed=0):
+        self.size = int(size_kb * 1024)
+        self.math_density = math_density
+        self.nesting = nesting
+        self.ru_share = ru_share
+        self.random = random.Random(seed)
+        self.n_labels = 0
+
+    def sentence(self, words):
+        rnd = self.random
+        tokens = [rnd.choice(words) for _ in range(rnd.randint(5, 18))]
+        if rnd.random() < self.math_density:
+            tokens.insert(rnd.randrange(len(tokens)), f"${rnd.choice(INLINE_MATH)}$")
+        if rnd.random() < 0.1:
+            tokens.insert(rnd.randrange(len(tokens)), rf"\textbf{{{rnd.choice(words)}}}")
+        if self.n_labels and rnd.random() < 0.1:
+            tokens.append(rf"(see~\eqref{{eq:{rnd.randrange(self.n_labels)}}})")
+        tokens[0] = tokens[0].capitalize()
+        return " ".join(tokens) + rnd.choice(".,.;.!")
+
+    def display_formula(self):
+        rnd = self.random
+        body = rnd.choice(DISPLAY_MATH)
+        if rnd.random() < 0.3:
+            depth = rnd.randint(1, self.nesting)
+            body = r"\frac{1}{" * depth + "x" + "}" * depth + " + " + body
+        if rnd.random() < 0.5:
+            self.n_labels += 1
+            return f"\\begin{{equation}}\n    \\label{{eq:{self.n_labels - 1}}}\n    {body}\n\\end{{equation}}\n"
+        return f"\\[\n    {body}\n\\]\n"
+
+    def itemize(self, words, depth):
+        rnd = self.random
+        lines = [r"\begin{itemize}"]
+        for _ in range(rnd.randint(2, 4)):
+            lines.append(r"\item " + self.sentence(words))
+            if depth < self.nesting and rnd.random() < 0.4:
+                lines.append(self.itemize(words, depth + 1))
+        lines.append(r"\end{itemize}")
+        return "\n".join(lines)
+
+    def paragraph(self):
+        rnd = self.random
+        words = RU_WORDS if rnd.random() < self.ru_share else EN_WORDS
+        parts = [" ".join(self.sentence(words) for _ in range(rnd.randint(2, 6)))]
+        if rnd.random() < self.math_density:
+            parts.append(self.display_formula())
+        if rnd.random() < 0.15:
+            parts.append(self.itemize(words, 1))
+        return "\n".join(parts)
+
+    def document(self) -> str:
+        rnd = self.random
+        chunks = ["\\documentclass{article}\n\\usepackage{amsmath}\n\\begin{document}\n"]
+        size = len(chunks[0])
+        n_sections = 0
+        while size < self.size:
+            if rnd.random() < 0.08:
+                n_sections += 1
+                chunk = f"\\section{{Section {n_sections}}}\\label{{sec:{n_sections}}}\n"
+            else:
+                chunk = self.paragraph() + "\n\n"
+            chunks.append(chunk)
+            size += len(chunk)
+        chunks.append("\\end{document}\n")
+        return "".join(chunks)
+
+
+def generate_document(size_kb=64, math_density=0.3, nesting=3, ru_share=0.5, seed=0) -> str:
+    return DocumentGenerator(size_kb, math_density, nesting, ru_share, seed).document()
+
+
+if __name__ == "__main__":
+    size_kb = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate_document(size_kb, seed=seed))
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import glob
+import os
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import ResultCache
+from .checker import CheckLimits, enabled_codes, perform_checks, replay_errors
+from .chunking import Chunk, split_chunks
+from .diff import ChangedRanges, LineRange, file_key
+from .helpers import SupportedLanguages
+from .profiling import Profile
+from .texparser import SupportedParsers
+from .xref import XrefIndex, document_codes
+
+TEX_EXTENSIONS = (".tex",)
+# Codes reported at most once per document, which the parts of a document checked apart must not repeat
+ONCE_PER_DOCUMENT_CODES = frozenset(("DOUBLE_DOLLARS",))
+
+
+def collect_tex_files(paths: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Expand files, directories (searched recursively) and glob patterns into a list of LaTeX files.
+
+    Returns the files in a deterministic order without duplicates, and the paths that matched nothing.
+    """
+    found = []
+    missing = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                matches.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith(TEX_EXTENSIONS))
+        elif os.path.isfile(path):
+            matches = [path]
+        else:
+            matches = sorted(m for m in glob.glob(path, recursive=True) if os.path.isfile(m))
+        if not matches:
+            missing.append(path)
+        found.extend(matches)
+    return list(dict.fromkeys(found)), missing
+
+
+def check_file(
+    filename: str,
+    language: SupportedLanguages = SupportedLanguages.EN,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    on_error: Optional[Callable[[str, Optional[int]], None]] = None,
+    profile: Optional[Profile] = None,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    xref_index: Optional[XrefIndex] = None,
+    jobs: int = 1,
+    cache: Optional[ResultCache] = None,
+    limits: Optional[CheckLimits] = None,
+    totals: Optional[Dict[str, int]] = None,
+    changed_lines: Optional[Iterable[LineRange]] = None,
+) -> Dict[str, List[int]]:
+    """Check one file; with ``jobs`` other than 1 its sections are checked in parallel (see
+    :func:`check_chunks`). With a :class:`ResultCache` given as ``cache``, the results for a file checked
+    before with the same content and settings are taken from it instead; results cut short by ``limits``
+    or restricted to ``changed_lines`` (see :func:`perform_checks`) are neither taken from the cache nor
+    stored in it. ``on_error(code, pos)``, if given, receives the findings in the order of their positions
+    once the file is checked, whichever way it was."""
+    with open(filename, mode="r", encoding="utf-8") as infile:
+        source = infile.read()
+    if limits is not None or changed_lines is not None:
+        cache = None
+    chunks = split_chunks(source) if jobs != 1 else None
+    if chunks is not None and len(chunks) < 2:
+        chunks = None
+    if cache is not None:
+        # Findings near the boundaries between the parts checked separately depend on where those are
+        parts = [part[0].start for part in group_chunks(chunks, jobs)] if chunks is not None else None
+        key = cache.key(source, language, parser, select, ignore, cross_document=xref_index is None, parts=parts)
+        errors = cache.get(key, xref_index)
+        if errors is not None:
+            if on_error is not None:
+                replay_errors(errors, on_error)
+            return errors
+
+    if chunks is not None:
+        errors = check_chunks(
+            source,
+            chunks,
+            language,
+            jobs,
+            parser,
+            None,
+            profile,
+            select,
+            ignore,
+            xref_index,
+            limits,
+            totals,
+            changed_lines,
+        )
+    else:
+        errors = perform_checks(
+            source,
+            language=language,
+            parser=parser,
+            profile=profile,
+            select=select,
+            ignore=ignore,
+            xref_index=xref_index,
+            limits=limits,
+            totals=totals,
+            changed_lines=changed_lines,
+        )
+    if cache is not None:
+        cache.put(key, errors, xref_index)
+    if on_error is not None:
+        replay_errors(errors, on_error)
+    return errors
+
+
+def merge_part_errors(errors: Dict[str, List[int]], part_errors: Dict[str, List[int]], shift: int = 0):
+    """Add the findings of one part of a document to ``errors``, those of the document, moving them by
+    ``shift``."""
+    for code, positions in part_errors.items():
+        if code in ONCE_PER_DOCUMENT_CODES and errors.get(code):
+            continue
+        errors.setdefault(code, []).extend(pos + shift for pos in positions)
+
+
+def errors_within(errors: Dict[str, List[int]], start: int, end: int) -> Dict[str, List[int]]:
+    """The findings of ``errors`` at offsets from ``start`` up to ``end``, e.g. those in one part of a document
+    that was checked together with the text around it; codes reported without a position are kept."""
+    within = {}
+    for code, positions in errors.items():
+        kept = [pos for pos in positions if start <= pos < end]
+        if kept or not positions:
+            within[code] = kept
+    return within
+
+
+def _check_chunks_in_worker(
+    source: str, part: Tuple[List[Chunk], int, int], collect_profile: bool, document: Optional[str], **kwargs
+) -> Tuple[Dict[str, List[int]], Optional[Profile], XrefIndex]:
+    chunks, start, end = part
+    profile = Profile() if collect_profile else None
+    xref_index = XrefIndex(document)
+    errors = perform_checks(source, profile=profile, xref_index=xref_index, chunks=chunks, **kwargs)
+    if profile is not None:
+        profile.documents = 0
+    return errors_within(errors, start, end), profile, xref_index.within(start, end)
+
+
+def _chunk_workers(chunks: List[Chunk], jobs: int) -> int:
+    return min(jobs or os.cpu_count() or 1, len(chunks))
+
+
+def group_chunks(chunks: List[Chunk], jobs: int = 0) -> List[List[Chunk]]:
+    """The runs of consecutive ``chunks`` that :func:`check_chunks` checks as separate parts with ``jobs``
+    workers."""
+    # A few parts per worker balance the load; each part is sent together with the whole source
+    n_parts = min(_chunk_workers(chunks, jobs) * 4, len(chunks))
+    bounds = [len(chunks) * i // n_parts for i in range(n_parts + 1)]
+    return [chunks[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def check_chunks(
+    source: str,
+    chunks: List[Chunk],
+    language: SupportedLanguages = SupportedLanguages.EN,
+    jobs: int = 0,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    on_error: Optional[Callable[[str, Optional[int]], None]] = None,
+    profile: Optional[Profile] = None,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    xref_index: Optional[XrefIndex] = None,
+    limits: Optional[CheckLimits] = None,
+    totals: Optional[Dict[str, int]] = None,
+    changed_lines: Optional[Iterable[LineRange]] = None,
+) -> Dict[str, List[int]]:
+    """Check one document by parts: ``chunks`` (e.g. from :func:`latexcheck.chunking.split_chunks`) are
+    grouped into runs of consecutive chunks that a pool of ``jobs`` worker processes check like
+    :func:`perform_checks` would (``jobs=0`` uses one worker per CPU core).
+
+    Every run is checked together with the chunk before and the chunk after it, and only the findings within
+    the run are kept, so that the rules see the nodes on both sides of a boundary between runs and the
+    findings are those of checking the document as a whole. The exception is a ``\\mid`` outside of formulas,
+    which looks at all the text of the document around it. Labels and references are gathered from all runs
+    before the cross-reference checks are run, as :func:`latexcheck.check_project` does for files. With
+    ``limits`` the workers only stop early in ``fail_fast`` mode, and the findings of all runs are then cut
+    down to the limits; ``totals``, if given, receives the number of findings per code, and ``changed_lines``
+    restricts the findings to the lines given, as with :func:`perform_checks`. ``on_error`` receives the
+    findings of all runs in the order of their positions once they are all checked.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = _chunk_workers(chunks, jobs)
+    runs = group_chunks(chunks, jobs)
+    parts = []
+    for i, run in enumerate(runs):
+        context = runs[i - 1][-1:] if i > 0 else []
+        context += run
+        context += runs[i + 1][:1] if i + 1 < len(runs) else []
+        # Findings at the end of the document belong to the last run
+        end = run[-1].end + 1 if run[-1].end == len(source) else run[-1].end
+        parts.append((context, run[0].start, end))
+    document = xref_index.document if xref_index is not None else None
+    if profile is not None:
+        profile.documents += 1
+    # Findings in the chunks around a run count towards the limits of its worker: only stop on a finding that
+    # stops the whole check
+    worker_limits = CheckLimits(fail_fast=limits.fail_fast) if limits is not None and limits.fail_fast else None
+
+    errors = {}
+    document_index = XrefIndex(document)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        worker = partial(
+            _check_chunks_in_worker,
+            source,
+            collect_profile=profile is not None,
+            document=document,
+            language=language,
+            parser=parser,
+            select=frozenset(select) if select is not None else None,
+            ignore=frozenset(ignore) if ignore is not None else None,
+            limits=worker_limits,
+            changed_lines=list(changed_lines) if changed_lines is not None else None,
+        )
+        for part_errors, part_profile, part_index in executor.map(worker, parts):
+            merge_part_errors(errors, part_errors)
+            if profile is not None:
+                profile.merge(part_profile)
+            document_index.merge(part_index)
+
+    if xref_index is not None:
+        xref_index.merge(document_index)
+    else:
+        changed = ChangedRanges(source, changed_lines) if changed_lines is not None else None
+        codes = document_codes(source, enabled_codes(language, select, ignore), select)
+        for code, _, pos in document_index.findings(codes):
+            if changed is not None and pos not in changed:
+                continue
+            errors.setdefault(code, []).append(pos)
+    if totals is not None:
+        for code, positions in errors.items():
+            totals[code] = totals.get(code, 0) + max(len(positions), 1)
+    if limits is not None:
+        errors = limits.truncate(errors)
+
+    if on_error is not None:
+        replay_errors(errors, on_error)
+    return errors
+
+
+def _check_file_in_worker(
+    filename: str,
+    collect_profile: bool,
+    collect_xrefs: bool,
+    collect_totals: bool,
+    changed_lines: Optional[Dict[str, List[LineRange]]],
+    **kwargs,
+) -> Tuple[Dict[str, List[int]], Optional[Profile], Optional[XrefIndex], Optional[Dict[str, int]]]:
+    profile = Profile() if collect_profile else None
+    xref_index = XrefIndex(filename) if collect_xrefs else None
+    totals = {} if collect_totals else None
+    file_lines = changed_lines.get(file_key(filename), []) if changed_lines is not None else None
+    errors = check_file(
+        filename, profile=profile, xref_index=xref_index, totals=totals, changed_lines=file_lines, **kwargs
+    )
+    return errors, profile, xref_index, totals
+
+
+def check_files(
+    filenames: List[str],
+    language: SupportedLanguages = SupportedLanguages.EN,
+    jobs: int = 1,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    on_error: Optional[Callable[[str, str, Optional[int]], None]] = None,
+    profile: Optional[Profile] = None,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    xref_index: Optional[XrefIndex] = None,
+    cache: Optional[ResultCache] = None,
+    limits: Optional[CheckLimits] = None,
+    totals: Optional[Dict[str, Dict[str, int]]] = None,
+    changed_lines: Optional[Dict[str, List[LineRange]]] = None,
+) -> Iterator[Tuple[str, Dict[str, List[int]]]]:
+    """Yield ``(filename, errors)`` for every file, in the order of ``filenames``.
+
+    With ``jobs`` other than 1 the files are checked by a pool of worker processes
+    (``jobs=0`` uses one worker per CPU core); a single file is then checked by sections (see
+    :func:`check_chunks`).
+    ``on_error(filename, code, pos)``, if given, receives the findings of every file, in the order of their
+    positions (see :func:`latexcheck.checker.replay_errors`), once the file is checked and before its result is
+    yielded, however the file was checked.
+    A :class:`Profile` passed as ``profile`` accumulates the statistics of all files, workers included.
+    ``select`` and ``ignore`` are passed on to :func:`perform_checks`. With an :class:`XrefIndex` given
+    as ``xref_index``, the files are treated as parts of one project: the labels and references of each
+    are merged into the index, and the cross-document checks are left to the caller. ``cache`` and
+    ``limits`` are passed on to :func:`check_file`, which applies the limits to every file on its own;
+    ``totals``, if given, receives the number of findings per code of every file, by filename.
+    ``changed_lines`` gives the lines changed in every file (see :func:`latexcheck.diff.changed_lines_by_file`)
+    to restrict the findings to; files it does not list have no findings then. Files not yet checked when the
+    caller stops iterating are not checked at all.
+    """
+    if jobs == 1 or len(filenames) < 2:
+        for filename in filenames:
+            report = partial(on_error, filename) if on_error else None
+            file_index = XrefIndex(filename) if xref_index is not None else None
+            file_totals = totals.setdefault(filename, {}) if totals is not None else None
+            file_lines = changed_lines.get(file_key(filename), []) if changed_lines is not None else None
+            errors = check_file(
+                filename,
+                language,
+                parser,
+                report,
+                profile,
+                select,
+                ignore,
+                file_index,
+                jobs,
+                cache,
+                limits,
+                file_totals,
+                file_lines,
+            )
+            if xref_index is not None:
+                xref_index.merge(file_index)
+            yield filename, errors
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs or os.cpu_count() or 1, len(filenames))
+    chunksize = max(1, len(filenames) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        worker = partial(
+            _check_file_in_worker,
+            collect_profile=profile is not None,
+            collect_xrefs=xref_index is not None,
+            collect_totals=totals is not None,
+            changed_lines=changed_lines,
+            language=language,
+            parser=parser,
+            select=frozenset(select) if select is not None else None,
+            ignore=frozenset(ignore) if ignore is not None else None,
+            cache=cache,
+            limits=limits,
+        )
+        results = executor.map(worker, filenames, chunksize=chunksize)
+        try:
+            for filename, (errors, file_profile, file_index, file_totals) in zip(filenames, results):
+                if profile is not None:
+                    profile.merge(file_profile)
+                if xref_index is not None:
+                    xref_index.merge(file_index)
+                if totals is not None:
+                    totals[filename] = file_totals
+                if on_error is not None:
+                    replay_errors(errors, partial(on_error, filename))
+                yield filename, errors
+        finally:
+            # Cancels the files not started yet, so that leaving the pool does not wait for them
+            results.close()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .helpers import SupportedLanguages
+from .texparser import SupportedParsers
+from .xref import XrefIndex
+
+CACHE_DIR_ENV = "LATEXCHECK_CACHE_DIR"
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+# Share of the size limit an oversized cache is pruned down to, so that it is not pruned again after every run
+PRUNE_TARGET = 0.8
+
+
+@lru_cache(maxsize=None)
+def package_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        return "unknown"
+    try:
+        return version("latexcheck")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def ruleset_version() -> str:
+    """Digest of the code of the checker itself (rules, parsers and error descriptions), so that results are
+    not reused once any of it changes, even without a new package version."""
+    import hashlib
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for name in sorted(filenames):
+            if name.endswith((".py", ".json")):
+                path = os.path.join(dirpath, name)
+                digest.update(os.path.relpath(path, package_dir).encode("utf-8") + b"\0")
+                with open(path, mode="rb") as infile:
+                    digest.update(infile.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Check results stored on disk in ``directory``, keyed by the content of the document and everything
+    else the findings depend on: the language, parser and error codes selected, whether the document is
+    checked as a whole or by parts, the package version and the code of the checker.
+
+    Entries are written to a temporary file and renamed into place, so that worker processes, or several
+    runs at once, may share a cache. Reading an entry refreshes its modification time, and :meth:`prune`
+    deletes the entries least recently used once the cache takes more than ``max_size`` bytes.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(
+        self,
+        source: str,
+        language: SupportedLanguages = SupportedLanguages.EN,
+        parser: SupportedParsers = SupportedParsers.BUILTIN,
+        select: Optional[Iterable[str]] = None,
+        ignore: Optional[Iterable[str]] = None,
+        cross_document: bool = True,
+        parts: Optional[Sequence[int]] = None,
+    ) -> str:
+        """Key of the results of checking ``source`` with the settings given; ``parts`` are the start offsets
+        of the parts the document is checked by separately (see :func:`latexcheck.batch.check_chunks`), if it
+        is not checked as a whole."""
+        import hashlib
+
+        settings = [
+            package_version(),
+            ruleset_version(),
+            language.value,
+            parser.value,
+            sorted(select) if select is not None else None,
+            sorted(ignore) if ignore is not None else None,
+            cross_document,
+            list(parts) if parts is not None else None,
+        ]
+        digest = hashlib.sha256(json.dumps(settings).encode("utf-8") + b"\0")
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:] + ".json")
+
+    def get(self, key: str, xref_index: Optional[XrefIndex] = None) -> Optional[Dict[str, List[int]]]:
+        """The errors stored for ``key``, or ``None``; the labels, references and citations stored with them
+        are added to ``xref_index``, if given."""
+        path = self._path(key)
+        try:
+            with open(path, mode="r", encoding="utf-8") as infile:
+                entry = json.load(infile)
+        except (OSError, ValueError):
+            return None
+        if xref_index is not None:
+            if "xrefs" not in entry:
+                return None
+            xref_index.add_json(entry["xrefs"])
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["errors"]
+
+    def put(self, key: str, errors: Dict[str, List[int]], xref_index: Optional[XrefIndex] = None):
+        """Store ``errors`` for ``key``, with the labels, references and citations of ``xref_index`` if given.
+        Failing to write is not an error: the entry is then just missing."""
+        import tempfile
+
+        entry = {"errors": errors}
+        if xref_index is not None:
+            entry["xrefs"] = xref_index.to_json()
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, mode="w", encoding="utf-8") as outfile:
+                json.dump(entry, outfile)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def prune(self):
+        """If the entries take more than ``max_size`` bytes, delete the least recently used ones until they
+        take at most ``PRUNE_TARGET`` of it."""
+        entries = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_size:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size * PRUNE_TARGET:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import re
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+from .chunking import Chunk, parse_chunks
+from .diff import ChangedRanges, LineRange
+from .helpers import Severity, SupportedLanguages, error_descriptions, severity_level
+from .profiling import Profile, profile_phase
+from .rules import RULES
+from .texparser import SupportedParsers
+from .tree import Treenode, fill_node_links, tree_to_str
+from .xref import XREF_CODES, XrefIndex, document_codes
+
+
+re_cyrillic = re.compile("[\u0400-\u04ff]")
+
+
+def enabled_codes(
+    language: SupportedLanguages = SupportedLanguages.EN,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+) -> FrozenSet[str]:
+    """Error codes reported for ``language``: all with a description, or those in ``select``, minus ``ignore``."""
+    codes = set(error_descriptions[language])
+    if select is not None:
+        codes &= set(select)
+    if ignore is not None:
+        codes -= set(ignore)
+    return frozenset(codes)
+
+
+@dataclass(frozen=True)
+class CheckLimits:
+    """When to stop checking a document before all rules have run.
+
+    ``max_errors`` stops after that many findings and ``fail_fast`` after the first finding of that
+    :class:`~latexcheck.helpers.Severity` or a more serious one. ``max_per_code`` keeps at most that many
+    positions per error code: further findings of the code are only counted.
+    """
+
+    max_errors: Optional[int] = None
+    max_per_code: Optional[int] = None
+    fail_fast: Optional[Severity] = None
+
+    def stop_codes(self, language: SupportedLanguages, codes: Iterable[str]) -> FrozenSet[str]:
+        """Those of ``codes`` that stop the check in ``fail_fast`` mode."""
+        if self.fail_fast is None:
+            return frozenset()
+        descriptions = error_descriptions[language]
+        return frozenset(
+            code for code in codes if severity_level(code, descriptions[code]["severity"]) <= self.fail_fast
+        )
+
+    def truncate(self, errors: Dict[str, List[int]]) -> Dict[str, List[int]]:
+        """``errors`` put together from parts checked apart, cut down to ``max_per_code`` positions per code
+        and ``max_errors`` findings in all."""
+        left = self.max_errors
+        truncated = {}
+        for code, positions in errors.items():
+            if left is not None and left <= 0:
+                break
+            if self.max_per_code is not None:
+                positions = positions[: self.max_per_code]
+            if left is not None:
+                positions = positions[:left]
+                left -= max(len(positions), 1)
+            truncated[code] = positions
+        return truncated
+
+
+class _StopChecks(Exception):
+    pass
+
+
+def text_languages(source: str) -> FrozenSet[SupportedLanguages]:
+    if re_cyrillic.search(source):
+        return frozenset((SupportedLanguages.EN, SupportedLanguages.RU))
+    return frozenset((SupportedLanguages.EN,))
+
+
+def perform_checks(
+    source: str,
+    language: SupportedLanguages = SupportedLanguages.EN,
+    debug_mode=False,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    on_error: Optional[Callable[[str, Optional[int]], None]] = None,
+    profile: Optional[Profile] = None,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    xref_index: Optional[XrefIndex] = None,
+    chunks: Optional[Sequence[Chunk]] = None,
+    limits: Optional[CheckLimits] = None,
+    totals: Optional[Dict[str, int]] = None,
+    changed_lines: Optional[Iterable[LineRange]] = None,
+):
+    """Check ``source`` and return the positions of the findings, grouped by error code.
+
+    ``on_error(code, pos)``, if given, is called as soon as each finding is produced; a code reported
+    without a position is passed on once, with ``pos=None``. A :class:`Profile` passed as ``profile``
+    collects the time spent per phase and per rule. ``select`` and ``ignore`` restrict the error codes
+    reported; rules for other codes, and rules that only apply to text in languages absent from the
+    document, are not run at all. Labels, references and citations are gathered into an
+    :class:`~latexcheck.xref.XrefIndex` to find unreferenced and duplicate labels and undefined references;
+    with an index given as ``xref_index`` they are added to it instead, and these checks, which may span
+    documents, are left to the caller. Duplicate labels and undefined references are only reported for a
+    whole document, or if they are selected (see :func:`latexcheck.xref.document_codes`).
+
+    The document is parsed section by section (see :func:`latexcheck.chunking.split_chunks`): a section that
+    cannot be parsed is reported as ``PARSE_ERROR`` and the others are still checked. Passing ``chunks``
+    checks only those parts of ``source``.
+
+    With :class:`CheckLimits` given as ``limits`` the check stops early, or keeps only some of the positions
+    of frequent codes, and returns what it found until then; ``totals``, if given, receives the number of
+    findings per code, including those whose positions were not kept.
+
+    With ``changed_lines``, the ``(first, last)`` line numbers of the lines a change touched (see
+    :func:`latexcheck.diff.parse_unified_diff`), only the findings on those lines are reported: the whole
+    document is still parsed, but node rules only run on the nodes that overlap the changed lines.
+    """
+    errors = {}
+    codes = enabled_codes(language, select, ignore)
+    if xref_index is None:
+        codes = document_codes(source, codes, select)
+    changed = ChangedRanges(source, changed_lines) if changed_lines is not None else None
+    found = 0
+    max_errors = max_per_code = None
+    stop_codes = frozenset()
+    if limits is not None:
+        max_errors, max_per_code = limits.max_errors, limits.max_per_code
+        stop_codes = limits.stop_codes(language, codes)
+
+    def add_error(err_code, bad_node=None):
+        nonlocal errors, found
+        if err_code not in codes:
+            return
+        pos = None
+        if isinstance(bad_node, int):
+            pos = bad_node
+        elif isinstance(bad_node, Treenode):
+            pos = bad_node.resolved_pos
+        if changed is not None and (pos is None or pos not in changed):
+            return
+
+        if err_code not in errors:
+            errors[err_code] = []
+            if pos is None and on_error is not None:
+                on_error(err_code, None)
+        elif pos is None:
+            return
+        if pos is not None and (max_per_code is None or len(errors[err_code]) < max_per_code):
+            errors[err_code].append(pos)
+            if on_error is not None:
+                on_error(err_code, pos)
+        if totals is not None:
+            totals[err_code] = totals.get(err_code, 0) + 1
+        found += 1
+        if err_code in stop_codes or max_errors is not None and found >= max_errors:
+            raise _StopChecks
+
+    if profile is not None:
+        profile.documents += 1
+
+    try:
+        with profile_phase(profile, "parse"):
+            latex_tree, parse_errors = parse_chunks(source, parser, chunks)
+        for e in parse_errors:
+            add_error("PARSE_ERROR", e.pos)
+        if latex_tree is None:
+            return errors
+        with profile_phase(profile, "link"):
+            all_nodes = fill_node_links(latex_tree)
+    except _StopChecks:
+        return errors
+    except Exception as _:
+        with suppress(_StopChecks):
+            add_error("PARSE_ERROR", None)
+        return errors
+
+    if debug_mode:
+        print(tree_to_str(latex_tree))
+
+    with profile_phase(profile, "rules"):
+        registry = RULES.subset(codes, text_languages(source), cross_document=xref_index is None)
+        nodes = changed.nodes(all_nodes, len(source)) if changed is not None else None
+        try:
+            # Nothing to report if nothing changed, but the cross-references are still needed
+            if nodes is None or changed:
+                registry.run(latex_tree, all_nodes, add_error, profile, nodes)
+            stopped = False
+        except _StopChecks:
+            stopped = True
+    if xref_index is not None or not codes.isdisjoint(XREF_CODES):
+        with profile_phase(profile, "xref"):
+            document_index = (xref_index if xref_index is not None else XrefIndex()).add_tree(latex_tree)
+        if xref_index is None and not stopped:
+            with suppress(_StopChecks):
+                for code, _, pos in document_index.findings(codes):
+                    add_error(code, pos)
+
+    return errors
+
+
+def replay_errors(errors: Dict[str, List[int]], on_error: Callable[[str, Optional[int]], None]):
+    """Pass the findings of ``errors`` to ``on_error(code, pos)`` in the order of their positions, the codes
+    reported without a position first and findings at the same position in the order of their codes, so that
+    the order does not depend on how the document was split up or whether the results were cached."""
+    findings = [(pos, code) for code, positions in errors.items() for pos in positions or [None]]
+    findings.sort(key=lambda finding: (finding[0] is not None, finding[0] or 0, finding[1]))
+    for pos, code in findings:
+        on_error(code, pos)
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .texparser import LatexSyntaxError, SupportedParsers, Token, parse_latex, tokenize
+from .tree import LatCat, Treenode, iter_subtree, traverse_tex
+
+SECTIONING_COMMANDS = frozenset(("part", "part*", "chapter", "chapter*", "section", "section*"))
+# Environments a top-level sectioning command may appear in and still start a chunk
+CHUNK_ENCLOSING = ((), ("document",))
+MATH_CLOSERS = {"$": "$", "$$": "$$", "\\(": "\\)", "\\[": "\\]"}
+
+re_blank_line = re.compile(r"\n[ \t]*\n")
+re_blank_lines = re.compile(r"\n[ \t]*\n(?:[ \t]*\n)*")
+re_texsoup_offset = re.compile(r"\[Line:? \d+, Offset:? (\d+)]")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Part of a document, from ``start`` to ``end``, that can be parsed on its own.
+
+    ``enclosing`` are the environments already open where the chunk starts and ``left_open`` those still open
+    where it ends (at most ``document`` for the chunks :func:`split_chunks` makes). ``in_text`` tells that the
+    chunk starts in the middle of text that a parser of the whole document keeps in one string with the text
+    before it, as in the chunks :func:`split_paragraphs` makes at blank lines.
+    """
+
+    start: int
+    end: int
+    enclosing: Tuple[str, ...] = ()
+    left_open: Tuple[str, ...] = ()
+    in_text: bool = False
+
+
+def split_chunks(source: str, within: Optional[Chunk] = None, strict: bool = True) -> List[Chunk]:
+    """Cut ``source`` (or the chunk ``within`` of it) before every top-level ``\\part``, ``\\chapter`` and
+    ``\\section``.
+
+    A sectioning command only starts a chunk outside of environments other than ``document`` and, if
+    ``strict``, outside of math and groups. Inline math is taken to end at a blank line, so that a stray ``$``
+    does not keep the rest of the document in one chunk. Source that cannot even be tokenized is a single
+    chunk.
+    """
+    if within is None:
+        within = Chunk(0, len(source))
+    try:
+        tokens = tokenize(source, within.start, within.end)
+    except LatexSyntaxError:
+        return [within]
+    return _split_tokens(tokens, within, strict)
+
+
+def split_paragraphs(source: str, within: Optional[Chunk] = None) -> List[Chunk]:
+    """Cut ``source`` (or the chunk ``within`` of it) like :func:`split_chunks`, and also at blank lines and
+    before and after environments, where these are at the top level of a section.
+
+    Nothing is cut inside brackets, which may be the optional argument of a command, nor in verbatim text.
+    A chunk cut at a blank line starts with the blank line.
+    """
+    if within is None:
+        within = Chunk(0, len(source))
+    try:
+        tokens = tokenize(source, within.start, within.end)
+    except LatexSyntaxError:
+        return [within]
+    return _split_tokens(tokens, within, strict=True, paragraphs=True)
+
+
+def _split_tokens(tokens: List[Token], within: Chunk, strict: bool, paragraphs: bool = False) -> List[Chunk]:
+    # Cuts are (start, enclosing, in_text, movable): a cut at a blank line or an environment, unlike the start
+    # and a sectioning command, does not leave a chunk of nothing but blank text behind, which the parser would
+    # drop, but gives its blank text to the chunk before or after it
+    cuts = [(within.start, within.enclosing, within.in_text, False)]
+    filled = not paragraphs
+
+    def add_cut(start: int, in_text: bool = False, movable: bool = True):
+        nonlocal filled
+        if start <= cuts[-1][0] or start >= within.end:
+            return
+        if not filled:
+            if cuts[-1][3]:
+                cuts.pop()
+            elif movable:
+                return
+        cuts.append((start, tuple(environments), in_text, movable))
+        filled = not paragraphs
+
+    environments = list(within.enclosing)
+    depth = 0
+    brackets = 0
+    math = None
+    skip = False
+    # Whether the parser has text pending for a string that a cut here would split
+    in_string = within.in_text
+    for i, (kind, start, end, value) in enumerate(tokens):
+        if skip:
+            skip = False
+            continue
+        top_level = paragraphs and depth == 0 and brackets == 0 and math is None
+        if kind == "begin":
+            if top_level and value != "document" and tuple(environments) in CHUNK_ENCLOSING:
+                add_cut(start)
+            environments.append(value)
+        elif kind == "end":
+            if value in environments:
+                closed = tuple(environments) not in CHUNK_ENCLOSING
+                del environments[len(environments) - 1 - environments[::-1].index(value) :]
+                if top_level and closed and tuple(environments) in CHUNK_ENCLOSING:
+                    filled = True
+                    add_cut(end)
+        elif kind == "verbatim":
+            # The text of the environment follows as a token of its own
+            skip = paragraphs
+            if top_level and tuple(environments) in CHUNK_ENCLOSING:
+                add_cut(start)
+                filled = True
+                add_cut(end)
+        elif kind == "{":
+            depth += 1
+        elif kind == "}":
+            # A closing brace without a group to close is text
+            in_string = depth == 0
+            depth = max(depth - 1, 0)
+        elif kind == "[" or kind == "]":
+            in_string = True
+            if paragraphs and depth == 0 and math is None:
+                brackets = max(brackets + (1 if kind == "[" else -1), 0)
+        elif kind == "$" or kind == "math_delimiter":
+            if kind == "$" and i + 1 < len(tokens) and tokens[i + 1][0] == "$" and tokens[i + 1][1] == end:
+                value = "$$"
+                skip = True
+            in_string = False
+            if math is None and value in MATH_CLOSERS:
+                math = MATH_CLOSERS[value]
+            elif value == math:
+                math = None
+            elif math is None:
+                in_string = True
+        elif kind == "text":
+            if paragraphs:
+                offset = 0
+                if top_level and tuple(environments) in CHUNK_ENCLOSING:
+                    for blank in re_blank_lines.finditer(value):
+                        filled = filled or bool(value[offset : blank.start()].strip())
+                        add_cut(start + blank.start(), blank.start() > 0 or in_string)
+                        offset = blank.start()
+                filled = filled or bool(value[offset:].strip())
+            in_string = in_string or not value.isspace()
+            if math in ("$", "\\)") and re_blank_line.search(value):
+                math = None
+        elif (
+            kind == "command"
+            and value in SECTIONING_COMMANDS
+            and (depth == 0 and math is None or not strict)
+            and tuple(environments) in CHUNK_ENCLOSING
+        ):
+            add_cut(start, movable=False)
+            brackets = 0
+        if kind not in ("text", "}", "[", "]", "$", "math_delimiter"):
+            in_string = False
+        if kind != "text" and cuts[-1][0] != end:
+            # Unless the token ended with a cut
+            filled = True
+
+    ends = [cut[:2] for cut in cuts[1:]] + [(within.end, within.left_open)]
+    return [
+        Chunk(start, end, enclosing, left_open, in_text)
+        for (start, enclosing, in_text, _), (end, left_open) in zip(cuts, ends)
+    ]
+
+
+def parse_chunk(
+    source: str,
+    chunk: Chunk,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    tokens: Optional[List[Token]] = None,
+) -> Treenode:
+    """Parse one chunk of ``source``; the environments of ``chunk.enclosing`` are the first nodes of the tree.
+
+    Positions are relative to the whole ``source``. Raises :class:`LatexSyntaxError`, with the position of
+    the error if it is known and the start of the chunk otherwise, if the chunk cannot be parsed. ``tokens``
+    may give the tokens of the chunk for the built-in parser, if they are known already.
+    """
+    if parser != SupportedParsers.TEXSOUP:
+        return parse_latex(source, chunk.start, chunk.end, chunk.enclosing, chunk.left_open, tokens)
+
+    import TexSoup
+
+    # TexSoup cannot start or end inside an environment: open and close those around the chunk text
+    prefix = "".join(f"\\begin{{{name}}}" for name in chunk.enclosing)
+    suffix = "".join(f"\\end{{{name}}}" for name in reversed(chunk.left_open))
+    shift = chunk.start - len(prefix)
+    try:
+        tree = traverse_tex(TexSoup.TexSoup(prefix + source[chunk.start : chunk.end] + suffix))
+    except Exception as e:
+        raise LatexSyntaxError(str(e), _texsoup_error_pos(source, chunk, e, shift)) from e
+    for node in iter_subtree(tree):
+        if shift and node.pos is not None and node.pos >= 0:
+            node.pos += shift
+        if node.cat == LatCat.CMD and node.token == "end":
+            # TexSoup keeps an \end without a \begin as a command
+            name = node.args[0].children[0].token if node.args and node.args[0].children else ""
+            raise LatexSyntaxError(f"Unexpected \\end{{{name}}}.", node.pos)
+    tree.pos, tree.end = chunk.start, chunk.end
+    node = tree
+    for _ in chunk.enclosing:
+        node = node.children[0]
+        node.pos = chunk.start
+    return tree
+
+
+def _texsoup_error_pos(source: str, chunk: Chunk, e: Exception, shift: int) -> int:
+    # Report the error where the built-in parser does, at the construct left open, as TexSoup reports where it
+    # gave up on it
+    try:
+        parse_latex(source, chunk.start, chunk.end, chunk.enclosing, chunk.left_open)
+    except LatexSyntaxError as builtin_error:
+        if builtin_error.pos is not None:
+            return builtin_error.pos
+    offset = re_texsoup_offset.search(str(e))
+    return max(int(offset.group(1)) + shift, chunk.start) if offset else chunk.start
+
+
+def _adopt(parent: Treenode, nodes: Sequence[Treenode]):
+    if parent.children is None:
+        parent.children = []
+    children = parent.children
+    for node in nodes:
+        node.parent = parent
+        node.prev_sibling = children[-1] if children else None
+        if children:
+            children[-1].next_sibling = node
+        children.append(node)
+
+
+def stitch_chunks(chunks: Sequence[Chunk], trees: Sequence[Optional[Treenode]]) -> Optional[Treenode]:
+    """Join the trees of consecutive chunks (``None`` for those that failed to parse) into one tree.
+
+    The nodes of an environment spread over several chunks end up in a single node. Returns ``None`` if no
+    chunk was parsed.
+    """
+    root = None
+    open_env = None
+    for chunk, tree in zip(chunks, trees):
+        if tree is None:
+            if not (chunk.enclosing and chunk.left_open):
+                open_env = None
+            continue
+        if root is None:
+            root = tree
+        else:
+            nodes = tree.children or []
+            if chunk.enclosing and open_env is not None and nodes:
+                enclosing, nodes = nodes[0], nodes[1:]
+                _adopt(open_env, enclosing.children or [])
+                open_env.end = enclosing.end
+            _adopt(root, nodes)
+            if root.end is not None:
+                root.end = tree.end
+        last = root.children[-1] if root.children else None
+        open_env = last if chunk.left_open and last is not None and last.cat == LatCat.ENV else None
+    return root
+
+
+def parse_chunks(
+    source: str, parser: SupportedParsers = SupportedParsers.BUILTIN, chunks: Optional[Sequence[Chunk]] = None
+) -> Tuple[Optional[Treenode], List[LatexSyntaxError]]:
+    """Parse ``source`` chunk by chunk (see :func:`split_chunks`) and stitch the results into one tree.
+
+    A chunk that fails to parse is split again at every sectioning command, groups and math notwithstanding;
+    the parts that still fail are left out of the tree, and their errors are returned, so that a syntax error
+    in one section does not prevent checking the others. The tree is ``None`` if no chunk could be parsed.
+    """
+    tokens = None
+    if chunks is None:
+        try:
+            tokens = tokenize(source)
+        except LatexSyntaxError:
+            chunks = [Chunk(0, len(source))]
+        else:
+            chunks = _split_tokens(tokens, Chunk(0, len(source)), strict=True)
+    token_starts = [token[1] for token in tokens] if tokens is not None else None
+    parsed = []
+    trees = []
+    errors = []
+    for chunk in chunks:
+        try:
+            chunk_tokens = None
+            if tokens is not None and parser != SupportedParsers.TEXSOUP:
+                chunk_tokens = tokens[bisect_left(token_starts, chunk.start) : bisect_left(token_starts, chunk.end)]
+            tree = parse_chunk(source, chunk, parser, chunk_tokens)
+        except Exception as e:
+            parts = split_chunks(source, chunk, strict=False)
+            if len(parts) == 1:
+                errors.append(_syntax_error(e, chunk))
+                tree = None
+            else:
+                for part in parts:
+                    try:
+                        tree = parse_chunk(source, part, parser)
+                    except Exception as part_error:
+                        errors.append(_syntax_error(part_error, part))
+                        tree = None
+                    parsed.append(part)
+                    trees.append(tree)
+                continue
+        parsed.append(chunk)
+        trees.append(tree)
+    return stitch_chunks(parsed, trees), errors
+
+
+def _syntax_error(e: Exception, chunk: Chunk) -> LatexSyntaxError:
+    if isinstance(e, LatexSyntaxError) and e.pos is not None:
+        return e
+    return LatexSyntaxError(str(e), chunk.start)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import os
+import sys
+
+
+def main():
+    # Importing this module loads none of the checker, so that ``from latexcheck import main`` stays cheap; the
+    # modules needed by some options only are imported once they are given
+    import argparse
+
+    from .cache import CACHE_DIR_ENV
+    from .helpers import Severity, SupportedLanguages, error_descriptions
+    from .reporting import OutputFormat, TextReporter, make_reporter
+    from .texparser import SupportedParsers
+
+    parser = argparse.ArgumentParser(description="Perform checks on LaTeX files.")
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        metavar="path",
+        help="LaTeX file, directory to search for .tex files recursively, or glob pattern",
+    )
+    parser.add_argument(
+        "-l", "--language", choices=["EN", "RU"], default="EN", help="Language for error descriptions (EN or RU)"
+    )
+    parser.add_argument("-r", "--rich", choices=["Y", "N"], help="Enable rich text in console output", default="Y")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 to use all CPU cores); a single file is checked by sections, "
+        "with the same findings as when it is checked as a whole",
+    )
+    parser.add_argument(
+        "-p",
+        "--parser",
+        choices=[p.value for p in SupportedParsers],
+        default=SupportedParsers.BUILTIN.value,
+        help="LaTeX parser to build the document tree with",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=[f.value for f in OutputFormat],
+        default=OutputFormat.TEXT.value,
+        help="Output format: grouped text, JSON Lines (one finding per line) or SARIF 2.1.0",
+    )
+    parser.add_argument(
+        "--lsp", action="store_true", help="Run as a Language Server Protocol server on stdin and stdout"
+    )
+    parser.add_argument(
+        "--project",
+        action="store_true",
+        help="Treat every path as the root file of a project and also check the files it includes, "
+        "resolving references across all of them",
+    )
+    parser.add_argument(
+        "--select", metavar="CODES", help="Comma-separated error codes to check for; all others are skipped"
+    )
+    parser.add_argument("--ignore", metavar="CODES", help="Comma-separated error codes not to check for")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=True,
+        metavar="JSON_FILE",
+        help="Print the time spent per phase and per error code to stderr, and optionally save it as JSON",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        default=os.environ.get(CACHE_DIR_ENV),
+        help="Keep the results in DIR and reuse them for files checked before with the same content and "
+        f"settings (the default is taken from {CACHE_DIR_ENV})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write cached results")
+    parser.add_argument(
+        "--max-errors", type=positive_int, metavar="N", help="Stop checking once N findings have been reported"
+    )
+    parser.add_argument(
+        "--max-per-code",
+        type=positive_int,
+        metavar="N",
+        help="Report at most N findings per error code and file, and only count the others",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        choices=[level.name.lower() for level in Severity],
+        metavar="SEVERITY",
+        help="Stop at the first file with a finding of SEVERITY (error, warning, information or hint) or a more "
+        "serious one, and exit with status 1",
+    )
+    diff_source = parser.add_mutually_exclusive_group()
+    diff_source.add_argument(
+        "--diff",
+        metavar="DIFF_FILE",
+        help="Only report findings on the lines a unified diff adds or changes; the diff is read from "
+        "DIFF_FILE ('-' for stdin), and its paths are taken to be relative to the current directory",
+    )
+    diff_source.add_argument(
+        "--git-diff",
+        metavar="REVISION",
+        help="Only report findings on the lines changed since REVISION, as 'git diff REVISION' shows them",
+    )
+    parser.add_argument(
+        "--split-documents",
+        action="store_true",
+        help="Treat every file as a dump of many documents, split at the lines starting with \\documentclass "
+        "or \\begin{document}, and check each document on its own without reading the whole file into memory",
+    )
+    parser.add_argument(
+        "--document-separator",
+        metavar="LINE",
+        help="Split dumps at the lines consisting of LINE instead (implies --split-documents)",
+    )
+    args = parser.parse_args()
+
+    language = SupportedLanguages.EN if args.language.lower() == "en" else SupportedLanguages.RU
+    select, ignore = (
+        [code.strip() for code in codes.split(",") if code.strip()] if codes is not None else None
+        for codes in (args.select, args.ignore)
+    )
+    unknown = sorted((set(select or ()) | set(ignore or ())) - set(error_descriptions[language]))
+    if unknown:
+        parser.error(f"unknown error codes: {', '.join(unknown)}")
+    if args.lsp:
+        from .lsp import LanguageServer
+
+        sys.exit(LanguageServer(language=language, parser=SupportedParsers(args.parser)).serve())
+    split_documents = args.split_documents or args.document_separator is not None
+    if split_documents and (args.project or args.diff is not None or args.git_diff is not None):
+        parser.error("--split-documents cannot be combined with --project, --diff or --git-diff")
+    changed_lines = None
+    paths = args.filenames
+    if args.diff is not None or args.git_diff is not None:
+        from subprocess import CalledProcessError
+
+        from .batch import TEX_EXTENSIONS
+        from .diff import changed_lines_by_file, git_diff, parse_unified_diff
+
+        try:
+            if args.git_diff is not None:
+                # The files a project includes need not be among the paths given
+                diff, base_dir = git_diff(args.git_diff, () if args.project else args.filenames)
+            elif args.diff == "-":
+                diff, base_dir = sys.stdin.read(), os.getcwd()
+            else:
+                with open(args.diff, mode="r", encoding="utf-8") as infile:
+                    diff, base_dir = infile.read(), os.getcwd()
+        except (OSError, CalledProcessError) as e:
+            parser.error(f"cannot get the diff: {e}")
+        changed = parse_unified_diff(diff)
+        changed_lines = changed_lines_by_file(changed, base_dir)
+        if not paths:
+            # Check the files the diff changes
+            paths = [
+                os.path.relpath(os.path.join(base_dir, path)) for path in changed if path.endswith(TEX_EXTENSIONS)
+            ]
+            if not paths:
+                return
+    if not paths:
+        parser.error("at least one path is required")
+
+    from .batch import check_files, collect_tex_files
+    from .checker import CheckLimits, enabled_codes
+
+    output_format = OutputFormat(args.format)
+    # Keep machine-readable output on stdout parseable
+    stream = sys.stdout if output_format == OutputFormat.TEXT else sys.stderr
+    filenames, missing = collect_tex_files(paths)
+    for filename in missing:
+        print(f"'File {filename} does not exist.", file=stream)
+    if changed_lines is not None and not args.project:
+        from .diff import file_key
+
+        filenames = [filename for filename in filenames if file_key(filename) in changed_lines]
+    if not filenames:
+        return
+
+    rich = args.rich.lower() == "y"
+
+    reporter = make_reporter(output_format, language=language, rich=rich)
+    profile = None
+    if args.profile:
+        from .profiling import Profile
+
+        profile = Profile()
+    cache = None
+    if args.cache_dir and not args.no_cache:
+        from .cache import ResultCache
+
+        cache = ResultCache(args.cache_dir)
+    fail_fast = Severity[args.fail_fast.upper()] if args.fail_fast else None
+    limits = None
+    if args.max_errors or args.max_per_code or fail_fast:
+        limits = CheckLimits(max_errors=args.max_errors, max_per_code=args.max_per_code, fail_fast=fail_fast)
+    totals = {} if args.max_per_code else None
+    reported = 0
+
+    def report_finding(filename, code, pos):
+        nonlocal reported
+        if args.max_errors is None or reported < args.max_errors:
+            reported += 1
+            reporter.finding(filename, code, pos)
+
+    options = dict(
+        language=language,
+        jobs=args.jobs,
+        parser=SupportedParsers(args.parser),
+        on_error=report_finding,
+        profile=profile,
+        select=select,
+        ignore=ignore,
+        cache=cache,
+        limits=limits,
+        totals=totals,
+        changed_lines=changed_lines,
+    )
+    if args.project:
+        import itertools
+
+        from .project import check_project, collect_project_files
+
+        projects = []
+        for root in filenames:
+            files, missing_includes = collect_project_files(root)
+            for filename in missing_includes:
+                print(f"'File {filename} included from {root} does not exist.", file=stream)
+            projects.append(files)
+        filenames = [filename for files in projects for filename in files]
+        results = itertools.chain.from_iterable(check_project(files, **options) for files in projects)
+    elif split_documents:
+        from functools import partial
+
+        from .checker import replay_errors
+        from .corpus import check_corpus
+
+        def check_dumps():
+            for filename in filenames:
+                documents = check_corpus(
+                    filename,
+                    args.document_separator,
+                    language=language,
+                    jobs=args.jobs,
+                    parser=SupportedParsers(args.parser),
+                    profile=profile,
+                    select=select,
+                    ignore=ignore,
+                    limits=limits,
+                    totals=totals,
+                )
+                for document, errors in documents:
+                    # Findings are located in the document rather than by reading the whole dump again
+                    reporter.set_source(filename, document.source, document.start, document.line)
+                    replay_errors(errors, partial(report_finding, filename))
+                    yield filename, errors
+
+        results = check_dumps()
+    else:
+        results = check_files(filenames, **options)
+
+    if isinstance(reporter, TextReporter):
+        reporter.show_filenames = len(filenames) > 1 or split_documents
+    stop_codes = frozenset()
+    if limits is not None:
+        stop_codes = limits.stop_codes(language, enabled_codes(language, select, ignore))
+    failed = False
+    left = args.max_errors
+    for filename, errors in results:
+        if left is not None:
+            errors = CheckLimits(max_errors=left).truncate(errors)
+            left -= sum(max(len(positions), 1) for positions in errors.values())
+        reporter.file_checked(filename, errors, totals.get(filename) if totals is not None else None)
+        failed = not stop_codes.isdisjoint(errors)
+        if failed or left is not None and left <= 0:
+            break
+    reporter.close()
+    if cache is not None:
+        cache.prune()
+
+    if profile is not None:
+        profile.print_table(file=sys.stderr)
+        if isinstance(args.profile, str):
+            profile.dump(args.profile)
+    if failed:
+        sys.exit(1)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise ValueError(value)
+    return number
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import mmap
+import re
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .checker import CheckLimits, perform_checks
+from .helpers import SupportedLanguages
+from .profiling import Profile
+from .streaming import map_pending
+from .texparser import SupportedParsers
+
+# A line starting a new document of a dump, unless the document so far has had neither
+re_document_start = re.compile(rb"^[ \t]*\\(?:(documentclass)\b|begin[ \t]*\{document\})", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class CorpusDocument:
+    """One document of a dump: the ``index``-th one, starting at character ``start`` and at the start of line
+    ``line`` of the dump, with ``source`` as its text."""
+
+    index: int
+    start: int
+    line: int
+    source: str = field(repr=False)
+
+
+def _document_spans(data: mmap.mmap, separator: Optional[str]) -> Iterator[Tuple[int, int, int]]:
+    """``(start, end, next_start)`` byte offsets of every document of ``data`` and of the document after it;
+    the bytes from ``end`` to ``next_start`` separate the two."""
+    start = 0
+    if separator is not None:
+        pattern = re.compile(rb"^" + re.escape(separator.encode("utf-8")) + rb"[ \t\r]*(?:\n|\Z)", re.MULTILINE)
+        for match in pattern.finditer(data):
+            yield start, match.start(), match.end()
+            start = match.end()
+    else:
+        has_class = has_body = False
+        for match in re_document_start.finditer(data):
+            is_class = match.group(1) is not None
+            if has_body or is_class and has_class:
+                yield start, match.start(), match.start()
+                start = match.start()
+                has_class = has_body = False
+            if is_class:
+                has_class = True
+            else:
+                has_body = True
+    yield start, len(data), len(data)
+
+
+def _release(data: mmap.mmap, start: int, end: int) -> int:
+    """Drop the pages of ``data`` from ``start`` (a page boundary) up to ``end`` from the memory of the
+    process, where the platform allows it; returns where the pages still kept start."""
+    if not hasattr(mmap, "MADV_DONTNEED"):
+        return start
+    end -= end % mmap.PAGESIZE
+    if end <= start:
+        return start
+    data.madvise(mmap.MADV_DONTNEED, start, end - start)
+    return end
+
+
+def iter_documents(path: str, separator: Optional[str] = None) -> Iterator[CorpusDocument]:
+    """Split the file at ``path``, a dump of many LaTeX documents, into its documents and yield them one by
+    one.
+
+    The file is memory-mapped rather than read, and only the document being yielded is decoded (from UTF-8,
+    replacing invalid bytes, and with newlines translated as when reading text); the pages of the file read
+    so far are dropped from memory as the next document is taken, so that the memory used follows the size
+    of the largest document rather than of the whole dump.
+
+    A document starts at a line beginning with ``\\documentclass``, or with ``\\begin{document}`` if the
+    document before already has a body; text before the first one belongs to the first document. With a
+    ``separator`` given, documents are instead separated by the lines consisting of ``separator`` (and
+    trailing whitespace). Documents that are blank are skipped.
+    """
+    with open(path, mode="rb") as infile:
+        try:
+            data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            return
+    try:
+        yield from _split_documents(data, separator)
+    finally:
+        data.close()
+
+
+def _decode(data: mmap.mmap, start: int, end: int) -> str:
+    # Newlines translated as when reading the file as text, so that offsets are the same as for check_file
+    return data[start:end].decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _split_documents(data: mmap.mmap, separator: Optional[str]) -> Iterator[CorpusDocument]:
+    index = 0
+    start = 0
+    line = 1
+    kept = 0
+    for span_start, span_end, next_start in _document_spans(data, separator):
+        source = _decode(data, span_start, span_end)
+        if source.strip():
+            yield CorpusDocument(index, start, line, source)
+            index += 1
+        start += len(source)
+        line += source.count("\n")
+        if next_start > span_end:
+            gap = _decode(data, span_end, next_start)
+            start += len(gap)
+            line += gap.count("\n")
+        kept = _release(data, kept, span_end)
+
+
+def _shift(errors: Dict[str, List[int]], shift: int) -> Dict[str, List[int]]:
+    return {code: [pos + shift for pos in positions] for code, positions in errors.items()}
+
+
+def _check_document_in_worker(
+    source: str, collect_profile: bool, collect_totals: bool, **kwargs
+) -> Tuple[Dict[str, List[int]], Optional[Profile], Optional[Dict[str, int]]]:
+    profile = Profile() if collect_profile else None
+    totals = {} if collect_totals else None
+    errors = perform_checks(source, profile=profile, totals=totals, **kwargs)
+    return errors, profile, totals
+
+
+def check_corpus(
+    path: str,
+    separator: Optional[str] = None,
+    language: SupportedLanguages = SupportedLanguages.EN,
+    jobs: int = 1,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    profile: Optional[Profile] = None,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    limits: Optional[CheckLimits] = None,
+    totals: Optional[Dict[str, Dict[str, int]]] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[CorpusDocument, Dict[str, List[int]]]]:
+    """Check every document of the dump at ``path`` (split as :func:`iter_documents` does) on its own, and
+    yield ``(document, errors)`` for each, with positions relative to the whole dump.
+
+    With ``jobs`` other than 1 a pool of worker processes checks the documents, and results come in the order
+    the documents are done; as with :func:`latexcheck.check_many`, at most ``max_pending`` documents are read
+    ahead of the results consumed. ``profile``, ``select``, ``ignore`` and ``limits`` are as for
+    :func:`latexcheck.check_files`, with the limits applying to every document on its own; ``totals``, if
+    given, receives the number of findings per code of the document just yielded, under ``path``.
+    Cross-references are resolved within each document.
+    """
+    documents = iter_documents(path, separator)
+    check = partial(
+        _check_document_in_worker,
+        collect_profile=profile is not None,
+        collect_totals=totals is not None,
+        language=language,
+        parser=parser,
+        select=frozenset(select) if select is not None else None,
+        ignore=frozenset(ignore) if ignore is not None else None,
+        limits=limits,
+    )
+    if jobs == 1:
+        results = ((document, check(document.source)) for document in documents)
+    else:
+        results = map_pending(check, ((document, document.source) for document in documents), jobs, max_pending)
+    try:
+        for document, (errors, document_profile, document_totals) in results:
+            if profile is not None:
+                profile.merge(document_profile)
+            if totals is not None:
+                totals[path] = document_totals
+            yield document, _shift(errors, document.start)
+    finally:
+        results.close()
+        documents.close()
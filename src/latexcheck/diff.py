@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .reporting import LineIndex
+from .tree import Treenode
+
+# First and last line of a run of changed lines, 1-based
+LineRange = Tuple[int, int]
+
+re_new_file = re.compile(r"^\+\+\+ (?:\"(.*)\"|(\S.*?))(?:\t.*)?$")
+re_hunk = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def parse_unified_diff(text: str) -> Dict[str, List[LineRange]]:
+    """The lines a unified diff adds or changes, by the path of the new file (without git's ``b/`` prefix).
+
+    Lines the diff only removes change nothing in the new file and are left out, and so are deleted files.
+    """
+    changed: Dict[str, List[LineRange]] = {}
+    ranges = None
+    line = 0
+    left = 0
+    for row in text.splitlines():
+        if left <= 0:
+            match = re_new_file.match(row)
+            if match:
+                path = match.group(1) or match.group(2)
+                if path == "/dev/null":
+                    ranges = None
+                else:
+                    if path.startswith("b/"):
+                        path = path[2:]
+                    ranges = changed.setdefault(path, [])
+                continue
+            match = re_hunk.match(row)
+            if match and ranges is not None:
+                line = int(match.group(1))
+                left = int(match.group(2)) if match.group(2) is not None else 1
+            continue
+        if row.startswith("+"):
+            if ranges and ranges[-1][1] == line - 1:
+                ranges[-1] = (ranges[-1][0], line)
+            else:
+                ranges.append((line, line))
+            line += 1
+            left -= 1
+        elif row.startswith(" ") or not row:
+            line += 1
+            left -= 1
+    return changed
+
+
+def git_diff(revision: str, paths: Iterable[str] = (), cwd: Optional[str] = None) -> Tuple[str, str]:
+    """The diff of the working tree against ``revision`` (of ``paths`` only, if given) as ``git diff`` prints
+    it, and the top directory of the repository, which the paths in the diff are relative to.
+
+    Raises :class:`OSError` if git cannot be run and :class:`subprocess.CalledProcessError` if it fails.
+    """
+    import subprocess
+
+    top = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=cwd, stdout=subprocess.PIPE, check=True, universal_newlines=True
+    ).stdout.strip()
+    diff = subprocess.run(
+        ["git", "diff", "--no-color", "--no-ext-diff", "--unified=0", revision, "--", *paths],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        check=True,
+        encoding="utf-8",
+        errors="replace",
+    ).stdout
+    return diff, top
+
+
+def changed_lines_by_file(changed: Dict[str, List[LineRange]], base_dir: str) -> Dict[str, List[LineRange]]:
+    """``changed`` (see :func:`parse_unified_diff`) by the absolute, normalized paths of the files, taking the
+    paths in the diff to be relative to ``base_dir``."""
+    return {file_key(os.path.join(base_dir, path)): ranges for path, ranges in changed.items()}
+
+
+def file_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class ChangedRanges:
+    """The offsets of the changed lines of a source: ``(start, end)`` pairs, sorted and not overlapping, of
+    the text from the start of each run of changed lines to the end of its last line."""
+
+    def __init__(self, source: str, lines: Iterable[LineRange]):
+        line_starts = LineIndex(source).line_starts
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for first, last in sorted(lines):
+            if first > len(line_starts) or last < first:
+                continue
+            start = line_starts[max(first, 1) - 1]
+            end = line_starts[last] if last < len(line_starts) else len(source)
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Whether any changed text lies between ``start`` and ``end`` (at ``start`` if they are equal)."""
+        i = bisect_left(self.starts, max(end, start + 1)) - 1
+        return i >= 0 and self.ends[i] > start
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __contains__(self, pos: int) -> bool:
+        return self.overlaps(pos, pos + 1)
+
+    def nodes(self, all_nodes: Sequence[Treenode], source_length: int) -> List[Treenode]:
+        """The nodes of ``all_nodes`` (as :func:`~latexcheck.tree.fill_node_links` lists them) that rules
+        checking changed text may report on: those whose text, or the text of their previous or next sibling,
+        overlaps the changed text, since rules look at the siblings of a node and may report at them too."""
+
+        def subtree_end(i: int) -> int:
+            after = i + all_nodes[i].subtree_size
+            return all_nodes[after].resolved_pos if after < len(all_nodes) else source_length
+
+        selected = []
+        for i, node in enumerate(all_nodes):
+            start = node.resolved_pos
+            if node.prev_sibling is not None:
+                start = min(start, node.prev_sibling.resolved_pos)
+            if node.prev_node is not None:
+                start = min(start, node.prev_node.resolved_pos)
+            # Siblings are consecutive in ``all_nodes``; one past the end also covers findings at the next node
+            after = i + node.subtree_size
+            if node.next_sibling is not None and after < len(all_nodes) and all_nodes[after] is node.next_sibling:
+                end = subtree_end(after)
+            else:
+                end = subtree_end(i)
+            if self.overlaps(start, end + 1):
+                selected.append(node)
+        return selected
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .batch import ONCE_PER_DOCUMENT_CODES, errors_within, merge_part_errors
+from .checker import enabled_codes, perform_checks, text_languages
+from .chunking import SECTIONING_COMMANDS, Chunk, parse_chunk, split_paragraphs
+from .helpers import SupportedLanguages
+from .texparser import LatexSyntaxError, SupportedParsers, re_token, tokenize
+from .xref import XrefIndex, document_codes
+
+
+def changed_range(old: str, new: str) -> Tuple[int, int, int]:
+    """``(start, old_end, new_end)`` such that ``new`` is ``old`` with ``old[start:old_end]`` replaced by
+    ``new[start:new_end]``, keeping the common prefix and suffix of the two strings as long as possible."""
+    n = min(len(old), len(new))
+    # Binary searches over slice comparisons keep the character by character work in C
+    low, high = 0, n
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    start = low
+    low, high = 0, n - start
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle :] == new[len(new) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return start, len(old) - low, len(new) - low
+
+
+re_blank = re.compile(r"\s*")
+
+
+@dataclass
+class _Block:
+    """A chunk of the document with the findings and the labels and references found in it when it was
+    checked, at which time it started at ``origin``.
+
+    The other offsets are from the start of the chunk: the blocks next to it only see its text up to ``head``
+    and from ``tail`` on, and its own findings depend on the text from ``depends[0]`` to ``depends[1]``.
+    """
+
+    chunk: Chunk
+    origin: int
+    errors: Dict[str, List[int]]
+    xrefs: XrefIndex
+    head: int
+    tail: int
+    depends: Tuple[int, int]
+
+    @property
+    def shift(self) -> int:
+        return self.chunk.start - self.origin
+
+
+def _starts_section(source: str, pos: int) -> bool:
+    match = re_token.match(source, pos)
+    return match is not None and match.lastgroup == "command" and match.group("command") in SECTIONING_COMMANDS
+
+
+# Tokens the parser adds to the text around them, if they do not close anything: in a chunk starting outside of
+# groups and math, where any brace or math delimiter that opens something ends the text, they never do
+TEXT_TOKENS = frozenset(("text", "[", "]", "}", "\\)", "\\]"))
+
+
+def _text_only(source: str, chunk: Chunk) -> bool:
+    """Whether the parser keeps all of ``chunk`` in the string it starts with."""
+    try:
+        tokens = tokenize(source, chunk.start, chunk.end)
+    except LatexSyntaxError:
+        return False
+    return all(kind in TEXT_TOKENS or value in TEXT_TOKENS for kind, _, _, value in tokens)
+
+
+class IncrementalChecker:
+    """Keeps the findings for a document that is edited piece by piece, such as the text of an editor buffer.
+
+    The document is checked by paragraphs: every chunk made by :func:`latexcheck.chunking.split_paragraphs`,
+    i.e. the text between blank lines, an environment or the start of a section, is checked together with the
+    chunks next to it, but only the findings within the chunk are kept; labels and references are gathered from
+    all of them before the cross-reference checks are run. A section that cannot be parsed is checked as one
+    chunk, like :func:`latexcheck.perform_checks` does. :meth:`apply_edit` only splits again and rechecks the
+    chunks the edit touches (and those after them, as long as the edit changes where they start), and the
+    chunks next to them if it changes the first or last nodes of the chunks, which are all the rules look at
+    across chunks. Its cost depends on the size of the paragraphs edited rather than of the whole document.
+    Findings of the other chunks are only moved by the change in length. An edit that changes the languages the
+    text is written in rechecks everything.
+    """
+
+    def __init__(
+        self,
+        source: str = "",
+        language: SupportedLanguages = SupportedLanguages.EN,
+        parser: SupportedParsers = SupportedParsers.BUILTIN,
+        select: Optional[Iterable[str]] = None,
+        ignore: Optional[Iterable[str]] = None,
+    ):
+        self.language = language
+        self.parser = parser
+        self.select = frozenset(select) if select is not None else None
+        self.ignore = frozenset(ignore) if ignore is not None else None
+        self.source = source
+        self._languages = text_languages(source)
+        self._check_all()
+
+    def _check_all(self):
+        self._blocks = [self._unchecked(chunk) for chunk in split_paragraphs(self.source)]
+        self._recheck(0, len(self._blocks) - 1)
+
+    def _unchecked(self, chunk: Chunk) -> _Block:
+        """A block for ``chunk`` that has not been checked yet.
+
+        The rules only look at the nodes next to a node, so the blocks next to it see the first of its top-level
+        nodes, with the text up to the next one, which a command before it may take as an argument, and the last
+        one, with the one before it. A block that cannot be parsed on its own is seen whole.
+        """
+        head, tail = chunk.end, chunk.start
+        try:
+            node = parse_chunk(self.source, chunk, self.parser)
+        except LatexSyntaxError:
+            node = None
+        for _ in chunk.enclosing if node is not None else ():
+            node = node.children[0]
+        nodes = node.children if node is not None else []
+        if len(nodes) > 1 and nodes[1].pos is not None and nodes[-2].pos is not None:
+            head = min(re_blank.match(self.source, nodes[1].pos).end(), chunk.end)
+            tail = nodes[-2].pos
+            while tail > chunk.start and self.source[tail - 1].isspace():
+                tail -= 1
+        size = chunk.end - chunk.start
+        return _Block(chunk, chunk.start, {}, XrefIndex(), head - chunk.start, tail - chunk.start, (0, size))
+
+    def _context(self, i: int) -> Tuple[int, int]:
+        """The first and last of the blocks a block is checked with: its neighbours, and as many blocks before
+        and after it as the strings next to its nodes go on into, so that the rules see the nodes around its
+        nodes whole. A block that is all in a string started before it has no nodes of its own."""
+        blocks = self._blocks
+        first, last = max(i - 1, 0), min(i + 1, len(blocks) - 1)
+        if blocks[i].chunk.in_text and _text_only(self.source, blocks[i].chunk):
+            return first, last
+        while first > 0 and blocks[first].chunk.in_text and _text_only(self.source, blocks[first].chunk):
+            first -= 1
+        if last > i and blocks[last].chunk.in_text:
+            while last + 1 < len(blocks) and _text_only(self.source, blocks[last].chunk):
+                last += 1
+                if not blocks[last].chunk.in_text:
+                    break
+        return first, last
+
+    def _check(self, i: int) -> Tuple[_Block, bool]:
+        """Check a block and tell whether the part of its section it was checked with cannot be parsed."""
+        blocks = self._blocks
+        chunk = blocks[i].chunk
+        first, last = self._context(i)
+        # Sections are parsed apart, as they are when the whole document is checked
+        parts = []
+        for j in range(first, last + 1):
+            block = blocks[j]
+            if parts and not _starts_section(self.source, block.chunk.start):
+                parts[-1] = replace(parts[-1], end=block.chunk.end, left_open=block.chunk.left_open)
+            else:
+                parts.append(replace(block.chunk, in_text=False))
+            if j == i:
+                own_part = len(parts) - 1
+        xrefs = XrefIndex()
+        errors = perform_checks(
+            self.source,
+            language=self.language,
+            parser=self.parser,
+            select=self.select,
+            ignore=self.ignore,
+            xref_index=xrefs,
+            chunks=parts,
+        )
+
+        # Findings at the end of the document belong to the last block
+        end = chunk.end + 1 if chunk.end == len(self.source) else chunk.end
+        own_errors = errors_within(errors, chunk.start, end)
+        own_xrefs = xrefs.within(chunk.start, end)
+        broken = False
+        if "PARSE_ERROR" in errors:
+            # The error may be reported at an environment the block is in, and it may be in another section
+            try:
+                parse_chunk(self.source, parts[own_part], self.parser)
+            except Exception:
+                broken = True
+
+        low = blocks[first].chunk.start + blocks[first].tail if first < i else chunk.start
+        high = blocks[last].chunk.start + blocks[last].head if last > i else chunk.end
+        if any(not positions for positions in errors.values()):
+            # Findings without a position may come from any node the block was checked with
+            low, high = blocks[first].chunk.start, blocks[last].chunk.end
+        for code in ONCE_PER_DOCUMENT_CODES:
+            # Found before the block, it hides those in the block
+            low = min([low] + [pos for pos in errors.get(code, []) if pos < chunk.start])
+        depends = (low - chunk.start, high - chunk.start)
+        return replace(blocks[i], origin=chunk.start, errors=own_errors, xrefs=own_xrefs, depends=depends), broken
+
+    def _recheck(self, first: int, last: int):
+        """Check ``blocks[first:last + 1]`` again; a section in which one of them cannot be parsed becomes a
+        single block, and the blocks next to it are checked again."""
+        blocks = self._blocks
+        i = first
+        while i <= last:
+            blocks[i], broken = self._check(i)
+            if broken:
+                sections = [j for j, block in enumerate(blocks) if _starts_section(self.source, block.chunk.start)]
+                start = max([j for j in sections if j <= i] + [0])
+                end = min([j for j in sections if j > i] + [len(blocks)])
+                if end - start > 1:
+                    head, tail = blocks[start].chunk, blocks[end - 1].chunk
+                    blocks[start:end] = [self._unchecked(replace(head, end=tail.end, left_open=tail.left_open))]
+                    last = min(max(last - (end - start - 1), start + 1), len(blocks) - 1)
+                    i = max(start - 1, 0)
+                    continue
+            i += 1
+
+    @property
+    def chunks(self) -> List[Chunk]:
+        return [block.chunk for block in self._blocks]
+
+    @property
+    def errors(self) -> Dict[str, List[int]]:
+        """The findings for the current text, grouped by error code, as :func:`latexcheck.perform_checks`
+        gives them."""
+        errors = {}
+        xrefs = XrefIndex()
+        for block in self._blocks:
+            merge_part_errors(errors, block.errors, block.shift)
+            xrefs.merge(block.xrefs, block.shift)
+        codes = document_codes(self.source, enabled_codes(self.language, self.select, self.ignore), self.select)
+        for code, _, pos in xrefs.findings(codes):
+            errors.setdefault(code, []).append(pos)
+        return errors
+
+    def update(self, source: str) -> Dict[str, List[int]]:
+        """Replace the text by ``source``, treating the part that differs from the current text as one edit."""
+        start, end, new_end = changed_range(self.source, source)
+        return self.apply_edit(start, end, source[start:new_end])
+
+    def apply_edit(self, start: int, end: int, new_text: str) -> Dict[str, List[int]]:
+        """Replace ``source[start:end]`` by ``new_text``, recheck what the edit affects and return the findings
+        for the new text."""
+        if not 0 <= start <= end <= len(self.source):
+            raise ValueError(f"Edit range {start}:{end} is outside of the document")
+        blocks = self._blocks
+        # The chunks the edit touches, including those that merely end or start where it does, and those
+        # starting on the line of the edit: the edit may change the command they start with, or where a
+        # \verb from before them ends. Unless it starts a section, where the first of them starts also depends
+        # on its text, which may become blank: the chunk before it, which the edit leaves alone, is split again too
+        first = next(i for i, block in enumerate(blocks) if block.chunk.end >= start)
+        last = max(i for i, block in enumerate(blocks) if block.chunk.start <= end)
+        line_start = self.source.rfind("\n", 0, start)
+        while first > 0 and blocks[first].chunk.start >= line_start:
+            first -= 1
+        if first > 0 and not _starts_section(self.source, blocks[first].chunk.start):
+            first -= 1
+
+        # The blocks whose findings depend on the text the edit changes, and those that keep their chunks
+        stale = {
+            id(block)
+            for block in blocks
+            if block.chunk.start + block.depends[0] <= end and block.chunk.start + block.depends[1] >= start
+        }
+        kept = {block.chunk: block for block in blocks[first : last + 1] if block.chunk.end <= start}
+
+        delta = len(new_text) - (end - start)
+        self.source = self.source[:start] + new_text + self.source[end:]
+        languages = text_languages(self.source)
+        if languages != self._languages:
+            self._languages = languages
+            self._check_all()
+            return self.errors
+
+        head = blocks[first].chunk
+        step = 1
+        while True:
+            if last + step >= len(blocks) - 1:
+                chunks = split_paragraphs(self.source, replace(head, end=len(self.source), left_open=()))
+                last = len(blocks) - 1
+                break
+            # Splitting a few chunks further tells whether one of them still starts where it did, in the same
+            # environment: if so, nothing from there on changes
+            probe = blocks[last + step].chunk
+            chunks = split_paragraphs(self.source, replace(head, end=probe.end + delta, left_open=probe.left_open))
+            cuts = {(chunk.start, chunk.enclosing, chunk.in_text) for chunk in chunks}
+            resumes = next(
+                (
+                    i
+                    for i in range(last + 1, last + step + 1)
+                    if (blocks[i].chunk.start + delta, blocks[i].chunk.enclosing, blocks[i].chunk.in_text) in cuts
+                ),
+                None,
+            )
+            if resumes is not None:
+                chunks = [chunk for chunk in chunks if chunk.start < blocks[resumes].chunk.start + delta]
+                last = resumes - 1
+                break
+            step *= 2
+
+        for block in blocks[last + 1 :]:
+            block.chunk = replace(block.chunk, start=block.chunk.start + delta, end=block.chunk.end + delta)
+        region = [kept.get(chunk) or self._unchecked(chunk) for chunk in chunks]
+        stale.update(id(block) for block in region if block.chunk not in kept)
+        blocks[first : last + 1] = region
+        recheck = [i for i, block in enumerate(blocks) if id(block) in stale]
+        if recheck:
+            self._recheck(recheck[0], recheck[-1])
+        return self.errors
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+import threading
+from typing import BinaryIO, Dict, Optional
+
+from .checker import perform_checks
+from .helpers import SupportedLanguages, error_descriptions, severity_level
+from .incremental import IncrementalChecker
+from .reporting import LineIndex, html_to_text
+from .texparser import SupportedParsers
+
+DEBOUNCE_SECONDS = 0.03
+
+# Findings only carry a start offset; the diagnostic spans the command or word found there
+re_finding_extent = re.compile(r"\\[a-zA-Z]+|\w+|\S", re.UNICODE)
+
+
+def lsp_severity(code: str, severity: int) -> int:
+    return int(severity_level(code, severity))
+
+
+def lsp_position(source: str, line_index: LineIndex, pos: int, utf16: bool = True) -> Dict[str, int]:
+    """LSP position of an offset: 0-based line and a character counted in UTF-16 code units.
+
+    ``utf16=False`` may be passed when ``source`` has no characters outside the Basic Multilingual Plane.
+    """
+    line, column = line_index.line_col(pos)
+    character = column - 1
+    if utf16:
+        line_start = line_index.line_starts[line - 1]
+        character += sum(1 for c in source[line_start:pos] if ord(c) > 0xFFFF)
+    return {"line": line - 1, "character": character}
+
+
+def make_diagnostics(source: str, errors: Dict[str, list], language: SupportedLanguages) -> list:
+    line_index = LineIndex(source)
+    utf16 = len(source.encode("utf-16-le")) != 2 * len(source)
+    diagnostics = []
+    for code, positions in errors.items():
+        description = error_descriptions[language][code]
+        severity = lsp_severity(code, description["severity"])
+        message = html_to_text(description["msg"])
+        for pos in positions or [0]:
+            pos = min(max(pos, 0), len(source))
+            extent = re_finding_extent.match(source, pos)
+            end = extent.end() if extent else pos
+            diagnostics.append(
+                {
+                    "range": {
+                        "start": lsp_position(source, line_index, pos, utf16),
+                        "end": lsp_position(source, line_index, end, utf16),
+                    },
+                    "severity": severity,
+                    "code": code,
+                    "source": "latexcheck",
+                    "message": message,
+                }
+            )
+    return diagnostics
+
+
+class LanguageServer:
+    """A minimal Language Server Protocol server over stdio publishing latexcheck findings as diagnostics.
+
+    Documents are synchronised in full. The checker stays loaded between requests, and checks after
+    ``didChange`` are debounced so that a burst of keystrokes results in a single check. Every open document
+    keeps an :class:`IncrementalChecker`, so that a check only redoes the paragraphs that changed since the last.
+    Building one takes several times as long as checking the document once, so it is built in the background
+    after the document is opened, and the document is checked whole until it is ready.
+    """
+
+    def __init__(
+        self,
+        stdin: BinaryIO = None,
+        stdout: BinaryIO = None,
+        language: SupportedLanguages = SupportedLanguages.EN,
+        parser: SupportedParsers = SupportedParsers.BUILTIN,
+        debounce: float = DEBOUNCE_SECONDS,
+    ):
+        self.stdin = stdin or sys.stdin.buffer
+        self.stdout = stdout or sys.stdout.buffer
+        self.language = language
+        self.parser = parser
+        self.debounce = debounce
+        self.documents: Dict[str, str] = {}
+        self.versions: Dict[str, Optional[int]] = {}
+        self.checkers: Dict[str, IncrementalChecker] = {}
+        self._builders: Dict[str, threading.Thread] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._write_lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._shutdown = False
+
+    def read_message(self) -> Optional[dict]:
+        content_length = None
+        while True:
+            line = self.stdin.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            name, _, value = line.decode("ascii").partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value)
+        if content_length is None:
+            return None
+        return json.loads(self.stdin.read(content_length).decode("utf-8"))
+
+    def send(self, message: dict):
+        message["jsonrpc"] = "2.0"
+        body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        with self._write_lock:
+            self.stdout.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            self.stdout.flush()
+
+    def publish(self, uri: str, version: Optional[int] = None):
+        with self._check_lock:
+            source = self.documents.get(uri)
+            if source is None or version is not None and self.versions.get(uri) != version:
+                return
+            checker = self.checkers.get(uri)
+            if checker is not None:
+                errors = checker.update(source)
+            else:
+                errors = perform_checks(source, language=self.language, parser=self.parser)
+                if uri not in self._builders:
+                    builder = self._builders[uri] = threading.Thread(target=self.build_checker, args=(uri, source))
+                    builder.daemon = True
+                    builder.start()
+            diagnostics = make_diagnostics(source, errors, self.language)
+        self.send(
+            {"method": "textDocument/publishDiagnostics", "params": {"uri": uri, "diagnostics": diagnostics}}
+        )
+
+    def build_checker(self, uri: str, source: str):
+        """Build the :class:`IncrementalChecker` of a document opened with the text ``source``; the next check
+        brings it up to date with the edits made in the meantime."""
+        checker = IncrementalChecker(source, language=self.language, parser=self.parser)
+        with self._check_lock:
+            # Unless the document was closed, and maybe opened again, meanwhile
+            if self._builders.get(uri) is threading.current_thread():
+                del self._builders[uri]
+                self.checkers[uri] = checker
+
+    def schedule(self, uri: str):
+        timer = self._timers.pop(uri, None)
+        if timer is not None:
+            timer.cancel()
+        if self.debounce <= 0:
+            self.publish(uri)
+            return
+        timer = threading.Timer(self.debounce, self.publish, (uri, self.versions.get(uri)))
+        timer.daemon = True
+        self._timers[uri] = timer
+        timer.start()
+
+    def handle(self, message: dict):
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "initialize":
+            options = params.get("initializationOptions") or {}
+            if options.get("language") in ("EN", "RU"):
+                self.language = SupportedLanguages(options["language"])
+            if "debounce" in options:
+                self.debounce = float(options["debounce"]) / 1000
+            result = {
+                "capabilities": {"textDocumentSync": {"openClose": True, "change": 1, "save": True}},
+                "serverInfo": {"name": "latexcheck"},
+            }
+            self.send({"id": message["id"], "result": result})
+        elif method == "shutdown":
+            self._shutdown = True
+            for timer in self._timers.values():
+                timer.cancel()
+            self.send({"id": message["id"], "result": None})
+        elif method == "textDocument/didOpen":
+            document = params["textDocument"]
+            self.documents[document["uri"]] = document["text"]
+            self.versions[document["uri"]] = document.get("version")
+            self.publish(document["uri"])
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            if params["contentChanges"]:
+                self.documents[uri] = params["contentChanges"][-1]["text"]
+            self.versions[uri] = params["textDocument"].get("version")
+            self.schedule(uri)
+        elif method == "textDocument/didSave":
+            uri = params["textDocument"]["uri"]
+            if "text" in params:
+                self.documents[uri] = params["text"]
+            timer = self._timers.pop(uri, None)
+            if timer is not None:
+                timer.cancel()
+            self.publish(uri)
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            timer = self._timers.pop(uri, None)
+            if timer is not None:
+                timer.cancel()
+            self.documents.pop(uri, None)
+            self.versions.pop(uri, None)
+            self.checkers.pop(uri, None)
+            self._builders.pop(uri, None)
+            self.send({"method": "textDocument/publishDiagnostics", "params": {"uri": uri, "diagnostics": []}})
+        elif "id" in message and method is not None:
+            self.send({"id": message["id"], "error": {"code": -32601, "message": f"Unsupported method {method}"}})
+
+    def serve(self) -> int:
+        """Process messages until ``exit``; returns the process exit code."""
+        while True:
+            message = self.read_message()
+            if message is None:
+                return 1
+            if message.get("method") == "exit":
+                return 0 if self._shutdown else 1
+            self.handle(message)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class Profile:
+    """Time spent per checking phase and, per error code, in the rules reporting it.
+
+    Pass an instance as ``profile`` to :func:`latexcheck.perform_checks` (or to the batch functions) to
+    fill it; without one the checker runs uninstrumented. ``hits`` counts reported findings, ``calls``
+    invocations of the checks, including those that found nothing.
+    """
+
+    phases: Dict[str, float] = field(default_factory=dict)
+    rules: Dict[str, RuleStats] = field(default_factory=dict)
+    documents: int = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def instrument(self, rules, checks: List[Callable], reporters: List[Callable]) -> Tuple[list, list]:
+        """Wrap the checks and reporters of ``rules`` so that they record their statistics here."""
+        timer = time.perf_counter
+        instrumented_checks = []
+        instrumented_reporters = []
+        for rule, check, report in zip(rules, checks, reporters):
+            stats = self.rules.setdefault(rule.code, RuleStats())
+
+            def timed_check(*args, _check=check, _stats=stats):
+                start = timer()
+                try:
+                    return _check(*args)
+                finally:
+                    _stats.seconds += timer() - start
+                    _stats.calls += 1
+
+            def counted_report(*args, _report=report, _stats=stats):
+                _stats.hits += 1
+                return _report(*args)
+
+            instrumented_checks.append(timed_check)
+            instrumented_reporters.append(counted_report)
+        return instrumented_checks, instrumented_reporters
+
+    def merge(self, other: Profile):
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        for code, stats in other.rules.items():
+            own = self.rules.setdefault(code, RuleStats())
+            own.calls += stats.calls
+            own.hits += stats.hits
+            own.seconds += stats.seconds
+        self.documents += other.documents
+
+    def to_dict(self) -> dict:
+        return {
+            "documents": self.documents,
+            "phases": dict(self.phases),
+            "rules": {code: asdict(stats) for code, stats in self.sorted_rules()},
+        }
+
+    def sorted_rules(self) -> List[Tuple[str, RuleStats]]:
+        return sorted(self.rules.items(), key=lambda item: item[1].seconds, reverse=True)
+
+    def print_table(self, file: TextIO = None):
+        print(f"{'phase':<45} {'ms':>10}", file=file)
+        for name, seconds in self.phases.items():
+            print(f"{name:<45} {seconds * 1000:10.1f}", file=file)
+        print(file=file)
+        print(f"{'error code':<45} {'ms':>10} {'calls':>9} {'hits':>7} {'us/call':>9}", file=file)
+        for code, stats in self.sorted_rules():
+            per_call = stats.seconds / stats.calls * 1e6 if stats.calls else 0.0
+            print(
+                f"{code:<45} {stats.seconds * 1000:10.1f} {stats.calls:9d} {stats.hits:7d} {per_call:9.2f}",
+                file=file,
+            )
+
+    def dump(self, filename: str):
+        with open(filename, "w", encoding="utf-8") as outfile:
+            json.dump(self.to_dict(), outfile, indent=2)
+
+
+def profile_phase(profile: Optional[Profile], name: str):
+    return profile.phase(name) if profile is not None else nullcontext()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import defaultdict
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .batch import check_files
+from .cache import ResultCache
+from .checker import CheckLimits, enabled_codes, replay_errors
+from .diff import ChangedRanges, LineRange, file_key
+from .helpers import SupportedLanguages
+from .profiling import Profile
+from .texparser import SupportedParsers
+from .xref import XrefIndex
+
+re_comment = re.compile(r"(?<!\\)%[^\n]*")
+re_include = re.compile(r"\\(?:input|include|subfile)\s*\{\s*([^{}]+?)\s*\}|\\input\s+([^\s{}\\%]+)")
+
+
+def find_includes(source: str) -> List[str]:
+    """Targets of the ``\\input``, ``\\include`` and ``\\subfile`` commands of ``source``, in order."""
+    source = re_comment.sub("", source)
+    return [m.group(1) or m.group(2) for m in re_include.finditer(source)]
+
+
+def resolve_include(target: str, including_file: str, root_dir: str) -> Optional[str]:
+    """Path of an included file: relative to the directory of the root file, as LaTeX does, or else to
+    that of the including file (as with ``subfiles``), with ``.tex`` appended when needed."""
+    for directory in dict.fromkeys((root_dir, os.path.dirname(including_file))):
+        for name in (target, target + ".tex"):
+            path = os.path.normpath(os.path.join(directory, name))
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def collect_project_files(root: str) -> Tuple[List[str], List[str]]:
+    """The root file and all files it includes, directly or not, in reading order, and the included
+    paths that could not be found."""
+    root_dir = os.path.dirname(root)
+    files = []
+    missing = []
+    seen = {os.path.normpath(root)}
+    # Depth-first, so that the files come in the order their text appears in the compiled document
+    stack = [root]
+    while stack:
+        filename = stack.pop()
+        files.append(filename)
+        with open(filename, mode="r", encoding="utf-8") as infile:
+            source = infile.read()
+        included = []
+        for target in find_includes(source):
+            path = resolve_include(target, filename, root_dir)
+            if path is None:
+                missing.append(target)
+            elif path not in seen:
+                seen.add(path)
+                included.append(path)
+        stack.extend(reversed(included))
+    return files, missing
+
+
+def check_project(
+    filenames: List[str],
+    language: SupportedLanguages = SupportedLanguages.EN,
+    jobs: int = 1,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    on_error: Optional[Callable[[str, str, Optional[int]], None]] = None,
+    profile: Optional[Profile] = None,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    cache: Optional[ResultCache] = None,
+    limits: Optional[CheckLimits] = None,
+    totals: Optional[Dict[str, Dict[str, int]]] = None,
+    changed_lines: Optional[Dict[str, List[LineRange]]] = None,
+) -> Iterator[Tuple[str, Dict[str, List[int]]]]:
+    """Check the files of one project, e.g. as found by :func:`collect_project_files`, and yield
+    ``(filename, errors)`` for each, with positions relative to that file.
+
+    The files are checked like :func:`latexcheck.check_files` does (in parallel with ``jobs`` other than 1),
+    but labels and references are collected into a single index, so that a label referenced from another
+    file of the project is not reported as unreferenced, nor a reference to it as undefined. Results are
+    yielded once all files are checked. ``limits`` and ``totals`` are as for :func:`latexcheck.check_files`;
+    the limits also apply to a file once the findings on its cross-references are added. With
+    ``changed_lines``, all files are still read for their labels and references, but only the findings on
+    the lines changed are reported.
+    """
+    xref_index = XrefIndex()
+    results = list(
+        check_files(
+            filenames,
+            language=language,
+            jobs=jobs,
+            parser=parser,
+            profile=profile,
+            select=select,
+            ignore=ignore,
+            xref_index=xref_index,
+            cache=cache,
+            limits=limits,
+            totals=totals,
+            changed_lines=changed_lines,
+        )
+    )
+
+    xref_findings = defaultdict(list)
+    changed = {}
+    for code, filename, pos in xref_index.findings(enabled_codes(language, select, ignore)):
+        if changed_lines is not None:
+            if filename not in changed:
+                with open(filename, mode="r", encoding="utf-8") as infile:
+                    changed[filename] = ChangedRanges(infile.read(), changed_lines.get(file_key(filename), []))
+            if pos not in changed[filename]:
+                continue
+        xref_findings[filename].append((code, pos))
+
+    for filename, errors in results:
+        found = xref_findings.get(filename)
+        if found:
+            for code, pos in found:
+                errors.setdefault(code, []).append(pos)
+                if totals is not None:
+                    file_totals = totals.setdefault(filename, {})
+                    file_totals[code] = file_totals.get(code, 0) + 1
+            if limits is not None:
+                errors = limits.truncate(errors)
+        if on_error is not None:
+            replay_errors(errors, partial(on_error, filename))
+        yield filename, errors
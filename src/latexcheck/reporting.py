@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+import textwrap
+from bisect import bisect_right
+from enum import Enum
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from .helpers import Severity, SupportedLanguages, error_descriptions, severity_level
+
+HTML_ENTITIES = {
+    "&nbsp;": " ",
+    "&thinsp;": "\u2009",
+    "&amp;": "&",
+    "&mdash;": "—",
+    "&ndash;": "–",
+    "&hellip;": "…",
+    "&laquo;": "«",
+    "&raquo;": "»",
+    "&lt;": "<",
+    "&gt;": ">",
+}
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+INFORMATION_URI = "http://github.com/dainiak/latexcheck-py/"
+# SARIF has no level below "note"
+SARIF_LEVELS = {
+    Severity.ERROR: "error",
+    Severity.WARNING: "warning",
+    Severity.INFORMATION: "note",
+    Severity.HINT: "note",
+}
+
+
+class OutputFormat(Enum):
+    TEXT = "text"
+    JSONL = "jsonl"
+    SARIF = "sarif"
+
+
+class LineIndex:
+    """Offsets of the line starts of a source, to turn offsets into 1-based line and column numbers.
+
+    The source may be part of a larger text that starts at offset ``start`` and line ``first_line`` of it;
+    offsets passed to :meth:`line_col` and the line numbers returned are then those of the larger text.
+    """
+
+    def __init__(self, source: str, start: int = 0, first_line: int = 1):
+        self.start = start
+        self.first_line = first_line
+        self.line_starts = [0]
+        self.line_starts.extend(m.end() for m in re.finditer("\n", source))
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        pos = max(pos - self.start, 0)
+        line = bisect_right(self.line_starts, pos)
+        return line + self.first_line - 1, pos - self.line_starts[line - 1] + 1
+
+
+def html_to_console(html_text, rich_text=True, width=80):
+    formats = {
+        "red": "\033[91m",
+        "green": "\033[92m",
+        "blue": "\033[94m",
+        "bold": "\033[1m",
+        "italics": "\033[3m",
+        "underline": "\033[4m",
+        "end": "\033[0m",
+    }
+    if not rich_text:
+        formats = {k: "" for k in formats}
+
+    text = html_text
+    for entity, char in HTML_ENTITIES.items():
+        text = text.replace(entity, char)
+
+    wrapper = textwrap.TextWrapper(width=width)
+    text = wrapper.fill(text)
+
+    text = re.sub(r"<em>(.*?)</em>", f"{formats['italics']}\\1{formats['end']}", text)
+    text = re.sub(r"<strong>(.*?)</strong>", f"{formats['bold']}\\1{formats['end']}", text)
+    text = re.sub(r"<code>(.*?)</code>", f"{formats['green']}\\1{formats['end']}", text)
+    text = re.sub(r'<a\s+href="([^"]*?)"[^>]*>(.*?)</a>', f"[{formats['underline']}\\2{formats['end']}](\\1)", text)
+
+    return text
+
+
+def html_to_text(html_text: str) -> str:
+    """Plain-text version of an error description: no markup, links kept as ``text (url)``."""
+    text = re.sub(r'<a\s+href="([^"]*?)"[^>]*>(.*?)</a>', r"\2 (\1)", html_text)
+    text = re.sub(r"<[^>]+>", "", text)
+    for entity, char in HTML_ENTITIES.items():
+        text = text.replace(entity, char)
+    return text
+
+
+def print_errors(source, errors, language, rich=True, file=None, totals=None, line_index=None):
+    line_index = line_index or LineIndex(source)
+    start = line_index.start
+    for key, value in errors.items():
+        print(f"{key}:", file=file)
+        print(
+            "\n    ".join(
+                "{}:{} {!r}".format(*line_index.line_col(t), source[max(0, t - start - 10) : t - start + 20])
+                for t in value
+            ),
+            file=file,
+        )
+        if totals is not None and totals.get(key, 0) > len(value) and value:
+            print(f"    ... and {totals[key] - len(value)} more", file=file)
+        if explanation := error_descriptions[language][key]:
+            print(f'\nExplanation:  {html_to_console(explanation["msg"], rich_text=rich)}\n', file=file)
+
+
+class Reporter:
+    """Writes findings to ``stream`` as they are produced.
+
+    :meth:`finding` is called for every finding as soon as it is known, :meth:`file_checked` once a file
+    has been checked completely, and :meth:`close` after the last file. ``totals``, if known, give the
+    number of findings per code, including those whose positions were not kept.
+    """
+
+    def __init__(self, stream: TextIO = None, language: SupportedLanguages = SupportedLanguages.EN):
+        self.stream = stream or sys.stdout
+        self.language = language
+        self._filename = None
+        self._source = None
+        self._line_index = None
+
+    def finding(self, filename: str, code: str, pos: Optional[int]):
+        pass
+
+    def file_checked(self, filename: str, errors: Dict[str, List[int]], totals: Optional[Dict[str, int]] = None):
+        pass
+
+    def close(self):
+        pass
+
+    def set_source(self, filename: str, source: str, start: int = 0, first_line: int = 1):
+        """Locate the findings in ``filename`` in ``source`` instead of reading the file, as the part of it from
+        offset ``start``, at the start of line ``first_line``, on (e.g. one document of a dump, see
+        :func:`latexcheck.corpus.iter_documents`)."""
+        self._filename = filename
+        self._source = source
+        self._line_index = LineIndex(source, start, first_line)
+
+    def _load(self, filename: str):
+        if filename != self._filename:
+            with open(filename, mode="r", encoding="utf-8") as infile:
+                self.set_source(filename, infile.read())
+
+    def locate(self, filename: str, pos: Optional[int]) -> Optional[Tuple[int, int]]:
+        if pos is None:
+            return None
+        self._load(filename)
+        return self._line_index.line_col(pos)
+
+
+class TextReporter(Reporter):
+    """Human-readable report grouped by error code, printed once a file has been checked."""
+
+    def __init__(self, stream: TextIO = None, language: SupportedLanguages = SupportedLanguages.EN, rich=True):
+        super().__init__(stream, language)
+        self.rich = rich
+        self.show_filenames = False
+
+    def file_checked(self, filename: str, errors: Dict[str, List[int]], totals: Optional[Dict[str, int]] = None):
+        if self.show_filenames:
+            print(f"==> {filename} <==", file=self.stream)
+        self._load(filename)
+        print_errors(
+            self._source,
+            errors,
+            self.language,
+            rich=self.rich,
+            file=self.stream,
+            totals=totals,
+            line_index=self._line_index,
+        )
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per finding and line."""
+
+    def finding(self, filename: str, code: str, pos: Optional[int]):
+        description = error_descriptions[self.language][code]
+        line, column = self.locate(filename, pos) or (None, None)
+        record = {
+            "file": filename,
+            "code": code,
+            "severity": description["severity"],
+            "offset": pos,
+            "line": line,
+            "column": column,
+            "message": html_to_text(description["msg"]),
+        }
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+def sarif_level(code: str, severity: int) -> str:
+    return SARIF_LEVELS[severity_level(code, severity)]
+
+
+class SarifReporter(Reporter):
+    """A SARIF 2.1.0 log with a single run; results are written out as they arrive."""
+
+    def __init__(self, stream: TextIO = None, language: SupportedLanguages = SupportedLanguages.EN):
+        super().__init__(stream, language)
+        self._rules = {}
+        self._results = 0
+        self.stream.write(f'{{"version": "2.1.0", "$schema": "{SARIF_SCHEMA}", "runs": [{{"results": [')
+
+    def finding(self, filename: str, code: str, pos: Optional[int]):
+        description = error_descriptions[self.language][code]
+        if code not in self._rules:
+            self._rules[code] = {
+                "id": code,
+                "shortDescription": {"text": html_to_text(description["msg"])},
+                "defaultConfiguration": {"level": sarif_level(code, description["severity"])},
+            }
+        location = {"artifactLocation": {"uri": filename.replace("\\", "/")}}
+        line_col = self.locate(filename, pos)
+        if line_col is not None:
+            location["region"] = {"startLine": line_col[0], "startColumn": line_col[1], "charOffset": max(pos, 0)}
+        result = {
+            "ruleId": code,
+            "level": sarif_level(code, description["severity"]),
+            "message": {"text": html_to_text(description["msg"])},
+            "locations": [{"physicalLocation": location}],
+        }
+        self.stream.write(("\n" if not self._results else ",\n") + json.dumps(result))
+        self.stream.flush()
+        self._results += 1
+
+    def close(self):
+        tool = {
+            "driver": {
+                "name": "latexcheck",
+                "informationUri": INFORMATION_URI,
+                "rules": list(self._rules.values()),
+            }
+        }
+        self.stream.write(f'\n], "columnKind": "unicodeCodePoints", "tool": {json.dumps(tool)}}}]}}\n')
+        self.stream.flush()
+
+
+def make_reporter(
+    output_format: OutputFormat, stream: TextIO = None, language=SupportedLanguages.EN, rich=True
+) -> Reporter:
+    if output_format == OutputFormat.JSONL:
+        return JsonLinesReporter(stream, language)
+    if output_format == OutputFormat.SARIF:
+        return SarifReporter(stream, language)
+    return TextReporter(stream, language, rich=rich)
@@ -0,0 +1,684 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from enum import Enum
+from functools import partial
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple, Union
+
+from .helpers import SupportedLanguages
+from .profiling import Profile
+from .scanner import PatternScanner
+from .tree import (
+    DISPLAY_MATH_ENVS,
+    NUMBERED_DISPLAY_MATH_ENVS,
+    LatCat,
+    Treenode,
+    find_descendant_token,
+    has_descendant_token,
+    has_sibling_feature,
+    is_display_math,
+    is_math,
+    is_pure_argument,
+    sibling_feature,
+    string_buffers,
+    token_bit,
+)
+
+
+class RuleScope(Enum):
+    BEFORE_NODES = 0
+    NODE = 1
+    AFTER_NODES = 2
+    BUFFER = 3
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single check.
+
+    Node-scoped rules are called as ``check(node, report)`` only for the nodes matching their trigger
+    (``cat``, ``tokens`` and ``math`` context; ``None`` means "any"). Document-scoped rules are called once
+    as ``check(root, all_nodes, report)``. ``report(bad_node=None)`` records a finding under ``code``.
+    ``languages`` lists the languages of the text the rule can find anything in (``None`` means any), so
+    that it can be skipped for documents written in none of them. ``cross_document`` rules look at things
+    that may be defined in another file of the same project, such as labels and references; they are left
+    to the project checker when a document is checked as a part of a project.
+
+    A node rule with a ``pattern`` is only called for string nodes whose token the pattern is found in:
+    the patterns of all rules with the same trigger are looked for together (see
+    :class:`~latexcheck.scanner.PatternScanner`), so the check itself only tests what the pattern cannot.
+
+    Buffer-scoped rules run their ``pattern`` over the text-mode or math-mode string buffers of the document
+    (see :class:`~latexcheck.tree.StringBuffer`; ``math=None`` means both) after the node rules, and are
+    called as ``check(buffer, match, report)`` for every match, so that they see text across group boundaries
+    and can report the exact position of the match.
+    """
+
+    code: str
+    check: Callable
+    index: int
+    scope: RuleScope = RuleScope.NODE
+    cat: Optional[LatCat] = None
+    tokens: Optional[FrozenSet[str]] = None
+    math: Optional[bool] = None
+    skip_pure_arguments: bool = False
+    languages: Optional[FrozenSet[SupportedLanguages]] = None
+    cross_document: bool = False
+    pattern: Optional[Pattern] = None
+
+    def triggered_by(self, cat: LatCat, token: Optional[str], in_math: bool) -> bool:
+        return (
+            (self.cat is None or self.cat == cat)
+            and (self.tokens is None or token in self.tokens)
+            and (self.math is None or self.math == in_math)
+        )
+
+
+class RuleRegistry:
+    def __init__(self):
+        self.rules: List[Rule] = []
+        self._trigger_tokens: FrozenSet[str] = frozenset()
+        self._dispatch: Dict[Tuple[LatCat, Optional[str], bool], Tuple[Tuple[Rule, ...], PatternScanner]] = {}
+        self._subsets: Dict[Tuple[FrozenSet[str], FrozenSet[SupportedLanguages], bool], RuleRegistry] = {}
+        self._buffer_scanners: Dict[bool, PatternScanner] = {}
+
+    def register(
+        self,
+        code: str,
+        scope: RuleScope = RuleScope.NODE,
+        cat: Optional[LatCat] = None,
+        tokens: Optional[Iterable[str]] = None,
+        math: Optional[bool] = None,
+        skip_pure_arguments: bool = False,
+        languages: Optional[Iterable[SupportedLanguages]] = None,
+        cross_document: bool = False,
+        pattern: Union[str, Pattern, None] = None,
+    ):
+        if scope == RuleScope.BUFFER and pattern is None:
+            raise ValueError(f"Buffer rule {code} needs a pattern")
+
+        def decorator(check):
+            self._add(
+                Rule(
+                    code=code,
+                    check=check,
+                    index=len(self.rules),
+                    scope=scope,
+                    cat=cat,
+                    tokens=frozenset(tokens) if tokens is not None else None,
+                    math=math,
+                    skip_pure_arguments=skip_pure_arguments,
+                    languages=frozenset(languages) if languages is not None else None,
+                    cross_document=cross_document,
+                    pattern=re.compile(pattern) if isinstance(pattern, str) else pattern,
+                )
+            )
+            return check
+
+        return decorator
+
+    def _add(self, rule: Rule):
+        self.rules.append(rule)
+        if rule.tokens:
+            self._trigger_tokens |= rule.tokens
+        self._dispatch.clear()
+        self._subsets.clear()
+        self._buffer_scanners.clear()
+
+    def subset(
+        self, codes: FrozenSet[str], languages: FrozenSet[SupportedLanguages], cross_document: bool = True
+    ) -> RuleRegistry:
+        """Registry of the rules that report one of ``codes`` and apply to text in one of ``languages``,
+        leaving out cross-document rules unless ``cross_document`` is set.
+
+        Subsets are cached, so the rules left out are pruned once and then cost nothing per document.
+        """
+        key = (codes, languages, cross_document)
+        registry = self._subsets.get(key)
+        if registry is None:
+            selected = [
+                r
+                for r in self.rules
+                if r.code in codes
+                and (r.languages is None or r.languages & languages)
+                and (cross_document or not r.cross_document)
+            ]
+            if len(selected) == len(self.rules):
+                registry = self
+            else:
+                registry = RuleRegistry()
+                for r in selected:
+                    registry._add(replace(r, index=len(registry.rules)))
+            self._subsets[key] = registry
+        return registry
+
+    def rules_for(self, node: Treenode) -> Tuple[Rule, ...]:
+        """Node rules whose trigger matches ``node``, in registration order."""
+        return self._node_rules(node)[0]
+
+    def _node_rules(self, node: Treenode) -> Tuple[Tuple[Rule, ...], PatternScanner]:
+        token = node.token
+        if token is not None and type(token) is not str:
+            # Lone text fragments come from TexSoup as TexText, which is not hashable
+            token = str(token)
+        key = (node.cat, token if token in self._trigger_tokens else None, node.is_in_math)
+        entry = self._dispatch.get(key)
+        if entry is None:
+            rules = tuple(r for r in self.rules if r.scope == RuleScope.NODE and r.triggered_by(*key))
+            scanner = PatternScanner({r.index: r.pattern for r in rules if r.pattern is not None})
+            entry = self._dispatch[key] = (rules, scanner)
+        return entry
+
+    def _buffer_scanner(self, in_math: bool) -> PatternScanner:
+        scanner = self._buffer_scanners.get(in_math)
+        if scanner is None:
+            scanner = self._buffer_scanners[in_math] = PatternScanner(
+                {
+                    r.index: r.pattern
+                    for r in self.rules
+                    if r.scope == RuleScope.BUFFER and (r.math is None or r.math == in_math)
+                }
+            )
+        return scanner
+
+    def run(
+        self,
+        root: Treenode,
+        all_nodes: List[Treenode],
+        add_error: Callable,
+        profile: Profile = None,
+        nodes: Optional[List[Treenode]] = None,
+    ):
+        """Run the rules over the tree of ``root``; node rules only on ``nodes``, if given, rather than on all
+        of ``all_nodes``."""
+        reporters = [partial(add_error, rule.code) for rule in self.rules]
+        checks = [rule.check for rule in self.rules]
+        if profile is not None:
+            checks, reporters = profile.instrument(self.rules, checks, reporters)
+
+        for rule in self.rules:
+            if rule.scope == RuleScope.BEFORE_NODES:
+                checks[rule.index](root, all_nodes, reporters[rule.index])
+
+        for node in all_nodes if nodes is None else nodes:
+            rules, scanner = self._node_rules(node)
+            pure_argument = None
+            found = None
+            for rule in rules:
+                if rule.skip_pure_arguments:
+                    if pure_argument is None:
+                        pure_argument = is_pure_argument(node)
+                    if pure_argument:
+                        continue
+                if rule.pattern is not None:
+                    if found is None:
+                        found = scanner.scan(node.token)
+                    if rule.index not in found:
+                        continue
+                checks[rule.index](node, reporters[rule.index])
+
+        if any(rule.scope == RuleScope.BUFFER for rule in self.rules):
+            for in_math, buffers in enumerate(string_buffers(all_nodes)):
+                scanner = self._buffer_scanner(bool(in_math))
+                for buffer in buffers:
+                    # finditer alone tells whether a pattern occurs: searching for it first would scan the text twice
+                    for index, pattern in scanner.candidates(buffer.text):
+                        for match in pattern.finditer(buffer.text):
+                            checks[index](buffer, match, reporters[index])
+
+        for rule in self.rules:
+            if rule.scope == RuleScope.AFTER_NODES:
+                checks[rule.index](root, all_nodes, reporters[rule.index])
+
+
+RULES = RuleRegistry()
+rule = RULES.register
+
+# The rules look for these below a node: give them their bits before any tree is summarised
+for name in ("$$", "label"):
+    token_bit(name)
+
+re_td = re.compile(r"т\. ?(д\.|н\.|ч\.|к\.)", re.IGNORECASE)
+re_dash_no_spaces = re.compile(r"--([^- ~\n]|$)|(^|[^- ~\n])--")
+re_dash_as_hyphen = re.compile(r"(^|\s)-\s+|\s+-(\s|$)")
+re_multiplication_star = re.compile(r"[^_^]\*|.\*")
+re_space_before_punctuation = re.compile(r"\s+[?!.,;:]")
+re_space_after_punctuation = re.compile(r"[?!.,;:][^ ~\t\n\\]")
+re_space_before_parenthesis = re.compile(r"[^()\[\]{}\n\t-/+]\(")
+re_space_after_parenthesis = re.compile(r"\(\s")
+re_cyrillic_tricky_letter = re.compile(r"[уехаос]")
+re_latin_c_in_rus_text = re.compile(r"[а-яё]\s*c|c\s*[а-яё]", re.IGNORECASE)
+re_math_command = re.compile(r"(\\(infty|cdot|sum))|([0-9 \n]+ *[=+*^])|([+*^] *[0-9 \n]+)")
+re_latin_letter_outside_math_ru = re.compile(r" (^|[, .~])[a-zA-Z]($|[,.:!? ~-]) ")
+re_latin_letter_outside_math_en = re.compile(r" (^|[, .~])[b-zA-HJ-Z]($|[,.:!? ~-]) ")
+re_capitalization_after_comma = re.compile(r"[,;:]\s*[А-ЯЁA-Z]")
+re_capitalization_after_period = re.compile(r"\.\s*[а-яёa-z]")
+re_starts_with_uppercase = re.compile(r"^\s*[А-ЯЁA-Z].*", re.DOTALL)
+re_ends_with_space = re.compile(r".*[ \n\t]$", re.DOTALL)
+re_starts_with_cyrillic = re.compile(r"^[а-яё]", re.IGNORECASE)
+re_ends_with_digit_or_letter = re.compile(r".*[0-9a-z]\s*$", re.IGNORECASE | re.DOTALL)
+re_possibly_word = re.compile(r"([^a-z\\]|^)([a-z]{4,}|bad|[a-z]{2,3}\.)", re.IGNORECASE)
+re_multiple_spaces = re.compile(r"(~|\\:|\\ |\\,|\\!|\\>|\\space|\{ }){2,}")
+re_trivial_label = re.compile(
+    r"\{?\s*(eq|equation|eqn|th|thm|lemma|theorem|lem|fig|figure)?:?[^a-z}]\s*}?", re.IGNORECASE
+)
+re_nonsymbolic_reference = re.compile(
+    r"(рис(унок|унка|унке|\.)|формул(а|е|ой|у|ы)|(равенств|тождеств)(о|а|е|у|ами|ах)|(соотношени|выражени)(е|ю|и|я|ями|ях|ям))\s+\(?\d+\)?",
+    re.IGNORECASE,
+)
+re_mod_cmd = re.compile(r"\bmod\b")
+re_math_no_backslash = re.compile(
+    r"([^\\a-z]|^)(cos|csc|exp|ker|limsup|max|min|sinh|arcsin|cosh|deg|gcd|lg|ln|Pr|sup|arctan|cot|det|hom|lim|log|sec|tan|arg|coth|dim|liminf|sin|tanh)[^a-z]"
+)
+re_ru_ordinal = re.compile(
+    r"\s*-{1,2}\s*(ый|ого|о|тому|ому|ему|ом|ая|ой|ую|ые|ыми|и|ым|тым|той|им|его|того|тых|ых|том|ем|ём|ех|ёх|ух)([^а-яё]|$)",
+    re.IGNORECASE | re.DOTALL | re.UNICODE,
+)
+re_small_numeral = re.compile(r"([,.!?:]|\W\s+)[0-5]([,.!?:]|\s+\W)")
+
+MATH_ENVS = ("math",) + DISPLAY_MATH_ENVS
+BIG_OPERATORS = ("sum", "prod", "frac", "binom")
+SIZED_OPENERS = ("left", "bigl", "Bigl", "biggl", "Biggl")
+# Rules whose patterns need Cyrillic letters to match
+CYRILLIC = (SupportedLanguages.RU,)
+
+HAS_SET_BRACE = sibling_feature(lambda node: node.token is not None and r"\{" in node.token)
+IS_MID = sibling_feature(lambda node: node.token == "mid")
+
+
+@rule("DOUBLE_DOLLARS", scope=RuleScope.BEFORE_NODES)
+def check_double_dollars(root, all_nodes, report):
+    node = find_descendant_token(root, "$$")
+    if node is not None:
+        report(node.pos)
+
+
+@rule("MULTIPLICATION_SIGN", cat=LatCat.STR, pattern=re_multiplication_star)
+def check_multiplication_sign(node, report):
+    report(node)
+
+
+@rule("INDENTATION_WITH_SPACES", cat=LatCat.STR, pattern=re_multiple_spaces)
+def check_indentation_with_spaces(node, report):
+    report(node)
+
+
+@rule("NO_SPACE_AFTER_COMMAND_BEFORE_CYRILLIC", cat=LatCat.STR, languages=CYRILLIC, pattern=re_starts_with_cyrillic)
+def check_no_space_after_command(node, report):
+    if node.prev_node.cat == LatCat.CMD:
+        report(node)
+
+
+@rule("NUMBERED_MATH_NEEDS_REFERENCING", cat=LatCat.ENV, tokens=NUMBERED_DISPLAY_MATH_ENVS)
+def check_numbered_math_has_label(node, report):
+    if not has_descendant_token(node, "label"):
+        report(node)
+
+
+@rule("CONSECUTIVE_DISPLAY_FORMULAE", cat=LatCat.ENV, tokens=DISPLAY_MATH_ENVS)
+def check_consecutive_display_formulae(node, report):
+    if node.next_sibling and is_display_math(node.next_sibling):
+        report(node.next_sibling.pos or node.pos)
+
+
+@rule("LINEBREAK_AFTER_DISPLAY_FORMULAE", cat=LatCat.ENV, tokens=DISPLAY_MATH_ENVS)
+def check_linebreak_after_display_formulae(node, report):
+    if node.next_sibling and (node.next_sibling.cat == LatCat.STR) and node.next_sibling.token.startswith("\\\\"):
+        report(node.next_sibling.pos or node.pos)
+
+
+@rule("LINEBREAK_BEFORE_DISPLAY_FORMULAE", cat=LatCat.ENV, tokens=DISPLAY_MATH_ENVS)
+def check_linebreak_before_display_formulae(node, report):
+    if node.prev_sibling and (node.prev_sibling.cat == LatCat.STR) and node.prev_sibling.token.startswith("\\\\"):
+        report(node.pos or node.prev_sibling.pos)
+
+
+@rule("EQNARRAY_USED", tokens=["eqnarray", "eqnarray*"])
+def check_eqnarray(node, report):
+    report(node.pos)
+
+
+@rule("UNNECESSARY_MATH_MODE", cat=LatCat.ENV, tokens=MATH_ENVS)
+def check_unnecessary_math_mode(node, report):
+    if len(node.children) == 1 and node.children[0].cat != LatCat.STR:
+        report(node)
+
+
+@rule("MID_IN_SET_COMPREHENSION", cat=LatCat.CMD, tokens=["mid"])
+def check_mid_command(node, report):
+    if not has_sibling_feature(node, HAS_SET_BRACE):
+        report(node)
+
+
+@rule("CDOT_FOR_READABILITY", cat=LatCat.CMD, tokens=BIG_OPERATORS)
+def check_cdot_for_readability(node, report):
+    if (
+        node.prev_node
+        and node.prev_node.is_in_math
+        and node.prev_node.cat != LatCat.CMD
+        and not node.prev_node.is_in_arg
+        and node.prev_node.token
+        and re_ends_with_digit_or_letter.match(node.prev_node.token)
+    ):
+        report(node)
+
+
+@rule("CENTERING", cat=LatCat.CMD, tokens=["centering"])
+def check_centering(node, report):
+    if not (node.parent and node.parent.token in ["figure", "table"]):
+        report(node)
+
+
+@rule("INCORPORATE_NOT", cat=LatCat.CMD, tokens=["not"])
+def check_incorporate_not(node, report):
+    if node.next_node:
+        if (node.next_node.token.strip() + " ")[0] == "=" or node.next_node.token in ["in"]:
+            report(node)
+
+
+@rule("OVER_VS_FRAC", cat=LatCat.CMD, tokens=["over"])
+def check_over(node, report):
+    report(node)
+
+
+@rule("CHOOSE_VS_BINOM", cat=LatCat.CMD, tokens=["choose"])
+def check_choose(node, report):
+    report(node)
+
+
+@rule("SETS_IN_BBFONT", cat=LatCat.CMD, tokens=["in", "notin", "ni", "subset", "subseteq"])
+def check_sets_in_bbfont(node, report):
+    if node.next_node and node.next_node.token and (node.next_node.token.strip() + " ")[0] in "NRZQC":
+        report(node)
+
+
+@rule("TRIVIAL_LABEL", cat=LatCat.CMD, tokens=["label"])
+def check_trivial_label(node, report):
+    if node.args and len(node.args) == 1 and re_trivial_label.match(node.args[0].tex):
+        report(node)
+
+
+@rule("EQREF_INSTEAD_OF_REF", cat=LatCat.CMD, tokens=["ref"])
+def check_eqref_instead_of_ref(node, report):
+    if node.prev_node and node.prev_node.token and node.prev_node.token.endswith("("):
+        report(node)
+
+
+@rule("NONBREAKABLE_SPACE_BEFORE_REF", cat=LatCat.CMD, tokens=["ref", "eqref"])
+def check_nonbreakable_space_before_ref(node, report):
+    if node.prev_node and node.prev_node.token and re_ends_with_space.search(node.prev_node.token):
+        report(node)
+
+
+@rule("LIMITS_UNNECESSARY_IN_DISPLAY_MODE", tokens=["limits"], math=True)
+def check_limits_in_display_mode(node, report):
+    if node.is_in_display_math:
+        report(node)
+
+
+@rule("REPLACE_MBOX_WITH_TEXT", tokens=["mbox", "hbox"], math=True)
+def check_mbox_in_math(node, report):
+    report(node)
+
+
+@rule("TEXT_COMMANDS_IN_MATH_MODE", cat=LatCat.CMD, tokens=["textbf", "textit"], math=True)
+def check_text_commands_in_math(node, report):
+    report()
+
+
+@rule("MID_IN_SET_COMPREHENSION", cat=LatCat.STR, math=True, pattern=r"\|")
+def check_bar_in_set_comprehension(node, report):
+    if (r"\{" in node.token or has_sibling_feature(node, HAS_SET_BRACE)) and not has_sibling_feature(node, IS_MID):
+        report(node)
+
+
+@rule("LEFT_RIGHT_RECOMMENDED", cat=LatCat.STR, math=True, pattern=r"\(")
+def check_left_right_recommended(node, report):
+    text = node.token
+    if node.prev_node and node.prev_node.cat == LatCat.CMD and node.prev_node.token in SIZED_OPENERS:
+        # The parenthesis right after \left is already sized
+        text = text[1:]
+    if "(" in text and node.next_node and node.next_node.token in BIG_OPERATORS:
+        report(node)
+
+
+@rule("MOD_NOT_A_COMMAND", scope=RuleScope.BUFFER, math=True, pattern=re_mod_cmd)
+def check_mod_not_a_command(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("ELLIPSIS_LDOTS", scope=RuleScope.BUFFER, math=True, pattern=r"\.\.\.")
+def check_ellipsis_in_math(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("TEXT_IN_MATH_MODE", scope=RuleScope.BUFFER, math=True, pattern=re_possibly_word)
+def check_text_in_math_mode(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("LE_AS_SINGLE_COMMAND", scope=RuleScope.BUFFER, math=True, pattern=r"[<>]=")
+def check_le_as_single_command(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("BACKSLASH_NEEDED", scope=RuleScope.BUFFER, math=True, pattern=re_math_no_backslash)
+def check_backslash_needed(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("UNICODE_SQRT", scope=RuleScope.BUFFER, math=True, pattern="√")
+def check_unicode_sqrt(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule(
+    "CYRILLIC_LETTER_C_MISUSED",
+    scope=RuleScope.BUFFER,
+    math=True,
+    languages=CYRILLIC,
+    pattern=re_cyrillic_tricky_letter,
+)
+def check_cyrillic_letter_in_math(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("QUOTES_IN_MATH", scope=RuleScope.BUFFER, math=True, pattern='"')
+def check_quotes_in_math(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("DASH_IN_MATH_MODE", cat=LatCat.STR, math=True, pattern=r"-\s*\Z")
+def check_dash_in_math_mode(node, report):
+    if node.next_node and not node.next_node.is_in_math:
+        report(node)
+
+
+@rule("UNNECESSARY_FORMULA_BREAK", cat=LatCat.STR, math=True, pattern=r"\A\s*\Z")
+def check_blank_between_formulae(node, report):
+    if (
+        node.prev_sibling
+        and node.prev_sibling.cat == LatCat.ENV
+        and node.prev_sibling.token == "math"
+        and node.next_sibling
+        and node.next_sibling.cat == LatCat.ENV
+        and node.next_sibling.token == "math"
+    ):
+        report(node)
+
+
+def text_rule(
+    code: str, languages: Optional[Iterable[SupportedLanguages]] = None, pattern: Union[str, Pattern, None] = None
+):
+    return rule(code, cat=LatCat.STR, math=False, skip_pure_arguments=True, languages=languages, pattern=pattern)
+
+
+def text_buffer_rule(
+    code: str, pattern: Union[str, Pattern], languages: Optional[Iterable[SupportedLanguages]] = None
+):
+    return rule(code, scope=RuleScope.BUFFER, math=False, languages=languages, pattern=pattern)
+
+
+@text_buffer_rule("SYMBOLIC_LINKS", re_nonsymbolic_reference, languages=CYRILLIC)
+def check_symbolic_links(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_rule("PERIOD_BEFORE_NEXT_SENTENCE", pattern=re_starts_with_uppercase)
+def check_period_before_next_sentence(node, report):
+    if node.prev_node.is_in_math and not (
+        node.prev_node.cat == LatCat.STR and node.prev_node.token.strip().endswith(".")
+    ):
+        report()
+
+
+@text_buffer_rule("TILDE_INEFFECTIVE_AS_NBSP", "~ | ~")
+def check_tilde_next_to_space(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("CAPITALIZATION_AFTER_PUNCTUATION_MARK", re_capitalization_after_comma)
+def check_capitalization_after_comma(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("CAPITALIZATION_AFTER_PERIOD", re_capitalization_after_period)
+def check_capitalization_after_period(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("ELLIPSIS_LDOTS", r"\.\.\.")
+def check_ellipsis_in_text(buffer, match, report):
+    # maybe make two different errors for math and text mode
+    report(buffer.match_pos(match))
+
+
+@text_rule("PUNCTUATION_AFTER_DISPLAY_MATH", pattern=r"\A\s*[,.:?!;]")
+def check_punctuation_after_display_math(node, report):
+    if is_display_math(node.prev_sibling):
+        report(node.prev_sibling)
+
+
+@text_buffer_rule("SPACE_BEFORE_PARENTHESIS", re_space_before_parenthesis)
+def check_space_before_parenthesis(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("SPACE_AFTER_PARENTHESIS", re_space_after_parenthesis)
+def check_space_after_parenthesis(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("SPACE_AFTER_PUNCTUATION_MARK", re_space_after_punctuation)
+def check_space_after_punctuation(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("SPACE_BEFORE_PUNCTUATION_MARK", re_space_before_punctuation)
+def check_space_before_punctuation(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("LATIN_LETTER_OUTSIDE_MATH_RU", re_latin_letter_outside_math_ru)
+def check_latin_letter_outside_math_ru(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("LATIN_LETTER_OUTSIDE_MATH_EN", re_latin_letter_outside_math_en)
+def check_latin_letter_outside_math_en(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("MATH_SEMANTICS_OUTSIDE_MATH", re_math_command)
+def check_math_semantics_outside_math(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("LATIN_LETTER_C_MISUSED", re_latin_c_in_rus_text, languages=CYRILLIC)
+def check_latin_c_in_russian_text(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("WRONG_QUOTES", '"')
+def check_wrong_quotes(buffer, match, report):
+    if buffer.node_at(match.start()).token != r"\"":
+        report(buffer.match_pos(match))
+
+
+@text_rule("WRONG_SAME_QUOTES", pattern="''|``")
+def check_unpaired_quotes(node, report):
+    if "''" in node.token and "``" not in node.token or "``" in node.token and "''" not in node.token:
+        report(node)
+
+
+@text_buffer_rule("DASH_HYPHEN", re_dash_as_hyphen)
+def check_dash_as_hyphen(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("ABBREVIATIONS_WITH_SPACE", re_td, languages=CYRILLIC)
+def check_abbreviations_with_space(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("DASH_SURROUND_WITH_SPACES", re_dash_no_spaces)
+def check_dash_surrounded_with_spaces(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("RU_ORDINAL_ABBREVIATION", re_ru_ordinal, languages=CYRILLIC)
+def check_ru_ordinal_abbreviation(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("SUGGESTED_NEW_PARAGRAPH", r"\\\\")
+def check_linebreak_in_text(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@text_buffer_rule("NUMERALS_AS_WORDS", re_small_numeral)
+def check_small_numerals(buffer, match, report):
+    report(buffer.match_pos(match))
+
+
+@rule("PARAGRAPH_BREAK_BEFORE_DISPLAY_FORMULA")
+def check_paragraph_break_before_display_formula(node, report):
+    if (
+        (node.token and node.token.strip().endswith(r"\\") or node.token == r"par")
+        and node.next_node
+        and is_display_math(node.next_node)
+    ):
+        report(node)
+
+
+@rule("UNNECESSARY_FORMULA_BREAK", cat=LatCat.ENV, tokens=["math"])
+def check_adjacent_inline_formulae(node, report):
+    if node.next_sibling and node.next_sibling.cat == LatCat.ENV and node.next_sibling.token == "math":
+        report(node)
+
+
+@rule("LOW_LEVEL_FONT_COMMANDS", cat=LatCat.CMD, tokens=["it", "bf", "sf", "rm"])
+def check_low_level_font_commands(node, report):
+    report(node)
+
+
+@rule("ITALIC_INSTEAD_OF_EMPH", cat=LatCat.CMD, tokens=["textit"])
+def check_textit(node, report):
+    report(node)
+
+
+@rule("FORMULA_NEIGHBOURING_REFERENCE", cat=LatCat.CMD, tokens=["cite"])
+def check_formula_neighbouring_reference(node, report):
+    if (
+        node.prev_node
+        and (node.prev_node.is_in_math or is_math(node.prev_node))
+        or node.next_sibling
+        and is_math(node.next_sibling)
+    ):
+        report(node)
+
+
+@rule("GRAPHICS_IN_MATH_MODE", tokens=["includegraphics"], math=True)
+def check_graphics_in_math_mode(node, report):
+    report(node)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Hashable, List, Mapping, Optional, Pattern, Tuple
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+# Character classes wider than this are not worth a set lookup
+MAX_REQUIRED_CHARACTERS = 128
+
+
+def _required_in_sequence(items) -> Optional[FrozenSet[str]]:
+    best = None
+    for op, av in items:
+        chars = _required_in_item(op, av)
+        if chars is not None and (best is None or len(chars) < len(best)):
+            best = chars
+    return best
+
+
+def _required_in_item(op, av) -> Optional[FrozenSet[str]]:
+    if op is sre_constants.LITERAL:
+        return frozenset(chr(av))
+    if op is sre_constants.IN:
+        chars = set()
+        for item_op, item_av in av:
+            if item_op is sre_constants.LITERAL:
+                chars.add(chr(item_av))
+            elif item_op is sre_constants.RANGE and item_av[1] - item_av[0] < MAX_REQUIRED_CHARACTERS:
+                chars.update(map(chr, range(item_av[0], item_av[1] + 1)))
+            else:
+                return None
+        return frozenset(chars)
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, _, items = av
+        return None if add_flags & re.IGNORECASE else _required_in_sequence(items)
+    if op is sre_constants.BRANCH:
+        chars = set()
+        for items in av[1]:
+            branch_chars = _required_in_sequence(items)
+            if branch_chars is None:
+                return None
+            chars |= branch_chars
+        return frozenset(chars)
+    if op is sre_constants.MAX_REPEAT or op is sre_constants.MIN_REPEAT:
+        low, _, items = av
+        return _required_in_sequence(items) if low >= 1 else None
+    return None
+
+
+def required_characters(pattern: Pattern) -> Optional[FrozenSet[str]]:
+    """Characters one of which every match of ``pattern`` contains, or ``None`` if no such small set is known.
+
+    Only what the parsed pattern makes certain is used: anything case-insensitive, negated, anchored or
+    otherwise not plainly a literal or a character range gives ``None``.
+    """
+    if pattern.flags & re.IGNORECASE:
+        return None
+    chars = _required_in_sequence(sre_parse.parse(pattern.pattern, pattern.flags))
+    return chars if chars is not None and len(chars) <= MAX_REQUIRED_CHARACTERS else None
+
+
+class PatternScanner:
+    """Finds which of several regular expressions occur in a string, and where.
+
+    The characters of the string are collected once, and a pattern is only searched for when the string
+    contains one of the characters all its matches need (see :func:`required_characters`). :meth:`scan`
+    gives for every pattern found the offset ``pattern.search(text).start()`` would.
+    """
+
+    def __init__(self, patterns: Mapping[Hashable, Pattern]):
+        self.patterns = dict(patterns)
+        self._entries = [(key, pattern, required_characters(pattern)) for key, pattern in self.patterns.items()]
+        self._prefiltered = any(required is not None for _, _, required in self._entries)
+
+    def candidates(self, text: str) -> List[Tuple[Hashable, Pattern]]:
+        """The patterns that may occur in ``text``, with their keys: those the characters of ``text`` do not rule
+        out, without searching for any of them."""
+        if not self._prefiltered:
+            return [(key, pattern) for key, pattern, _ in self._entries]
+        chars = set(text)
+        return [
+            (key, pattern)
+            for key, pattern, required in self._entries
+            if required is None or not chars.isdisjoint(required)
+        ]
+
+    def scan(self, text: str) -> Dict[Hashable, int]:
+        """Map the key of every pattern found in ``text`` to the offset of its first match."""
+        found = {}
+        for key, pattern in self.candidates(text):
+            m = pattern.search(text)
+            if m is not None:
+                found[key] = m.start()
+        return found
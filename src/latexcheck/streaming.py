@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .checker import CheckLimits, perform_checks
+from .helpers import SupportedLanguages
+from .texparser import SupportedParsers
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor, Future
+
+# Documents submitted to the worker pool but not yet taken by the consumer, per worker
+PENDING_PER_WORKER = 2
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One finding: an error code and the offset it is reported at, or ``None`` for a code without one."""
+
+    code: str
+    pos: Optional[int]
+
+
+def _flatten(errors: Dict[str, List[int]]) -> Iterator[Finding]:
+    for code, positions in errors.items():
+        for pos in positions or [None]:
+            yield Finding(code, pos)
+
+
+def check_many(
+    sources: Iterable[Tuple[Hashable, str]],
+    language: SupportedLanguages = SupportedLanguages.EN,
+    jobs: int = 1,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    max_pending: Optional[int] = None,
+    limits: Optional[CheckLimits] = None,
+) -> Iterator[Tuple[Hashable, Dict[str, List[int]]]]:
+    """Check the documents of ``sources``, ``(doc_id, source)`` pairs, and yield ``(doc_id, errors)`` for each
+    as soon as it is checked.
+
+    ``sources`` is read lazily. With ``jobs`` other than 1 a pool of worker processes checks the documents
+    (``jobs=0`` uses one worker per CPU core) and results come in the order the documents are done; at most
+    ``max_pending`` documents (by default two per worker) are taken from ``sources`` before their results are
+    consumed, so that a slow consumer holds back the reading of documents rather than letting results pile up.
+    ``limits`` are passed on to :func:`perform_checks` and apply to every document on its own.
+    """
+    check = partial(
+        perform_checks,
+        language=language,
+        parser=parser,
+        select=frozenset(select) if select is not None else None,
+        ignore=frozenset(ignore) if ignore is not None else None,
+        limits=limits,
+    )
+    if jobs == 1:
+        for doc_id, source in sources:
+            yield doc_id, check(source)
+        return
+    yield from map_pending(check, sources, jobs, max_pending)
+
+
+def map_pending(
+    function: Callable[[Any], Any], items: Iterable[Tuple[Hashable, Any]], jobs: int, max_pending: Optional[int]
+) -> Iterator[Tuple[Hashable, Any]]:
+    """Yield ``(item_id, function(item))`` for the ``(item_id, item)`` pairs of ``items``, computed by a pool
+    of ``jobs`` worker processes (one per CPU core for ``jobs=0``), in the order they are done, taking at most
+    ``max_pending`` items (by default two per worker) from ``items`` ahead of the results consumed."""
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    workers = jobs or os.cpu_count() or 1
+    max_pending = max(1, max_pending or workers * PENDING_PER_WORKER)
+    items = iter(items)
+    pending: Dict[Future, Hashable] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                for item_id, item in items:
+                    pending[executor.submit(function, item)] = item_id
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            # Items not started yet are not processed if the consumer stops early
+            for future in pending:
+                future.cancel()
+
+
+def iter_checks(
+    sources: Iterable[Tuple[Hashable, str]],
+    language: SupportedLanguages = SupportedLanguages.EN,
+    jobs: int = 1,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    max_pending: Optional[int] = None,
+    limits: Optional[CheckLimits] = None,
+) -> Iterator[Tuple[Hashable, Finding]]:
+    """Like :func:`check_many`, but yield ``(doc_id, finding)`` for every finding; a document without findings
+    yields nothing."""
+    results = check_many(
+        sources,
+        language=language,
+        jobs=jobs,
+        parser=parser,
+        select=select,
+        ignore=ignore,
+        max_pending=max_pending,
+        limits=limits,
+    )
+    for doc_id, errors in results:
+        for finding in _flatten(errors):
+            yield doc_id, finding
+
+
+async def perform_checks_async(
+    source: str,
+    language: SupportedLanguages = SupportedLanguages.EN,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    executor: Optional[Executor] = None,
+    limits: Optional[CheckLimits] = None,
+) -> Dict[str, List[int]]:
+    """:func:`perform_checks` run in ``executor`` (the event loop's default one if ``None``), so that awaiting
+    it does not block the event loop."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    check = partial(
+        perform_checks, source, language=language, parser=parser, select=select, ignore=ignore, limits=limits
+    )
+    return await loop.run_in_executor(executor, check)
+
+
+async def check_many_async(
+    sources: Union[Iterable[Tuple[Hashable, str]], AsyncIterable[Tuple[Hashable, str]]],
+    language: SupportedLanguages = SupportedLanguages.EN,
+    parser: SupportedParsers = SupportedParsers.BUILTIN,
+    select: Optional[Iterable[str]] = None,
+    ignore: Optional[Iterable[str]] = None,
+    executor: Optional[Executor] = None,
+    max_pending: int = 4,
+    limits: Optional[CheckLimits] = None,
+) -> AsyncIterator[Tuple[Hashable, Dict[str, List[int]]]]:
+    """Asynchronous :func:`check_many`: the documents are checked in ``executor`` (the event loop's default
+    one if ``None``; pass a :class:`ProcessPoolExecutor` to use several cores), at most ``max_pending`` at a
+    time, and ``(doc_id, errors)`` is yielded for each as soon as it is checked. ``sources`` may also be an
+    asynchronous iterable, and ``limits`` apply to every document on its own."""
+    import asyncio
+
+    if not hasattr(sources, "__aiter__"):
+        sources = _aiter(sources)
+    select = frozenset(select) if select is not None else None
+    ignore = frozenset(ignore) if ignore is not None else None
+    documents = sources.__aiter__()
+    pending: Dict[asyncio.Future, Hashable] = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max(1, max_pending):
+                try:
+                    doc_id, source = await documents.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                check = perform_checks_async(
+                    source,
+                    language=language,
+                    parser=parser,
+                    select=select,
+                    ignore=ignore,
+                    executor=executor,
+                    limits=limits,
+                )
+                pending[asyncio.ensure_future(check)] = doc_id
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _aiter(items: Iterable) -> AsyncIterator:
+    for item in items:
+        yield item
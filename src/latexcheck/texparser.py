@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import re
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from .tree import DISPLAY_MATH_ENVS, LatCat, Treenode, initiates_text_mode, is_command_with_no_text_semantics
+
+
+class SupportedParsers(Enum):
+    BUILTIN = "builtin"
+    TEXSOUP = "texsoup"
+
+
+class LatexSyntaxError(Exception):
+    def __init__(self, message: str, pos: Optional[int] = None):
+        super().__init__(message)
+        self.pos = pos
+
+
+VERBATIM_ENVS = ("verbatim", "verbatim*", "Verbatim", "lstlisting", "minted", "comment")
+MATH_ENVS = ("math", "displaymath") + DISPLAY_MATH_ENVS
+
+re_token = re.compile(
+    r"(?P<comment>%[^\n]*)"
+    r"|\\begin\s*\{(?P<begin>[^{}\s]*)\}"
+    r"|\\end\s*\{(?P<end>[^{}\s]*)\}"
+    r"|\\verb\*?(?P<verb>[^a-zA-Z\s*])[^\n]*?(?P=verb)"
+    r"|\\(?P<command>[a-zA-Z]+\*?)"
+    r"|(?P<math_delimiter>\\[\[\]()])"
+    r"|(?P<symbol>\\.?)"
+    r"|(?P<group>[{}\[\]$])"
+    r"|(?P<text>[^\\%{}\[\]$]+)",
+    re.DOTALL,
+)
+
+Token = Tuple[str, int, int, str]
+
+
+def tokenize(source: str, start: int = 0, end: Optional[int] = None) -> List[Token]:
+    """Split ``source`` (or its part from ``start`` to ``end``) into ``(kind, start, end, value)`` tuples in a
+    single left-to-right pass.
+
+    ``kind`` is one of ``text``, ``command``, ``begin``, ``end``, ``verbatim``, ``verb``, ``math_delimiter``
+    or the group character itself (``{``, ``}``, ``[``, ``]``, ``$``). Comments are dropped and control
+    symbols such as ``\\\\`` or ``\\{`` are reported as text.
+    """
+    tokens = []
+    pos = start
+    n = len(source) if end is None else end
+    while pos < n:
+        m = re_token.match(source, pos, n)
+        kind = m.lastgroup
+        start, end = m.span()
+        if kind in ("text", "symbol"):
+            tokens.append(("text", start, end, source[start:end]))
+        elif kind == "group":
+            tokens.append((source[start], start, end, source[start]))
+        elif kind == "begin":
+            name = m.group("begin")
+            if name in VERBATIM_ENVS:
+                closing = re.compile(r"\\end\s*\{" + re.escape(name) + r"\}").search(source, end, n)
+                if closing is None:
+                    raise LatexSyntaxError(f'"{name}" env expecting \\end{{{name}}}. Reached end of file.', start)
+                tokens.append(("verbatim", start, closing.end(), name))
+                tokens.append(("text", end, closing.start(), source[end : closing.start()]))
+                end = closing.end()
+            else:
+                tokens.append(("begin", start, end, name))
+        elif kind == "end":
+            tokens.append(("end", start, end, m.group("end")))
+        elif kind == "verb":
+            tokens.append(("verb", start, end, "verb"))
+        elif kind == "command":
+            tokens.append(("command", start, end, m.group("command")))
+        elif kind == "math_delimiter":
+            tokens.append(("math_delimiter", start, end, source[start:end]))
+        pos = end
+    return tokens
+
+
+def match_brackets(tokens: List[Token]) -> Dict[int, int]:
+    """Map the index of every ``[`` token to the index of its ``]`` on the same brace level."""
+    matches = {}
+    levels = [[]]
+    for i, token in enumerate(tokens):
+        kind = token[0]
+        if kind == "{":
+            levels.append([])
+        elif kind == "}":
+            if len(levels) > 1:
+                levels.pop()
+        elif kind == "[":
+            levels[-1].append(i)
+        elif kind == "]" and levels[-1]:
+            matches[levels[-1].pop()] = i
+    return matches
+
+
+class _Frame:
+    __slots__ = ("node", "target", "closer", "math", "owner", "text", "text_pos")
+
+    def __init__(self, node, target, closer, math, owner=None):
+        self.node = node
+        self.target = target
+        self.closer = closer
+        self.math = math
+        self.owner = owner
+        self.text = []
+        self.text_pos = None
+
+    def add_text(self, value: str, pos: int):
+        if not self.text:
+            self.text_pos = pos
+        self.text.append(value)
+
+
+def _flush_text(frame: _Frame):
+    if frame.text:
+        _append(
+            frame, Treenode(cat=LatCat.STR, token="".join(frame.text), pos=frame.text_pos, source=frame.node.source)
+        )
+        frame.text.clear()
+
+
+def _append(frame: _Frame, node: Treenode):
+    if node.cat != LatCat.STR:
+        _flush_text(frame)
+    target = frame.target
+    node.parent = frame.node
+    if target:
+        target[-1].next_sibling = node
+        node.prev_sibling = target[-1]
+    target.append(node)
+
+
+def _add_arg(owner: Treenode, node: Treenode):
+    if owner.args is None:
+        owner.args = []
+    node.parent = owner
+    if owner.args:
+        owner.args[-1].next_sibling = node
+        node.prev_sibling = owner.args[-1]
+    owner.args.append(node)
+
+
+def _describe_closer(closer) -> str:
+    if isinstance(closer, tuple):
+        return f"\\end{{{closer[1]}}}"
+    if isinstance(closer, int):
+        return "]"
+    return closer
+
+
+def parse_latex(
+    source: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    enclosing: Tuple[str, ...] = (),
+    left_open: Tuple[str, ...] = (),
+    tokens: Optional[List[Token]] = None,
+) -> Treenode:
+    """Build a :class:`Treenode` tree from LaTeX source without TexSoup.
+
+    The tree has the same shape as the one produced by :func:`latexcheck.tree.traverse_tex` from a TexSoup
+    document, except that the contents of command arguments are stored only in ``args`` and not repeated
+    in ``children``, and that brackets in text mode are only taken as arguments when they are balanced.
+    Every node carries its start offset in ``pos``, and every node but strings its end offset in ``end``.
+    Raises :class:`LatexSyntaxError` on unbalanced groups, environments and math delimiters.
+
+    To parse only the part of ``source`` from ``start`` to ``end``, pass the environments already open at
+    ``start`` as ``enclosing`` (outermost first; they become the first nodes of the tree, starting at
+    ``start``) and those that are to be left open at ``end`` as ``left_open``. Positions stay relative to
+    the whole ``source``. ``tokens``, if given, are those :func:`tokenize` gives for that part.
+    """
+    if tokens is None:
+        tokens = tokenize(source, start, end)
+    brackets = match_brackets(tokens)
+    root = Treenode(cat=LatCat.ENV, token="document", pos=start, source=source, children=[])
+    stack = [_Frame(root, root.children, None, False)]
+    for name in enclosing:
+        node = Treenode(cat=LatCat.ENV, token=name, pos=start, source=source, children=[])
+        _append(stack[-1], node)
+        stack.append(_Frame(node, node.children, ("end", name), stack[-1].math or name in MATH_ENVS))
+    open_braces = 0
+    # Node whose arguments are being collected: (node, spaces allowed before an argument, brackets allowed)
+    pending = None
+
+    def close_frame(end):
+        nonlocal pending, open_braces
+        frame = stack.pop()
+        _flush_text(frame)
+        frame.node.end = end
+        if frame.node.cat == LatCat.BRACES:
+            open_braces -= 1
+        if frame.owner is not None:
+            frame.owner.end = end
+            pending = (frame.owner, frame.owner.cat == LatCat.CMD, pending_brackets(frame.owner))
+
+    def pending_brackets(node):
+        return not (stack[-1].math if node.cat == LatCat.CMD else node.token in MATH_ENVS)
+
+    def open_math(token, pos, closer):
+        node = Treenode(cat=LatCat.ENV, token=token, pos=pos, source=source, children=[])
+        _append(stack[-1], node)
+        stack.append(_Frame(node, node.children, closer, True))
+
+    def fail_unclosed(frame):
+        opener = frame.node.token or ("{" if frame.node.cat == LatCat.BRACES else "[")
+        raise LatexSyntaxError(f'"{opener}" expecting {_describe_closer(frame.closer)}.', frame.node.pos)
+
+    n = len(tokens)
+    i = 0
+    while i < n:
+        kind, start, end, value = tokens[i]
+
+        if pending is not None:
+            owner, spaces_allowed, brackets_allowed = pending
+            if kind == "text" and spaces_allowed and value.isspace() and value.count("\n") < 2 and i + 1 < n:
+                next_kind = tokens[i + 1][0]
+                # Optional arguments may only be separated from the command, not from a previous argument
+                if next_kind == "{" or (
+                    next_kind == "[" and brackets_allowed and owner.args is None and i + 1 in brackets
+                ):
+                    i += 1
+                    continue
+            if kind == "{" or kind == "[" and brackets_allowed and i in brackets:
+                math = stack[-1].math and not initiates_text_mode(owner)
+                if owner.cat == LatCat.ENV:
+                    math = owner.token in MATH_ENVS
+                if kind == "{":
+                    node = Treenode(cat=LatCat.BRACES, pos=start, source=source, children=[])
+                    closer = "}"
+                    open_braces += 1
+                else:
+                    node = Treenode(cat=LatCat.BRACKETS, pos=start, source=source, children=[])
+                    closer = brackets[i]
+                _add_arg(owner, node)
+                stack.append(_Frame(node, node.children, closer, math, owner))
+                pending = None
+                i += 1
+                continue
+            pending = None
+
+        frame = stack[-1]
+        if kind == "text":
+            # Like TexSoup, drop whitespace that separates two non-text tokens
+            if not value.isspace():
+                frame.add_text(value, start)
+        elif kind == "command":
+            node = Treenode(cat=LatCat.CMD, token=value, pos=start, end=end, source=source)
+            if not is_command_with_no_text_semantics(node):
+                node.children = []
+            _append(frame, node)
+            pending = (node, True, not frame.math)
+        elif kind == "verb":
+            _append(frame, Treenode(cat=LatCat.CMD, token="verb", pos=start, end=end, source=source, children=[]))
+        elif kind == "verbatim":
+            node = Treenode(cat=LatCat.ENV, token=value, pos=start, end=end, source=source, children=[])
+            _append(frame, node)
+            _, content_pos, _, content = tokens[i + 1]
+            if content:
+                node.children.append(
+                    Treenode(cat=LatCat.STR, token=content, pos=content_pos, source=source, parent=node)
+                )
+            i += 1
+        elif kind == "begin":
+            node = Treenode(cat=LatCat.ENV, token=value, pos=start, end=end, source=source, children=[])
+            _append(frame, node)
+            stack.append(_Frame(node, node.children, ("end", value), frame.math or value in MATH_ENVS))
+            pending = (node, False, value not in MATH_ENVS)
+        elif kind == "end":
+            if frame.closer == ("end", value):
+                close_frame(end)
+            elif len(stack) > 1:
+                fail_unclosed(frame)
+            else:
+                raise LatexSyntaxError(f"Unexpected \\end{{{value}}}.", start)
+        elif kind == "{":
+            node = Treenode(cat=LatCat.BRACES, pos=start, source=source, children=[])
+            _append(frame, node)
+            stack.append(_Frame(node, node.children, "}", frame.math))
+            open_braces += 1
+        elif kind == "}":
+            if frame.closer == "}":
+                close_frame(end)
+            elif open_braces:
+                fail_unclosed(frame)
+            else:
+                frame.add_text(value, start)
+        elif kind == "]":
+            if frame.closer == i:
+                close_frame(end)
+            else:
+                frame.add_text(value, start)
+        elif kind == "[":
+            frame.add_text(value, start)
+        elif kind == "$":
+            double = i + 1 < n and tokens[i + 1][0] == "$" and tokens[i + 1][1] == end
+            if frame.closer == "$":
+                close_frame(end)
+            elif frame.closer == "$$":
+                if not double:
+                    fail_unclosed(frame)
+                close_frame(end + 1)
+                i += 1
+            elif double:
+                open_math("$$", start, "$$")
+                i += 1
+            else:
+                open_math("math", start, "$")
+        elif kind == "math_delimiter":
+            if value == "\\[":
+                open_math("displaymath", start, "\\]")
+            elif value == "\\(":
+                open_math("math", start, "\\)")
+            elif frame.closer == value:
+                close_frame(end)
+            elif any(f.closer == value for f in stack):
+                fail_unclosed(frame)
+            else:
+                frame.add_text(value, start)
+        i += 1
+
+    if len(stack) > 1 and [frame.closer for frame in stack[1:]] != [("end", name) for name in left_open]:
+        fail_unclosed(stack[-1])
+    for frame in stack:
+        _flush_text(frame)
+    root.end = len(source) if end is None else end
+    return root
@@ -0,0 +1,617 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from enum import Enum
+from itertools import accumulate
+from typing import Callable, Dict, List, Match, Optional, Tuple
+
+
+class LatCat(Enum):
+    STR = 0
+    ENV = 1
+    CMD = 2
+    BRACES = 3
+    BRACKETS = 4
+
+
+class Treenode:
+    """Node of the document tree.
+
+    The LaTeX code of a node is not stored: ``tex`` is sliced on demand from ``source`` using the
+    ``pos``/``end`` offsets (or rendered from ``origin``, the TexSoup expression the node was built from).
+
+    :func:`fill_node_links` also summarises the subtree of every node: ``descendant_tokens`` is a bitset
+    (see :func:`token_bit`) of the command and environment names found below the node and ``subtree_size``
+    is the number of nodes in the subtree, the node itself included. ``features`` is the bitset of the
+    sibling features (see :func:`sibling_feature`) the node has, ``children_features`` those found among its
+    args and children and ``children_features_repeated`` those found in at least two of them.
+    ``resolved_pos`` is the offset findings on the node are reported at: its own ``pos``, or that of the
+    nearest preceding node that has one.
+    """
+
+    __slots__ = (
+        "cat",
+        "token",
+        "args",
+        "children",
+        "prev_sibling",
+        "next_sibling",
+        "prev_node",
+        "next_node",
+        "parent",
+        "is_in_math",
+        "is_in_display_math",
+        "is_in_arg",
+        "pos",
+        "resolved_pos",
+        "end",
+        "source",
+        "origin",
+        "descendant_tokens",
+        "subtree_size",
+        "features",
+        "children_features",
+        "children_features_repeated",
+        "_tex",
+    )
+
+    def __init__(
+        self,
+        cat: LatCat = LatCat.STR,
+        token: str = None,
+        args: List[Treenode] = None,
+        children: List[Treenode] = None,
+        prev_sibling: Treenode = None,
+        next_sibling: Treenode = None,
+        prev_node: Treenode = None,
+        next_node: Treenode = None,
+        parent: Treenode = None,
+        is_in_math: bool = False,
+        is_in_display_math: bool = False,
+        is_in_arg: bool = False,
+        pos: int = None,
+        end: int = None,
+        source: str = None,
+        origin=None,
+        tex: str = None,
+    ):
+        self.cat = cat
+        self.token = token
+        self.args = args
+        self.children = children
+        self.prev_sibling = prev_sibling
+        self.next_sibling = next_sibling
+        self.prev_node = prev_node
+        self.next_node = next_node
+        self.parent = parent
+        self.is_in_math = is_in_math
+        self.is_in_display_math = is_in_display_math
+        self.is_in_arg = is_in_arg
+        self.pos = pos
+        self.resolved_pos = 0
+        self.end = end
+        self.source = source
+        self.origin = origin
+        self.descendant_tokens = 0
+        self.subtree_size = 1
+        self.features = 0
+        self.children_features = 0
+        self.children_features_repeated = 0
+        self._tex = tex
+
+    @property
+    def tex(self) -> str:
+        if self._tex is not None:
+            return self._tex
+        if self.source is not None and self.end is not None:
+            return self.source[self.pos : self.end]
+        if self.origin is not None:
+            return str(self.origin)
+        return None
+
+    @tex.setter
+    def tex(self, value: str):
+        self._tex = value
+
+    def __repr__(self):
+        return f"Treenode(cat={self.cat}, token={self.token!r}, pos={self.pos})"
+
+
+AGG_STRINGS = True
+
+DISPLAY_MATH_ENVS = (
+    "$$",
+    "align",
+    "align*",
+    "eqnarray",
+    "eqnarray*",
+    "equation",
+    "equation*",
+    "gather",
+    "gather*",
+    "multline",
+    "multline*",
+    "displaymath",
+    "flalign",
+    "flalign*",
+    "alignat",
+    "alignat*",
+)
+NUMBERED_DISPLAY_MATH_ENVS = ("align", "eqnarray", "equation", "gather", "multline", "flalign", "alignat")
+
+
+def is_command_with_no_text_semantics(node: Treenode):
+    if node is None:
+        return False
+    return node.cat == LatCat.CMD and node.token in ["label", "ref", "eqref", "tag"]
+
+
+def is_display_math(x):
+    if x is None:
+        return False
+    if isinstance(x, Treenode):
+        return (x.cat == LatCat.ENV) and (x.token in DISPLAY_MATH_ENVS)
+    return x in DISPLAY_MATH_ENVS
+
+
+def is_numbered_display_math(x):
+    if x is None:
+        return False
+    if isinstance(x, Treenode):
+        return (x.cat == LatCat.ENV) and (x.token in NUMBERED_DISPLAY_MATH_ENVS)
+    return x in NUMBERED_DISPLAY_MATH_ENVS
+
+
+def is_math(x):
+    if x is None:
+        return False
+    if isinstance(x, Treenode):
+        return (x.token == "math") or is_display_math(x.token)
+    return (x == "math") or is_display_math(x)
+
+
+def initiates_text_mode(x):
+    if x is None:
+        return False
+    text_envs = ["mbox", "hbox", "text", "textnormal", "textrm", "textit", "textsf", "texttt"]
+    if isinstance(x, Treenode):
+        return x.token in text_envs
+    return x in text_envs
+
+
+def iter_subtree(node):
+    """Yield ``node`` and all its descendants in document order (arguments before children)."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.children:
+            stack.extend(reversed(node.children))
+        if node.args:
+            stack.extend(reversed(node.args))
+
+
+# Names that have a bit in ``Treenode.descendant_tokens``: those the rules look for below a node, given their bits
+# when the rules are loaded. Other names get none, so the masks do not grow with every macro of every document a
+# long-running process checks
+TOKEN_BITS: Dict[str, int] = {}
+MAX_TOKEN_BITS = 64
+_token_bits_lock = threading.Lock()
+
+
+def token_bit(token: str) -> int:
+    """The bit standing for a command or environment name in ``Treenode.descendant_tokens``, given to it if it
+    has none yet; 0 once ``MAX_TOKEN_BITS`` names have one.
+
+    Only trees built after the name got its bit have it set, so names are meant to be given bits when the
+    module looking for them is loaded."""
+    bit = TOKEN_BITS.get(token)
+    if bit is None:
+        with _token_bits_lock:
+            bit = TOKEN_BITS.get(token)
+            if bit is None:
+                if len(TOKEN_BITS) >= MAX_TOKEN_BITS:
+                    return 0
+                bit = TOKEN_BITS[token] = 1 << len(TOKEN_BITS)
+    return bit
+
+
+def tokens_mask(*tokens: str) -> Optional[int]:
+    """Bitset of the given names, or ``None`` if one of them has no bit."""
+    mask = 0
+    for token in tokens:
+        bit = TOKEN_BITS.get(token)
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
+
+
+def _is_named(node, tokens) -> bool:
+    return node.token in tokens and (node.cat == LatCat.CMD or node.cat == LatCat.ENV)
+
+
+def has_descendant_token(node, *tokens: str) -> bool:
+    """Whether a command or environment named as one of ``tokens`` occurs strictly below ``node``."""
+    if node is None:
+        return False
+    mask = tokens_mask(*tokens)
+    if mask is None:
+        return any(_is_named(descendant, tokens) for descendant in iter_subtree(node) if descendant is not node)
+    return bool(node.descendant_tokens & mask)
+
+
+def find_descendant_token(node, token: str):
+    """The first node (in document order, ``node`` included) that is a command or environment named ``token``."""
+    mask = tokens_mask(token)
+    if mask is None and node is not None:
+        return next((descendant for descendant in iter_subtree(node) if _is_named(descendant, (token,))), None)
+    while node is not None:
+        if node.token == token and node.cat in (LatCat.CMD, LatCat.ENV):
+            return node
+        if not node.descendant_tokens & mask:
+            return None
+        node = next(
+            child
+            for nodelist in [node.args, node.children]
+            if nodelist
+            for child in nodelist
+            if child.descendant_tokens & mask or child.token == token and child.cat in (LatCat.CMD, LatCat.ENV)
+        )
+    return None
+
+
+SIBLING_FEATURES: List[Callable[[Treenode], bool]] = []
+
+
+def sibling_feature(predicate: Callable[[Treenode], bool]) -> int:
+    """Register a node predicate to be indexed per parent by :func:`fill_node_links`; returns its bit.
+
+    Registered predicates are evaluated once per node, and :func:`has_sibling_feature` answers
+    "does any other node with the same parent satisfy it" in constant time.
+    """
+    SIBLING_FEATURES.append(predicate)
+    return 1 << (len(SIBLING_FEATURES) - 1)
+
+
+def has_sibling_feature(node, feature: int) -> bool:
+    if node is None or node.parent is None:
+        return False
+    if node.features & feature:
+        return bool(node.parent.children_features_repeated & feature)
+    return bool(node.parent.children_features & feature)
+
+
+def has_descendant(node, predicate, recursive_call=False):
+    if node is None:
+        return False
+    if recursive_call and predicate(node):
+        return True
+    descendants = iter_subtree(node)
+    next(descendants)
+    return any(predicate(d) for d in descendants)
+
+
+def has_child(node, predicate):
+    if node is None:
+        return False
+    for nodelist in [node.args, node.children]:
+        if nodelist is not None:
+            for child in nodelist:
+                if predicate(child):
+                    return True
+    return False
+
+
+def has_sibling(node, predicate):
+    if node is None or node.parent is None:
+        return False
+    return has_child(node.parent, (lambda x: x is not node and predicate(x)))
+
+
+def is_pure_argument(node):
+    while node.parent and node.parent.cat in [LatCat.BRACES, LatCat.BRACKETS]:
+        node = node.parent
+    # The outermost group is an argument of the command, or the command itself was given
+    return is_command_with_no_text_semantics(node) or is_command_with_no_text_semantics(node.parent)
+
+
+def _make_node(tex):
+    new_node = Treenode(pos=tex.position, origin=tex)
+
+    # The opening delimiter tells the kind of group apart without rendering the whole subtree with str()
+    begin = str(getattr(getattr(tex, "expr", tex), "begin", None) or "")
+
+    if begin == rf"\begin{{{tex.name}}}" or tex.name == "$$":
+        new_node.cat = LatCat.ENV
+        new_node.token = str(tex.name)
+    elif tex.name == "$" or tex.name == "math":
+        new_node.cat = LatCat.ENV
+        new_node.token = "math"
+    elif tex.name == "displaymath":
+        new_node.cat = LatCat.ENV
+        new_node.token = "displaymath"
+    elif tex.name == "[tex]":
+        new_node.cat = LatCat.ENV
+        new_node.token = "document"
+    elif begin.startswith("{"):
+        new_node.cat = LatCat.BRACES
+    elif begin.startswith("["):
+        new_node.cat = LatCat.BRACKETS
+    else:
+        new_node.cat = LatCat.CMD
+        new_node.token = str(tex.name)
+    return new_node
+
+
+def traverse_tex(tex, parent_node_list=None, depth=0):
+    global AGG_STRINGS
+    no_parent = False
+    if parent_node_list is None:
+        parent_node_list = []
+        no_parent = True
+
+    created = []
+    # Each entry is an iterator over TexSoup expressions and the node list they are converted into
+    stack = [(iter((tex,)), parent_node_list)]
+    while stack:
+        items, node_list = stack[-1]
+        tex = next(items, None)
+        if tex is None:
+            stack.pop()
+            continue
+
+        if isinstance(tex, str):
+            if tex.startswith("%"):
+                continue
+            if AGG_STRINGS and len(node_list) > 0 and node_list[-1].cat == LatCat.STR:
+                node_list[-1].token += tex
+            else:
+                pos = getattr(tex, "position", None)
+                node_list.append(Treenode(cat=LatCat.STR, token=tex, pos=pos if pos is not None and pos >= 0 else None))
+            continue
+
+        new_node = _make_node(tex)
+        node_list.append(new_node)
+        created.append(new_node)
+
+        new_node.children = None
+        if not is_command_with_no_text_semantics(new_node):
+            new_node.children = []
+            contents = tex.contents
+            if new_node.cat == LatCat.CMD and tex.args:
+                # TexSoup lists the contents of the arguments of a command again as its own contents
+                contents = contents[sum(len(arg.contents) for arg in tex.args) :]
+            stack.append((iter(contents), new_node.children))
+        if tex.args:
+            new_node.args = []
+            stack.append((iter(tex.args), new_node.args))
+
+    for new_node in created:
+        for nodelist in [new_node.args, new_node.children]:
+            if nodelist is None:
+                continue
+            prev_sibling = None
+            for child in nodelist:
+                if prev_sibling:
+                    prev_sibling.next_sibling = child
+                child.prev_sibling = prev_sibling
+                child.parent = new_node
+                prev_sibling = child
+
+    if no_parent and created:
+        return created[0]
+
+
+def fill_node_links(root_node):
+    all_nodes = list()
+
+    stack = [(root_node, 0, False)]
+    while stack:
+        node, math_mode, in_args = stack.pop()
+        if in_args:
+            node.is_in_arg = True
+        if math_mode:
+            node.is_in_math = True
+        if math_mode == 2:
+            node.is_in_display_math = True
+        if is_math(node) or node.is_in_math and not initiates_text_mode(node):
+            math_mode = 1
+        elif (node.is_in_display_math or is_display_math(node)) and not initiates_text_mode(node):
+            math_mode = 2
+        all_nodes.append(node)
+        if node.children:
+            stack.extend((child, math_mode, in_args) for child in reversed(node.children))
+        if node.args:
+            args_in_args = in_args or is_command_with_no_text_semantics(node)
+            stack.extend((child, math_mode, args_in_args) for child in reversed(node.args))
+
+    resolved_pos = None
+    for i, node in enumerate(all_nodes):
+        if i:
+            node.prev_node = all_nodes[i - 1]
+            all_nodes[i - 1].next_node = node
+        if node.pos is not None:
+            resolved_pos = node.pos
+        node.resolved_pos = resolved_pos or 0
+
+    # Subtree summaries and sibling features, bottom-up: every node is visited after all of its descendants
+    features = list(enumerate(SIBLING_FEATURES))
+    for node in all_nodes:
+        node.descendant_tokens = 0
+        node.subtree_size = 1
+        node.children_features = 0
+        node.children_features_repeated = 0
+        node.features = 0
+        for i, predicate in features:
+            if predicate(node):
+                node.features |= 1 << i
+    bits = TOKEN_BITS
+    for node in reversed(all_nodes):
+        parent = node.parent
+        if parent is None:
+            continue
+        if node.features:
+            parent.children_features_repeated |= parent.children_features & node.features
+            parent.children_features |= node.features
+        tokens = node.descendant_tokens
+        if node.cat == LatCat.CMD or node.cat == LatCat.ENV:
+            tokens |= bits.get(node.token, 0)
+        parent.descendant_tokens |= tokens
+        parent.subtree_size += node.subtree_size
+    return all_nodes
+
+
+def find_prev(node, condition):
+    while node is not None:
+        node = node.prev_node
+        if (node is not None) and condition(node):
+            return node
+
+
+def find_next(node, condition):
+    while node is not None:
+        node = node.next_node
+        if (node is not None) and condition(node):
+            return node
+
+
+def find_child(node, condition):
+    if node is None:
+        return None
+    for nodelist in [node.args, node.children]:
+        if nodelist is not None:
+            for child in nodelist:
+                if condition(child):
+                    return child
+    return None
+
+
+def find_descendant(node, condition):
+    if node is None:
+        return None
+    for d in iter_subtree(node):
+        if condition(d):
+            return d
+    return None
+
+
+def tree_to_str(node, depth=0):
+    lines = []
+    # Entries are either nodes to print with their depth or ready-made "ARGS:"/"CHILDREN:" header lines
+    stack = [(node, depth)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, str):
+            lines.append(node)
+            continue
+        lines.append(f"{'  ' * depth} {node.cat} {repr(node.token or '')}\n")
+        for nodelist, header in [(node.children, "CHILDREN:"), (node.args, "ARGS:")]:
+            if nodelist is not None and nodelist != []:
+                stack.extend((child, depth + 1) for child in reversed(nodelist))
+                stack.append((f"{'  ' * depth} {header}\n", depth))
+    return "".join(lines)
+
+
+class StringBuffer:
+    """The tokens of consecutive string nodes of one mode, concatenated in document order, with the offset map back.
+
+    Strings separated only by group delimiters are joined as they are typeset (in text mode only); anything else
+    between two strings (a command, an environment, a formula, a string left out of the buffer) ends the buffer,
+    so that patterns see the edges of a buffer as they would see the edges of a single token. The segment of
+    ``text`` starting at ``starts[i]`` is the token of ``nodes[i]``.
+    """
+
+    __slots__ = ("text", "starts", "nodes")
+
+    def __init__(self, nodes: List[Treenode], tokens: List[str]):
+        self.text = "".join(tokens)
+        self.nodes = nodes
+        self.starts = [0]
+        if len(tokens) > 1:
+            self.starts.extend(accumulate(map(len, tokens[:-1])))
+
+    def node_at(self, offset: int) -> Treenode:
+        """The string node the character at ``offset`` comes from."""
+        return self.nodes[bisect_right(self.starts, offset) - 1]
+
+    def match_pos(self, match: Match) -> int:
+        """Offset in the source a finding matched in the buffer is reported at: that of the first character of the
+        match."""
+        return self.source_pos(match.start())
+
+    def source_pos(self, offset: int) -> int:
+        """Offset in the source of the character at ``offset`` of the buffer."""
+        i = bisect_right(self.starts, offset) - 1
+        node = self.nodes[i]
+        if node.pos is None:
+            return node.resolved_pos
+        return node.pos + _offset_in_source(node, offset - self.starts[i])
+
+
+class _BufferList:
+    # Collects the buffers of one mode, starting a new one wherever something separates two strings
+    __slots__ = ("buffers", "nodes", "tokens")
+
+    def __init__(self):
+        self.buffers: List[StringBuffer] = []
+        self.nodes: List[Treenode] = []
+        self.tokens: List[str] = []
+
+    def separate(self):
+        if self.nodes:
+            self.buffers.append(StringBuffer(self.nodes, self.tokens))
+            self.nodes = []
+            self.tokens = []
+
+    def finish(self) -> List[StringBuffer]:
+        self.separate()
+        return self.buffers
+
+
+def _offset_in_source(node: Treenode, offset: int) -> int:
+    source = node.source
+    token = node.token
+    if source is None or source.startswith(token, node.pos):
+        return offset
+    # The parser left comments out of the token: align the two, taking every character of the token to be the
+    # next equal one of the source
+    j = node.pos
+    for char in token[: offset + 1]:
+        while j < len(source) and source[j] != char:
+            j += 1
+        j += 1
+    return min(j, len(source)) - 1 - node.pos
+
+
+def string_buffers(all_nodes: List[Treenode]) -> Tuple[List[StringBuffer], List[StringBuffer]]:
+    """The text-mode and the math-mode :class:`StringBuffer` lists of a document, from the nodes
+    :func:`fill_node_links` returns. Pure arguments (see :func:`is_pure_argument`) are left out of the text buffers.
+    """
+    text = _BufferList()
+    math = _BufferList()
+    for node in all_nodes:
+        if node.cat == LatCat.STR:
+            if not node.token:
+                continue
+            if node.is_in_math:
+                if math.nodes and node.parent is not math.nodes[-1].parent:
+                    # Where a group ends there is no node to separate its last string from the next one
+                    math.separate()
+                math.nodes.append(node)
+                math.tokens.append(str(node.token))
+                text.separate()
+            elif is_pure_argument(node):
+                text.separate()
+                math.separate()
+            else:
+                text.nodes.append(node)
+                text.tokens.append(str(node.token))
+                math.separate()
+        elif node.cat == LatCat.BRACES or node.cat == LatCat.BRACKETS:
+            math.separate()
+        else:
+            text.separate()
+            math.separate()
+    return text.finish(), math.finish()
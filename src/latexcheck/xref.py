@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .tree import LatCat, Treenode, iter_subtree, token_bit, tokens_mask
+
+UNREFERENCED_LABEL_CODE = "NUMBERED_MATH_NEEDS_REFERENCING"
+UNDEFINED_REFERENCE_CODE = "UNDEFINED_REFERENCE"
+DUPLICATE_LABEL_CODE = "DUPLICATE_LABEL"
+# Codes found from the labels and references of a whole document, or project, rather than by a rule
+XREF_CODES = frozenset((UNREFERENCED_LABEL_CODE, UNDEFINED_REFERENCE_CODE, DUPLICATE_LABEL_CODE))
+# Codes that need all the labels of a document, which a file that is only a part of one does not have
+WHOLE_DOCUMENT_CODES = frozenset((UNDEFINED_REFERENCE_CODE, DUPLICATE_LABEL_CODE))
+
+LABEL_COMMANDS = frozenset(("label",))
+REFERENCE_COMMANDS = frozenset(("ref", "eqref"))
+CITATION_COMMANDS = frozenset(("cite",))
+XREF_COMMANDS = LABEL_COMMANDS | REFERENCE_COMMANDS | CITATION_COMMANDS
+XREF_KINDS = ("labels", "references", "citations")
+
+re_whitespace = re.compile(r"\s+")
+
+# Found below a node through Treenode.descendant_tokens, which needs them to have their bits before any tree is built
+for name in sorted(XREF_COMMANDS):
+    token_bit(name)
+
+# Where a key occurs: the document and the offset findings on it are reported at
+Site = Tuple[Optional[str], int]
+
+
+def normalize_key(key: str) -> str:
+    """Key of a label or citation without the braces around it and with its whitespace collapsed, so that
+    ``{eq:1}`` and ``{ eq:1 }`` are the same key."""
+    if key.startswith("{") and key.endswith("}"):
+        key = key[1:-1]
+    return re_whitespace.sub(" ", key).strip()
+
+
+def document_codes(source: str, codes: FrozenSet[str], select: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """Those of ``codes`` to report for ``source`` checked on its own: the codes of
+    :data:`WHOLE_DOCUMENT_CODES` only if ``source`` is a whole document, with a ``\\documentclass``, or if they
+    are in ``select``, since a file included by another one refers to labels defined elsewhere."""
+    if codes.isdisjoint(WHOLE_DOCUMENT_CODES) or "\\documentclass" in source:
+        return codes
+    return codes - (WHOLE_DOCUMENT_CODES - frozenset(select or ()))
+
+
+class XrefIndex:
+    """Labels, the keys referenced by ``\\ref``/``\\eqref`` and the keys cited by ``\\cite``, gathered from one
+    or more documents.
+
+    ``labels``, ``references`` and ``citations`` map every (normalized, see :func:`normalize_key`) key to
+    the places it is defined or used at, in document order. A place is the document it is in (``document``,
+    e.g. a file name) and the offset findings on it are reported at, so that indexes of the files of a
+    project can be merged and findings still be reported in the right file. Keys containing ``#``, such as
+    the parameters of macro definitions, are left out.
+    """
+
+    def __init__(self, document: Optional[str] = None):
+        self.document = document
+        self.labels: Dict[str, List[Site]] = {}
+        self.references: Dict[str, List[Site]] = {}
+        self.citations: Dict[str, List[Site]] = {}
+
+    def _add(self, sites: Dict[str, List[Site]], key: str, pos: int):
+        key = normalize_key(key)
+        if key and "#" not in key:
+            sites.setdefault(key, []).append((self.document, pos))
+
+    def add_command(self, node: Treenode):
+        """Add ``node`` if it is a ``\\label``, ``\\ref``, ``\\eqref`` or ``\\cite`` command."""
+        if node.cat != LatCat.CMD or not node.args:
+            return
+        arg = next((arg for arg in node.args if arg.cat == LatCat.BRACES), None)
+        if arg is None:
+            return
+        if node.token in LABEL_COMMANDS:
+            self._add(self.labels, arg.tex, node.resolved_pos)
+        elif node.token in REFERENCE_COMMANDS:
+            self._add(self.references, arg.tex, node.resolved_pos)
+        elif node.token in CITATION_COMMANDS:
+            for key in normalize_key(arg.tex).split(","):
+                self._add(self.citations, key, node.resolved_pos)
+
+    def add_tree(self, root: Treenode) -> XrefIndex:
+        """Add the commands found in the tree below ``root`` in one walk that only enters the subtrees where
+        :attr:`Treenode.descendant_tokens` shows such commands (the tree must have been through
+        :func:`~latexcheck.tree.fill_node_links`)."""
+        mask = tokens_mask(*XREF_COMMANDS)
+        if mask is None:
+            return self.add_nodes(iter_subtree(root))
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.cat == LatCat.CMD and node.token in XREF_COMMANDS:
+                self.add_command(node)
+            if node.descendant_tokens & mask:
+                if node.children:
+                    stack.extend(reversed(node.children))
+                if node.args:
+                    stack.extend(reversed(node.args))
+        return self
+
+    def add_nodes(self, all_nodes: Iterable[Treenode]) -> XrefIndex:
+        for node in all_nodes:
+            self.add_command(node)
+        return self
+
+    def merge(self, other: XrefIndex, shift: int = 0):
+        """Add the keys of ``other``, moving their offsets by ``shift``."""
+        for kind in XREF_KINDS:
+            sites = getattr(self, kind)
+            for key, other_sites in getattr(other, kind).items():
+                sites.setdefault(key, []).extend((document, pos + shift) for document, pos in other_sites)
+
+    def within(self, start: int, end: int) -> XrefIndex:
+        """The keys found at offsets from ``start`` up to ``end``, e.g. in one part of a document that was checked
+        together with the text around it."""
+        index = XrefIndex(self.document)
+        for kind in XREF_KINDS:
+            for key, sites in getattr(self, kind).items():
+                kept = [site for site in sites if start <= site[1] < end]
+                if kept:
+                    getattr(index, kind)[key] = kept
+        return index
+
+    def to_json(self) -> Dict[str, Dict[str, List[int]]]:
+        """The offsets of the keys, per kind and key, for an index of a single document."""
+        return {
+            kind: {key: [pos for _, pos in sites] for key, sites in getattr(self, kind).items()} for kind in XREF_KINDS
+        }
+
+    def add_json(self, data: Dict[str, Dict[str, List[int]]]):
+        """Add keys found in ``document`` as given by :meth:`to_json`."""
+        for kind in XREF_KINDS:
+            sites = getattr(self, kind)
+            for key, positions in data[kind].items():
+                sites.setdefault(key, []).extend((self.document, pos) for pos in positions)
+
+    def unreferenced_labels(self) -> List[Site]:
+        """``(document, pos)`` of every label that is not referenced anywhere in the index."""
+        return self._sorted(
+            site for key, sites in self.labels.items() if key not in self.references for site in sites
+        )
+
+    def undefined_references(self) -> List[Site]:
+        """``(document, pos)`` of every reference to a key no label in the index defines."""
+        return self._sorted(
+            site for key, sites in self.references.items() if key not in self.labels for site in sites
+        )
+
+    def duplicate_labels(self) -> List[Site]:
+        """``(document, pos)`` of every definition of a label defined before."""
+        return self._sorted(site for sites in self.labels.values() for site in sites[1:])
+
+    @staticmethod
+    def _sorted(sites: Iterable[Site]) -> List[Site]:
+        return sorted(sites, key=lambda site: site[1])
+
+    def findings(self, codes: Iterable[str]) -> List[Tuple[str, Optional[str], int]]:
+        """``(code, document, pos)`` of the findings on the keys of the index, for those of ``codes`` that
+        are about cross-references."""
+        found = []
+        for code, sites in (
+            (UNREFERENCED_LABEL_CODE, self.unreferenced_labels),
+            (UNDEFINED_REFERENCE_CODE, self.undefined_references),
+            (DUPLICATE_LABEL_CODE, self.duplicate_labels),
+        ):
+            if code in codes:
+                found.extend((code, document, pos) for document, pos in sites())
+        return found
@@ -0,0 +1,78 @@
+import pytest
+
+from latexcheck import perform_checks
+from latexcheck.batch import check_chunks, check_file, check_files, collect_tex_files, group_chunks
+from latexcheck.cache import ResultCache
+from latexcheck.chunking import split_chunks
+
+DOCUMENT = "".join(
+    rf"\section{{Part {i}}} Cats , dogs.Then \label{{sec{i}}} more text, see 2*3 and ``quotes''." "\n"
+    for i in range(6)
+)
+
+
+def test_paths_are_expanded_in_a_stable_order_without_duplicates(tmp_path):
+    for name in ["b/z.tex", "b/a/y.tex", "a.tex", "notes.txt"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("Text.", encoding="utf-8")
+    found, missing = collect_tex_files(
+        [str(tmp_path / "b"), str(tmp_path / "*.tex"), str(tmp_path / "b/z.tex"), str(tmp_path / "none*.tex")]
+    )
+    assert found == [str(tmp_path / name) for name in ["b/z.tex", "b/a/y.tex", "a.tex"]]
+    assert missing == [str(tmp_path / "none*.tex")]
+
+
+def test_files_checked_by_a_pool_give_the_serial_results_in_order(tmp_path):
+    filenames = []
+    for i in range(5):
+        path = tmp_path / f"f{i}.tex"
+        path.write_text(DOCUMENT[: 80 * (i + 1)] if i % 2 else "Fine text.", encoding="utf-8")
+        filenames.append(str(path))
+    serial = list(check_files(filenames))
+    assert [filename for filename, _ in serial] == filenames and any(errors for _, errors in serial)
+    reported = []
+    parallel = list(check_files(filenames, jobs=2, on_error=lambda *finding: reported.append(finding)))
+    assert parallel == serial
+    assert reported == [(filename, code, pos) for filename, errors in serial for code, pos in sorted_findings(errors)]
+
+
+def sorted_findings(errors):
+    return sorted(((code, pos) for code, positions in errors.items() for pos in positions), key=lambda f: (f[1], f[0]))
+
+
+def findings(path, **kwargs):
+    reported = []
+    check_file(str(path), on_error=lambda code, pos: reported.append((code, pos)), **kwargs)
+    return reported
+
+
+def test_findings_are_reported_in_document_order_however_checked(tmp_path):
+    path = tmp_path / "doc.tex"
+    path.write_text(DOCUMENT, encoding="utf-8")
+    serial = findings(path)
+    assert len({code for code, _ in serial}) > 2
+    assert [pos for _, pos in serial] == sorted(pos for _, pos in serial)
+    assert findings(path, jobs=3) == serial
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    for jobs in (1, 3):
+        assert findings(path, jobs=jobs, cache=cache) == serial
+        assert findings(path, jobs=jobs, cache=cache) == serial
+
+
+BOUNDARIES = "".join(
+    rf"\section{{Part {i}}} Text $x$ ,and more$$y$$ text, \ref{{sec{(i + 1) % 7}}} " "\n"
+    rf"\subsection{{Sub {i}}} \label{{sec{i}}} Then $$z$$ ." "\n"
+    for i in range(7)
+) + r"Last words ,"
+
+
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_sections_checked_in_parallel_give_the_findings_of_a_whole_check(jobs):
+    chunks = split_chunks(BOUNDARIES)
+    assert len(group_chunks(chunks, jobs)) > 2
+    totals = {}
+    errors = check_chunks(BOUNDARIES, chunks, jobs=jobs, totals=totals)
+    whole_totals = {}
+    assert errors == perform_checks(BOUNDARIES, totals=whole_totals)
+    assert totals == whole_totals
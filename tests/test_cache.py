@@ -0,0 +1,21 @@
+from latexcheck.batch import check_file
+from latexcheck.cache import ResultCache
+
+# Checked as a whole, the document-wide DOUBLE_DOLLARS comes first; checked by parts, in the order of the parts
+DOCUMENT = r"\section{A} Cats , dogs." "\n" + "".join(rf"\section{{Part {i}}} Text $$x$$ text." "\n" for i in range(6))
+
+
+def test_key_tells_whole_and_chunked_checks_apart(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.key(DOCUMENT) != cache.key(DOCUMENT, parts=[0, 100])
+    assert cache.key(DOCUMENT, parts=[0, 100]) != cache.key(DOCUMENT, parts=[0, 200])
+
+
+def test_results_are_reused_only_for_the_same_mode(tmp_path):
+    path = tmp_path / "doc.tex"
+    path.write_text(DOCUMENT, encoding="utf-8")
+    cache = ResultCache(str(tmp_path / "cache"))
+    for jobs in (1, 2):
+        expected = list(check_file(str(path), jobs=jobs).items())
+        assert list(check_file(str(path), jobs=jobs, cache=cache).items()) == expected
+        assert list(check_file(str(path), jobs=jobs, cache=cache).items()) == expected
@@ -0,0 +1,42 @@
+import pytest
+
+from latexcheck import check_corpus, iter_documents, perform_checks
+
+FIRST = "% dump\n\\documentclass{article}\n\\begin{document}\nCats , dogs.\n\\end{document}\n"
+BROKEN = "\\documentclass{article}\n\\begin{document}\n\\section{A} Text \\emph{open , here.\n\\end{document}\n"
+BODY_ONLY = "\\begin{document}\nMice , too.\n\\end{document}\n"
+LAST = "\\documentclass{book}\n\\begin{document}\nFine text , here.\n\\end{document}\n"
+DUMP = FIRST + BROKEN + BODY_ONLY + "\n\n" + LAST
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "dump.tex"
+    path.write_bytes(DUMP.encode("utf-8"))
+    return str(path)
+
+
+def test_dumps_are_split_before_each_document(dump):
+    documents = list(iter_documents(dump))
+    assert [document.source for document in documents] == [FIRST, BROKEN, BODY_ONLY + "\n\n", LAST]
+    assert [document.start for document in documents] == [DUMP.index(document.source) for document in documents]
+    for document in documents:
+        assert document.line == DUMP.count("\n", 0, document.start) + 1
+
+
+def test_dumps_are_split_at_separator_lines(tmp_path):
+    path = tmp_path / "dump.tex"
+    path.write_text("First.\n%%% next  \n\n%%% next\nSecond.\n%%% next\n", encoding="utf-8")
+    assert [document.source for document in iter_documents(str(path), "%%% next")] == ["First.\n", "Second.\n"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_a_document_that_cannot_be_parsed_leaves_the_others_alone(dump, jobs):
+    results = sorted(check_corpus(dump, jobs=jobs), key=lambda result: result[0].index)
+    assert [document.index for document, _ in results] == [0, 1, 2, 3]
+    for document, errors in results:
+        expected = perform_checks(document.source)
+        assert errors == {code: [pos + document.start for pos in positions] for code, positions in expected.items()}
+        assert ("PARSE_ERROR" in errors) == (document.source == BROKEN)
+    assert results[1][1]["PARSE_ERROR"] == [DUMP.index("{open")]
+    assert all("SPACE_BEFORE_PUNCTUATION_MARK" in errors for document, errors in results if document.index != 1)
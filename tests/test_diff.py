@@ -0,0 +1,55 @@
+import pytest
+
+from corpus import generate_document
+from latexcheck import LineIndex, SupportedParsers, parse_unified_diff, perform_checks
+
+DIFF = """\
+diff --git a/doc.tex b/doc.tex
+--- a/doc.tex
++++ b/doc.tex
+@@ -2,3 +2,4 @@ context
+ kept
+-old line
++new line
++another new line
+ kept
+@@ -20,2 +21,0 @@
+-removed only
+-removed too
+@@ -30 +30 @@
+-x
++y
+diff --git a/gone.tex b/gone.tex
+--- a/gone.tex
++++ /dev/null
+@@ -1 +0,0 @@
+-text
+--- other.tex\t2024-01-01 00:00:00
++++ other.tex\t2024-01-02 00:00:00
+@@ -0,0 +1,2 @@
++first
++second
+"""
+
+
+def test_only_added_and_changed_lines_of_new_files_are_taken():
+    assert parse_unified_diff(DIFF) == {"doc.tex": [(3, 4), (30, 30)], "other.tex": [(1, 2)]}
+
+
+@pytest.mark.parametrize("parser", list(SupportedParsers))
+def test_findings_are_those_of_a_full_check_on_the_changed_lines(parser):
+    source = generate_document(size_kb=6, math_density=0.4, seed=4)
+    lines = [(3, 5), (20, 20), (41, 47)]
+    line_index = LineIndex(source)
+
+    def changed(pos):
+        return pos is not None and any(first <= line_index.line_col(pos)[0] <= last for first, last in lines)
+
+    full = perform_checks(source, parser=parser)
+    expected = {}
+    for code, positions in full.items():
+        kept = [pos for pos in positions if changed(pos)]
+        if kept:
+            expected[code] = kept
+    assert expected and expected != full
+    assert perform_checks(source, parser=parser, changed_lines=lines) == expected
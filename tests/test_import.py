@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import latexcheck
+from bench_import import DEFAULT_BUDGET_MS, LAZY_MODULES, STATEMENTS, import_times
+
+
+def modules_after(statement):
+    """The modules loaded after running ``statement`` in a new interpreter."""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(latexcheck.__file__)))
+    env = dict(os.environ, PYTHONPATH=src_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    code = f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_import_loads_no_submodules():
+    modules = modules_after("import latexcheck")
+    assert not modules & set(LAZY_MODULES)
+    assert [name for name in modules if name.startswith("latexcheck.")] == []
+
+
+def test_command_line_loads_no_checker_until_it_runs():
+    modules = modules_after("from latexcheck import main")
+    assert [name for name in modules if name.startswith("latexcheck.")] == ["latexcheck.cli"]
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_import_is_within_budget(statement):
+    best_ms = min(import_times(statement)[0] for _ in range(5)) / 1000
+    assert best_ms <= DEFAULT_BUDGET_MS
+
+
+@pytest.mark.parametrize("statement", ["from latexcheck import main", "from latexcheck import perform_checks"])
+def test_lazy_modules_stay_unloaded(statement):
+    assert not modules_after(statement) & set(LAZY_MODULES)
+
+
+def test_names_resolve_lazily():
+    assert latexcheck.XrefIndex.__module__ == "latexcheck.xref"
+    assert set(latexcheck.__all__) <= set(dir(latexcheck))
+    with pytest.raises(AttributeError):
+        latexcheck.ReferenceIndex
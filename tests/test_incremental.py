@@ -0,0 +1,32 @@
+import pytest
+
+from latexcheck import SupportedParsers, perform_checks
+from latexcheck.chunking import split_paragraphs
+from latexcheck.incremental import IncrementalChecker
+
+DOCUMENT = (
+    r"\section{Intro} Cats , dogs and $x$ here." "\n\n"
+    r"Some text with \emph{stress} and $y$ , then more text." "\n\n"
+    r"\begin{equation} a = b. \end{equation}" "\n"
+    r"Last words ,and \textbf{bold} text."
+)
+
+
+def test_blocks_are_paragraphs_and_environments():
+    starts = [chunk.start for chunk in split_paragraphs(DOCUMENT)]
+    assert starts == [0, DOCUMENT.index("\n\nSome"), DOCUMENT.index(r"\begin"), DOCUMENT.index(r"\end") + 14]
+
+
+@pytest.mark.parametrize("parser", list(SupportedParsers))
+def test_edit_in_a_paragraph_rechecks_only_its_block(parser, monkeypatch):
+    checker = IncrementalChecker(DOCUMENT, parser=parser)
+    checked = []
+    check = IncrementalChecker._check
+    monkeypatch.setattr(IncrementalChecker, "_check", lambda self, i: checked.append(i) or check(self, i))
+
+    pos = DOCUMENT.index(" and $y$")
+    errors = checker.apply_edit(pos, pos, " ,")
+    assert [checker.chunks[i].start for i in checked] == [DOCUMENT.index("\n\nSome")]
+    assert errors == perform_checks(checker.source, parser=parser)
+    source = checker.source
+    assert errors["SPACE_BEFORE_PUNCTUATION_MARK"] == [20, pos, source.index("$ , then") + 1, source.index(" ,and")]
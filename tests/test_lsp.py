@@ -0,0 +1,113 @@
+import io
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+import latexcheck
+from latexcheck import perform_checks
+from latexcheck.helpers import SupportedLanguages
+from latexcheck.lsp import LanguageServer, make_diagnostics
+
+URI = "file:///doc.tex"
+TEXT = "Some text with $x$ here.\n\nAnother paragraph, fine.\n"
+EDITED = "Some text with $x$ here.\n\nAnother paragraph , fine.\n"
+
+
+class Client:
+    """Talks to ``latexcheck --lsp`` run in a new interpreter over its stdin and stdout."""
+
+    def __init__(self):
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(latexcheck.__file__)))
+        env = dict(os.environ, PYTHONPATH=src_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", "from latexcheck import main; main()", "--lsp"],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.messages = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        while True:
+            length = None
+            while True:
+                line = self.process.stdout.readline()
+                if not line:
+                    return
+                if not line.strip():
+                    break
+                name, _, value = line.decode("ascii").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            self.messages.put(json.loads(self.process.stdout.read(length)))
+
+    def send(self, method, params=None, id=None):
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        if id is not None:
+            message["id"] = id
+        body = json.dumps(message).encode("utf-8")
+        self.process.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        self.process.stdin.flush()
+
+    def receive(self):
+        return self.messages.get(timeout=30)
+
+
+def test_diagnostics_are_published_on_open_and_after_a_change():
+    client = Client()
+    try:
+        client.send("initialize", {"initializationOptions": {"language": "EN"}}, id=1)
+        response = client.receive()
+        assert response["id"] == 1 and response["result"]["capabilities"]["textDocumentSync"]["change"] == 1
+
+        client.send("textDocument/didOpen", {"textDocument": {"uri": URI, "version": 1, "text": TEXT}})
+        published = client.receive()
+        assert published["method"] == "textDocument/publishDiagnostics"
+        assert published["params"] == {"uri": URI, "diagnostics": []}
+
+        client.send(
+            "textDocument/didChange",
+            {"textDocument": {"uri": URI, "version": 2}, "contentChanges": [{"text": EDITED}]},
+        )
+        published = client.receive()
+        expected = make_diagnostics(EDITED, perform_checks(EDITED), SupportedLanguages.EN)
+        assert published["params"] == {"uri": URI, "diagnostics": expected}
+        assert [d["code"] for d in expected] == ["SPACE_BEFORE_PUNCTUATION_MARK"]
+
+        client.send("shutdown", id=2)
+        assert client.receive() == {"jsonrpc": "2.0", "id": 2, "result": None}
+        client.send("exit")
+        assert client.process.wait(timeout=30) == 0
+    finally:
+        if client.process.poll() is None:
+            client.process.kill()
+
+
+def published(server):
+    """The diagnostics published by ``server`` so far, per message."""
+    messages = []
+    output = server.stdout.getvalue()
+    while output:
+        header, _, output = output.partition(b"\r\n\r\n")
+        length = int(header.split(b":")[1])
+        messages.append(json.loads(output[:length])["params"]["diagnostics"])
+        output = output[length:]
+    return messages
+
+
+def test_the_incremental_checker_is_built_after_the_document_is_opened():
+    server = LanguageServer(stdin=io.BytesIO(), stdout=io.BytesIO(), debounce=0)
+    server.handle({"method": "textDocument/didOpen", "params": {"textDocument": {"uri": URI, "text": TEXT}}})
+    builder = server._builders.get(URI)
+    if builder is not None:
+        builder.join()
+    assert server.checkers[URI].source == TEXT and not server._builders
+
+    change = {"textDocument": {"uri": URI}, "contentChanges": [{"text": EDITED}]}
+    server.handle({"method": "textDocument/didChange", "params": change})
+    assert server.checkers[URI].source == EDITED
+    assert published(server) == [[], make_diagnostics(EDITED, perform_checks(EDITED), SupportedLanguages.EN)]
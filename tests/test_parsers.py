@@ -0,0 +1,74 @@
+import pytest
+
+from corpus import generate_document
+from latexcheck import SupportedLanguages, SupportedParsers, perform_checks
+from latexcheck.chunking import parse_chunks
+
+
+def check_both(source, language=SupportedLanguages.EN):
+    return [perform_checks(source, language=language, parser=parser) for parser in SupportedParsers]
+
+
+@pytest.mark.parametrize("language", list(SupportedLanguages))
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "shape", [dict(size_kb=4), dict(size_kb=8, math_density=0.6, nesting=4), dict(size_kb=8, ru_share=0.9)]
+)
+def test_parsers_agree_on_sample_documents(shape, seed, language):
+    builtin, texsoup = check_both(generate_document(seed=seed, **shape), language)
+    assert builtin == texsoup
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "Text with a stray } brace.",
+        r"Text \begin{verbatim} $ \end{verbatim} done.",
+        r"Text \verb|{| done.",
+        "Text % a { comment with $\nmore text.",
+        "% \\begin{itemize}\n\\section{A} Text.",
+        r"$\frac{1}{\frac{1}{x}} 2x\frac{1}{2}$",
+        r"$\left(1 + \frac{1}{n}\right)$ and $(\sum_i x)$",
+    ],
+)
+def test_parsers_agree_on_edge_cases(source):
+    builtin, texsoup = check_both(source)
+    assert builtin == texsoup
+    assert "PARSE_ERROR" not in builtin
+
+
+@pytest.mark.parametrize(
+    "source, pos",
+    [
+        ("Text { unclosed", 5),
+        (r"\begin{itemize} x", 0),
+        ("$x", 0),
+        (r"Intro. \section{A} $x \section{B} Fine text.", 19),
+        (r"Text \end{itemize} x", 5),
+        (r"Text \begin{verbatim} x \end{verbatim} $", 39),
+    ],
+)
+def test_parse_error_offset(source, pos):
+    builtin, texsoup = check_both(source)
+    assert builtin["PARSE_ERROR"] == [pos]
+    assert texsoup["PARSE_ERROR"] == [pos]
+
+
+def test_parse_error_leaves_other_sections_checked():
+    source = r"\section{A} $x \section{B} Cats , and dogs."
+    for errors in check_both(source):
+        assert errors == {"PARSE_ERROR": [12], "SPACE_BEFORE_PUNCTUATION_MARK": [31]}
+
+
+def test_braces_in_verbatim():
+    # TexSoup cannot parse unbalanced braces in verbatim environments, the built-in parser keeps them as text
+    source = r"Text \begin{verbatim} { \end{verbatim} done."
+    assert perform_checks(source, parser=SupportedParsers.BUILTIN) == {}
+
+
+@pytest.mark.parametrize("parser", list(SupportedParsers))
+def test_root_spans_source(parser):
+    source = r"Intro \section{A} text $x$."
+    tree, errors = parse_chunks(source, parser)
+    assert errors == []
+    assert (tree.pos, tree.end) == (0, len(source))
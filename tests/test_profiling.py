@@ -0,0 +1,39 @@
+import json
+
+from corpus import generate_document
+from latexcheck import Profile, check_files, perform_checks
+from latexcheck.xref import XREF_CODES
+
+SAMPLE = generate_document(size_kb=4, math_density=0.4, seed=3)
+
+
+def test_profile_counts_calls_and_findings_without_changing_them():
+    profile = Profile()
+    errors = perform_checks(SAMPLE, profile=profile)
+    assert errors == perform_checks(SAMPLE)
+    assert profile.documents == 1
+    assert {"parse", "link", "rules"} <= set(profile.phases)
+    assert all(stats.calls > 0 for stats in profile.rules.values() if stats.hits)
+    for code, positions in errors.items():
+        if code not in XREF_CODES and positions:
+            assert profile.rules[code].hits == len(positions)
+    assert all(stats.hits == 0 for code, stats in profile.rules.items() if code not in errors)
+
+
+def test_profiles_of_workers_add_up(tmp_path):
+    filenames = []
+    for seed in range(3):
+        path = tmp_path / f"doc{seed}.tex"
+        path.write_text(generate_document(size_kb=2, seed=seed), encoding="utf-8")
+        filenames.append(str(path))
+    serial, parallel = Profile(), Profile()
+    list(check_files(filenames, profile=serial))
+    list(check_files(filenames, jobs=2, profile=parallel))
+    assert serial.documents == parallel.documents == 3
+    assert {code: (stats.calls, stats.hits) for code, stats in parallel.rules.items()} == {
+        code: (stats.calls, stats.hits) for code, stats in serial.rules.items()
+    }
+
+    dump = tmp_path / "profile.json"
+    parallel.dump(str(dump))
+    assert json.loads(dump.read_text(encoding="utf-8")) == parallel.to_dict()
@@ -0,0 +1,48 @@
+from latexcheck import check_project, collect_project_files, find_includes
+
+
+def write(tmp_path, files):
+    for name, text in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(text, encoding="utf-8")
+
+
+def test_includes_outside_comments_are_found_in_order():
+    source = "\\input{intro}\n% \\include{old}\n\\include{ chapters/one }\n\\input appendix\n\\subfile{extra.tex}"
+    assert find_includes(source) == ["intro", "chapters/one", "appendix", "extra.tex"]
+
+
+def test_included_files_are_collected_in_reading_order_once_each(tmp_path):
+    write(
+        tmp_path,
+        {
+            "main.tex": "\\input{a}\n\\include{chapters/b}\n\\input{a}\n\\input{missing}",
+            "a.tex": "\\input{main}\nText.",
+            # Relative to the root file, as LaTeX resolves it, or else to the file including it
+            "chapters/b.tex": "\\input{chapters/c}\n\\subfile{d}",
+            "chapters/c.tex": "\\input{chapters/b}",
+            "chapters/d.tex": "Text.",
+        },
+    )
+    files, missing = collect_project_files(str(tmp_path / "main.tex"))
+    names = ["main.tex", "a.tex", "chapters/b.tex", "chapters/c.tex", "chapters/d.tex"]
+    assert files == [str(tmp_path / name) for name in names]
+    assert missing == ["missing"]
+
+
+def test_references_are_resolved_across_the_files_of_a_project(tmp_path):
+    write(
+        tmp_path,
+        {
+            "main.tex": "\\documentclass{article}\n\\begin{document}\n\\input{ch}\nSee \\eqref{eq:sum}, \\ref{none}."
+            "\n\\end{document}\n",
+            "ch.tex": "\\begin{equation} a = b \\label{eq:sum} \\end{equation}\n"
+            "\\begin{equation} c = d \\label{eq:sum} \\end{equation}\n",
+        },
+    )
+    files, _ = collect_project_files(str(tmp_path / "main.tex"))
+    codes = ["UNDEFINED_REFERENCE", "DUPLICATE_LABEL", "NUMBERED_MATH_NEEDS_REFERENCING"]
+    results = dict(check_project(files, select=codes))
+    main, chapter = ((tmp_path / name).read_text(encoding="utf-8") for name in ("main.tex", "ch.tex"))
+    assert results[files[0]] == {"UNDEFINED_REFERENCE": [main.index("\\ref")]}
+    assert results[files[1]] == {"DUPLICATE_LABEL": [chapter.rindex("\\label")]}
@@ -0,0 +1,20 @@
+import io
+import json
+
+from latexcheck import OutputFormat, Severity, SupportedLanguages, error_descriptions, make_reporter, severity_level
+
+LEVELS = {Severity.ERROR: "error", Severity.WARNING: "warning", Severity.INFORMATION: "note", Severity.HINT: "note"}
+
+
+def test_sarif_levels_follow_severity_levels():
+    stream = io.StringIO()
+    reporter = make_reporter(OutputFormat.SARIF, stream, SupportedLanguages.EN)
+    descriptions = error_descriptions[SupportedLanguages.EN]
+    for code in descriptions:
+        reporter.finding("a.tex", code, None)
+    reporter.close()
+    for result in json.loads(stream.getvalue())["runs"][0]["results"]:
+        code = result["ruleId"]
+        assert result["level"] == LEVELS[severity_level(code, descriptions[code]["severity"])]
+        if code == "PARSE_ERROR":
+            assert result["level"] == "error"
@@ -0,0 +1,53 @@
+import pytest
+
+from corpus import generate_document
+from latexcheck import RULES, Profile, SupportedLanguages, perform_checks
+from latexcheck.checker import enabled_codes
+from latexcheck.helpers import error_descriptions
+from latexcheck.rules import RuleScope
+from latexcheck.texparser import parse_latex
+from latexcheck.tree import fill_node_links
+
+SAMPLE = generate_document(size_kb=4, math_density=0.4, seed=1)
+
+
+def test_dispatch_index_selects_the_rules_whose_trigger_matches():
+    nodes = fill_node_links(parse_latex(SAMPLE))
+    for node in nodes:
+        expected = tuple(
+            rule
+            for rule in RULES.rules
+            if rule.scope == RuleScope.NODE and rule.triggered_by(node.cat, node.token, node.is_in_math)
+        )
+        assert RULES.rules_for(node) == expected
+
+
+@pytest.mark.parametrize("language", list(SupportedLanguages))
+def test_rules_selected_by_code_find_what_all_rules_find(language):
+    errors = perform_checks(SAMPLE, language=language)
+    assert len(errors) > 5
+    for code in error_descriptions[language]:
+        selected = perform_checks(SAMPLE, language=language, select=[code])
+        assert selected == ({code: errors[code]} if code in errors else {})
+
+
+def test_rules_for_absent_languages_and_left_out_codes_are_not_run():
+    russian_only = {rule.code for rule in RULES.rules if rule.languages == {SupportedLanguages.RU}}
+    assert russian_only
+    english = frozenset((SupportedLanguages.EN,))
+    codes = enabled_codes()
+    assert RULES.subset(codes, english) is RULES.subset(codes, english)
+    assert not russian_only & {rule.code for rule in RULES.subset(codes, english).rules}
+
+    english_text = generate_document(size_kb=4, ru_share=0, seed=1)
+    ignored = "CAPITALIZATION_AFTER_PUNCTUATION_MARK"
+    profile = Profile()
+    errors = perform_checks(english_text, profile=profile, ignore=[ignored])
+    assert not (russian_only | {ignored}) & set(profile.rules)
+    all_errors = perform_checks(english_text)
+    assert ignored in all_errors
+    assert errors == {code: positions for code, positions in all_errors.items() if code != ignored}
+
+    profile = Profile()
+    perform_checks(english_text + " Текст на русском.", profile=profile)
+    assert russian_only <= set(profile.rules)
@@ -0,0 +1,22 @@
+import asyncio
+
+from latexcheck import CheckLimits, check_many_async, iter_checks, perform_checks_async
+
+DOCUMENTS = [("a", "Cats , dogs , mice ."), ("b", "Fine text.")]
+LIMITS = CheckLimits(max_per_code=1)
+
+
+def test_iter_checks_applies_limits():
+    findings = list(iter_checks(DOCUMENTS, limits=LIMITS))
+    assert [(doc_id, finding.code) for doc_id, finding in findings] == [("a", "SPACE_BEFORE_PUNCTUATION_MARK")]
+
+
+def test_async_checks_apply_limits():
+    async def run():
+        single = await perform_checks_async(DOCUMENTS[0][1], limits=LIMITS)
+        many = {doc_id: errors async for doc_id, errors in check_many_async(DOCUMENTS, limits=LIMITS)}
+        return single, many
+
+    single, many = asyncio.run(run())
+    assert single == {"SPACE_BEFORE_PUNCTUATION_MARK": [4]}
+    assert many == {"a": single, "b": {}}
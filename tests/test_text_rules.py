@@ -0,0 +1,58 @@
+import pytest
+
+from latexcheck import SupportedParsers, perform_checks
+
+
+@pytest.fixture(params=list(SupportedParsers), ids=lambda parser: parser.value)
+def check(request):
+    return lambda source: perform_checks(source, parser=request.param)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        r"as in \eqref{eq:2} and \ref{fig:3}, which \label{sec:1} shows.",
+        r"See \ref{ {eq:2} } here.",
+    ],
+)
+def test_argument_keys_are_not_text(check, source):
+    errors = check(source)
+    assert "SPACE_AFTER_PUNCTUATION_MARK" not in errors
+    assert "NUMERALS_AS_WORDS" not in errors
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        r"This is true.\footnote{See above} and more.",
+        r"Hello,\textbf{World} again.",
+        r"as in \eqref{eq:2}. Next",
+    ],
+)
+def test_commands_end_the_text_around_them(check, source):
+    errors = check(source)
+    assert "SPACE_AFTER_PUNCTUATION_MARK" not in errors
+    assert "NUMERALS_AS_WORDS" not in errors
+
+
+@pytest.mark.parametrize(
+    "source, pos",
+    [
+        ("Let $x$- y be given.", 7),
+        ("Let - y be given.", 3),
+    ],
+)
+def test_text_after_a_command_is_anchored_at_its_start(check, source, pos):
+    assert check(source)["DASH_HYPHEN"] == [pos]
+
+
+@pytest.mark.parametrize(
+    "source, pos",
+    [
+        ("Hello,world.", 5),
+        (r"Hello{\em ,}world.", 10),
+        (r"See {\em this}.Then more.", 14),
+    ],
+)
+def test_text_is_joined_across_groups(check, source, pos):
+    assert check(source)["SPACE_AFTER_PUNCTUATION_MARK"] == [pos]
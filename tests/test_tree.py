@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from corpus import generate_document
+from latexcheck import SupportedParsers, tree
+from latexcheck.chunking import parse_chunks
+from latexcheck.rules import HAS_SET_BRACE, IS_MID
+from latexcheck.texparser import parse_latex
+from latexcheck.tree import (
+    LatCat,
+    fill_node_links,
+    find_descendant_token,
+    has_descendant,
+    has_descendant_token,
+    has_sibling,
+    has_sibling_feature,
+    iter_subtree,
+    token_bit,
+)
+
+NESTED = generate_document(size_kb=4, math_density=0.4, seed=2) + (
+    r"\begin{itemize} \item Text $$\sum x$$ and \emph{a \label{l:1}} \end{itemize}"
+    r"\begin{equation} \{ x \mid y \} \label{eq:set} \end{equation} \textbf{$$y$$} $\{a\}$ $b \mid c$"
+)
+
+
+def build(source):
+    root = parse_latex(source)
+    fill_node_links(root)
+    return root
+
+
+def all_nodes(parser):
+    root, _ = parse_chunks(NESTED, parser)
+    return fill_node_links(root)
+
+
+@pytest.mark.parametrize("parser", list(SupportedParsers))
+@pytest.mark.parametrize("name", ["label", "$$"])
+def test_descendant_index_agrees_with_walking_the_subtree(parser, name):
+    def named(node):
+        return node.token == name and node.cat in (LatCat.CMD, LatCat.ENV)
+
+    nodes = all_nodes(parser)
+    assert sum(map(named, nodes)) >= 2
+    for node in nodes:
+        assert has_descendant_token(node, name) == has_descendant(node, named)
+        assert find_descendant_token(node, name) is next(filter(named, iter_subtree(node)), None)
+
+
+@pytest.mark.parametrize("parser", list(SupportedParsers))
+@pytest.mark.parametrize(
+    "feature, predicate",
+    [
+        (HAS_SET_BRACE, lambda node: node.token is not None and r"\{" in node.token),
+        (IS_MID, lambda node: node.token == "mid"),
+    ],
+    ids=["HAS_SET_BRACE", "IS_MID"],
+)
+def test_sibling_index_agrees_with_looking_at_the_siblings(parser, feature, predicate):
+    nodes = all_nodes(parser)
+    assert sum(map(predicate, nodes)) >= 2
+    for node in nodes:
+        assert has_sibling_feature(node, feature) == has_sibling(node, predicate)
+
+
+def test_document_names_get_no_bits():
+    before = dict(tree.TOKEN_BITS)
+    build(r"\newcommand{\myMacro}{x} \myMacro \begin{myEnv} \otherMacro \end{myEnv}")
+    assert tree.TOKEN_BITS == before
+
+
+def test_names_without_bits_are_found_by_walking():
+    root = build(r"Text \emph{a \begin{equation} x \label{eq:1} \end{equation}} \myMacro")
+    assert "myMacro" not in tree.TOKEN_BITS
+    assert has_descendant_token(root, "label")
+    assert has_descendant_token(root, "myMacro")
+    assert not has_descendant_token(root, "otherMacro")
+    assert find_descendant_token(root, "myMacro").token == "myMacro"
+    assert find_descendant_token(root, "label").pos == root.tex.index(r"\label")
+    assert find_descendant_token(root, "otherMacro") is None
+
+
+def test_bits_are_capped_and_unique_across_threads(monkeypatch):
+    monkeypatch.setattr(tree, "TOKEN_BITS", {})
+    monkeypatch.setattr(tree, "MAX_TOKEN_BITS", 40)
+    bits = {}
+
+    def register(names):
+        for name in names:
+            bits[name] = token_bit(name)
+
+    threads = [threading.Thread(target=register, args=([f"t{i}_{j}" for j in range(10)],)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    given = [bit for bit in bits.values() if bit]
+    assert len(given) == 40 and len(set(given)) == 40
+    assert token_bit("another") == 0
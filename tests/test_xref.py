@@ -0,0 +1,26 @@
+from latexcheck import perform_checks
+
+CHAPTER = r"See \ref{sec:intro} and \eqref{eq:1}. \label{fig:a} \label{fig:a}"
+XREF_CODES = {"UNDEFINED_REFERENCE", "DUPLICATE_LABEL"}
+
+
+def xref_findings(source, **kwargs):
+    return {code: positions for code, positions in perform_checks(source, **kwargs).items() if code in XREF_CODES}
+
+
+def test_a_part_of_a_document_is_not_checked_for_labels_defined_elsewhere():
+    assert xref_findings(CHAPTER) == {}
+
+
+def test_a_whole_document_is_checked_for_undefined_references_and_duplicate_labels():
+    document = "\\documentclass{article}\n\\begin{document}\n" + CHAPTER + "\n\\end{document}\n"
+    assert xref_findings(document) == {
+        "UNDEFINED_REFERENCE": [document.index(r"\ref"), document.index(r"\eqref")],
+        "DUPLICATE_LABEL": [document.rindex(r"\label")],
+    }
+
+
+def test_selected_codes_are_reported_for_a_part_of_a_document():
+    assert xref_findings(CHAPTER, select=["UNDEFINED_REFERENCE"]) == {
+        "UNDEFINED_REFERENCE": [CHAPTER.index(r"\ref"), CHAPTER.index(r"\eqref")]
+    }